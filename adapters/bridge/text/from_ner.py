@@ -21,4 +21,11 @@ def run(input: list[dict], **kwargs) -> dict:
     # 띄어쓰기 정리 및 문장화
     sentence = " ".join(words).replace(" .", ".").replace(" ,", ",")
 
-    return { "text": sentence }
\ No newline at end of file
+    return { "text": sentence }
+
+def run_batch(inputs: list, **kwargs) -> list:
+    """
+    여러 레코드의 입력 리스트를 받아 레코드별 { "text": ... } 리스트로 변환합니다. (배치 실행용)
+    """
+
+    return [run(item, **kwargs) for item in inputs]
@@ -14,4 +14,11 @@ def run(input: list | dict | str, **kwargs) -> dict:
         return { "text": input.get("translation_text", str(input)) }
 
     # 그 외: str 등 직접 반환
-    return { "text": str(input) }
\ No newline at end of file
+    return { "text": str(input) }
+
+def run_batch(inputs: list, **kwargs) -> list:
+    """
+    여러 레코드의 입력 리스트를 받아 레코드별 { "text": ... } 리스트로 변환합니다. (배치 실행용)
+    """
+
+    return [run(item, **kwargs) for item in inputs]
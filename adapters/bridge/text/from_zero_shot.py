@@ -18,4 +18,11 @@ def run(input: dict, **kwargs) -> dict:
     best_index = scores.index(max(scores))
     best_label = labels[best_index]
 
-    return { "text": best_label }
\ No newline at end of file
+    return { "text": best_label }
+
+def run_batch(inputs: list, **kwargs) -> list:
+    """
+    여러 레코드의 입력 리스트를 받아 레코드별 { "text": ... } 리스트로 변환합니다. (배치 실행용)
+    """
+
+    return [run(item, **kwargs) for item in inputs]
@@ -0,0 +1,33 @@
+"""
+📦 Input Adapter: csv_column (streaming)
+──────────────────────────────────────────────
+- CSV 파일에서 지정한 컬럼을 레코드 단위로 lazy하게 읽음
+- 출력 레코드 형태: { "text": <column 값> }
+
+📌 사용 시점:
+- 스트리밍 실행(/pipeline/graph/run_file)의 source: { "module": "csv_column", "path": ..., "column": "review" }
+- 그래프 안에서는 "type": "input", "module": "csv_column" 로 plain_text와 같게 동작
+
+📌 params:
+- path (필수), column (기본 "text"), delimiter (기본 ","), encoding (기본 utf-8)
+"""
+
+import csv
+
+from adapters.input import plain_text
+from utils.file_stream import DEFAULT_CHUNK_SIZE, resolve_path
+
+def run(input: any = None, **params) -> dict:
+    # 📌 run(): 그래프 노드로 사용 시 레코드 단위 정규화는 plain_text와 동일
+    return plain_text.run(input, **params)
+
+def iter_records(path: str, column: str = "text", delimiter: str = ",", encoding: str = "utf-8", **params):
+    # 📌 iter_records(): 버퍼 단위로 읽으며 각 행의 column 값을 yield
+    with open(resolve_path(path), "r", encoding=encoding, newline="", buffering=DEFAULT_CHUNK_SIZE) as f:
+        reader = csv.DictReader(f, delimiter=delimiter)
+
+        if reader.fieldnames is None or column not in reader.fieldnames:
+            raise ValueError(f"❌ CSV column '{column}' not found in {path}.")
+
+        for row in reader:
+            yield { "text": row[column] or "" }
@@ -0,0 +1,47 @@
+"""
+📦 Input Adapter: jsonl (streaming)
+──────────────────────────────────────────────
+- JSON Lines 파일을 레코드 단위로 lazy하게 읽음
+- text_field로 지정한 필드를 "text"로 정규화 (나머지 필드는 유지)
+
+📌 사용 시점:
+- 스트리밍 실행(/pipeline/graph/run_file)의 source: { "module": "jsonl", "path": ..., "text_field": "body" }
+- 그래프 안에서는 "type": "input", "module": "jsonl" 로 레코드 dict를 정규화
+
+📌 params:
+- path (필수), text_field (기본 "text"), encoding (기본 utf-8)
+"""
+
+import json
+
+from utils.file_stream import iter_lines
+
+def _normalize(record: dict, text_field: str) -> dict:
+    # ✅ text_field → "text" 필드로 정규화
+    if text_field not in record:
+        raise ValueError(f"❌ JSONL record has no '{text_field}' field.")
+
+    text = record[text_field]
+    if not isinstance(text, str):
+        text = str(text)
+
+    return { **record, "text": text }
+
+def iter_records(path: str, text_field: str = "text", encoding: str = "utf-8", **params):
+    # 📌 iter_records(): 비어 있지 않은 각 줄을 JSON으로 파싱하여 yield
+    for line_no, line in enumerate(iter_lines(path, encoding=encoding), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"❌ Invalid JSON on line {line_no} of {path}: {e}") from e
+        yield _normalize(record, text_field)
+
+def run(input: any = None, text_field: str = "text", **params) -> dict:
+    # 📌 run(): 단일 레코드 정규화 (문자열이면 text로 감싸기)
+    if isinstance(input, str):
+        return { "text": input }
+    if isinstance(input, dict):
+        return _normalize(input, text_field)
+    raise ValueError("❌ InputAdapter 'jsonl' expects a dict record or a string.")
@@ -0,0 +1,27 @@
+"""
+📦 Input Adapter: line_text (streaming)
+──────────────────────────────────────────────
+- 한 줄에 문서 하나인 텍스트 파일을 레코드 단위로 lazy하게 읽음
+- 출력 레코드 형태: { "text": ... }
+
+📌 사용 시점:
+- 스트리밍 실행(/pipeline/graph/run_file)의 source: { "module": "line_text", "path": ... }
+- 그래프 안에서는 "type": "input", "module": "line_text" 로 plain_text와 같게 동작
+
+📌 params:
+- path (필수), encoding (기본 utf-8), skip_empty (기본 True)
+"""
+
+from adapters.input import plain_text
+from utils.file_stream import iter_lines
+
+def run(input: any = None, **params) -> dict:
+    # 📌 run(): 그래프 노드로 사용 시 레코드 단위 정규화는 plain_text와 동일
+    return plain_text.run(input, **params)
+
+def iter_records(path: str, encoding: str = "utf-8", skip_empty: bool = True, **params):
+    # 📌 iter_records(): 파일의 각 줄을 { "text": ... } 레코드로 yield
+    for line in iter_lines(path, encoding=encoding):
+        if skip_empty and not line.strip():
+            continue
+        yield { "text": line }
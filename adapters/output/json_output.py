@@ -3,7 +3,7 @@
 ──────────────────────────────────────────────
 - 모델 실행 결과(리스트, 딕셔너리 등)를 보기 좋게 JSON-compatible 객체로 변환
 - 주로 파이프라인의 마지막 노드로 사용됨
-- 직렬화 후 출력: 프론트 전달, 로그 출력 등에 적합
+- 직렬화 결과는 변환 완료로 표시되어 그래프 실행기 / 응답 단계에서 다시 순회하지 않음
 
 📌 입력 예시:
 [
@@ -24,41 +24,22 @@
 ]
 """
 
-import traceback
-from fastapi.encoders import jsonable_encoder
 from utils.serialization import to_serializable
 
 # ---------------------------------------------------
 # 📌 JSON-compatible 변환 실행 함수
 # ---------------------------------------------------
-def run(input: any, **params):
+def run(input: any, arrays: str = None, **params):
     """
     📌 입력값을 JSON-compatible 객체로 변환하여 반환
 
     ✅ 인자:
     - input: dict 또는 list 형태의 실행 결과
+    - arrays (선택): 배열 인코딩 방식 ("list" / "base64")
     - **params: 향후 확장 가능 (미사용)
 
     ✅ 내부 처리 흐름:
-    1. to_serializable: numpy, tensor 등 불가능 타입 정리
-    2. jsonable_encoder: FastAPI가 응답으로 반환 가능하도록 변환
+    - to_serializable 한 번으로 numpy, tensor 등 불가능 타입 정리
+      (FastAPI 응답은 utils.serialization.dumps로 바로 인코딩되므로 jsonable_encoder 불필요)
     """
-    print("🚀 [json_output] run() 시작됨")
-    print(f"📥 원본 input 타입: {type(input)}")
-
-    try:
-        # ✅ 내부 타입을 직렬화 가능하게 변환
-        safe_input = to_serializable(input)
-        print("✅ 최종 직렬화 대상 데이터:")
-        print(safe_input)
-
-        # ✅ FastAPI 응답에서 안전하게 처리할 수 있도록 jsonable_encoder 적용
-        encoded = jsonable_encoder(safe_input)
-        print("✅ FastAPI jsonable_encoder 처리 완료")
-
-        return encoded
-
-    except Exception as e:
-        print("❌ JSON 출력 직전 예외 발생:")
-        traceback.print_exc()
-        raise 
\ No newline at end of file
+    return to_serializable(input, arrays)
@@ -0,0 +1,87 @@
+"""
+📦 Output Adapter: jsonl_writer (streaming)
+──────────────────────────────────────────────
+- 실행 결과를 JSON Lines 파일에 한 줄씩 바로 기록
+- 결과를 메모리에 모으지 않으므로 대용량 코퍼스 처리에 적합
+
+📌 사용 시점:
+- 스트리밍 실행(/pipeline/graph/run_file)의 sink: { "module": "jsonl_writer", "path": ... }
+  → open_writer()로 열고 레코드마다 write()
+- 그래프 안에서는 "type": "output", "module": "jsonl_writer", params.path 지정 시 한 줄 append
+  → 비동기 프로토콜(arun) 지원: 그래프 워커 스레드를 점유하지 않고 다른 노드 실행과 파일 I/O를 겹침
+    (파일 append는 executor 스레드에서 실행, 같은 파일에 대한 run / arun append는 path별 스레드 lock으로 직렬화)
+
+📌 params:
+- path (필수, GIMBAB_STREAM_ROOT 기준 상대 경로)
+- append (기본 False: 새 파일로 기록)
+- overwrite (기본 False: 이미 있는 파일은 덮어쓰지 않고 FileExistsError)
+"""
+
+import asyncio
+import json
+import os
+import threading
+
+from utils.file_stream import resolve_path
+from utils.serialization import to_serializable
+
+# ✅ append lock 개수 (path 해시로 나눠 쓰는 고정 크기 lock 묶음 → path 수와 무관하게 메모리 일정)
+APPEND_LOCK_STRIPES = 64
+
+class JsonlWriter:
+    # 📌 줄 단위 기록기 (스레드 안전)
+
+    def __init__(self, path: str, append: bool = False, overwrite: bool = False, encoding: str = "utf-8"):
+        self.path = resolve_path(path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        # 🚨 기존 파일 truncate는 overwrite=True로 명시한 경우만 허용
+        mode = "a" if append else ("w" if overwrite else "x")
+        try:
+            self._file = open(self.path, mode, encoding=encoding)
+        except FileExistsError:
+            raise FileExistsError(f"❌ Output file already exists (set overwrite or append): {path}")
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def write(self, record) -> None:
+        line = json.dumps(to_serializable(record), ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self.count += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_writer(path: str, append: bool = False, overwrite: bool = False, **params) -> JsonlWriter:
+    # 📌 open_writer(): 스트리밍 실행용 기록기 생성
+    return JsonlWriter(path, append=append, overwrite=overwrite)
+
+# ✅ 같은 파일에 대한 동시 append 직렬화 (스레드 lock → 이벤트 루프에 묶이지 않음, run / arun 공용)
+_append_locks = tuple(threading.Lock() for _ in range(APPEND_LOCK_STRIPES))
+
+def _append_line(path: str, line: str, encoding: str = "utf-8"):
+    with _append_locks[hash(path) % APPEND_LOCK_STRIPES]:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a", encoding=encoding) as f:
+            f.write(line)
+
+def run(input: any, path: str = None, **params):
+    # 📌 run(): 그래프 노드로 사용 시 입력 한 건을 파일에 append 후 그대로 반환
+    _append_line(resolve_path(path), json.dumps(to_serializable(input), ensure_ascii=False) + "\n")
+    return input
+
+async def arun(input: any, path: str = None, **params):
+    # 📌 arun(): run()의 비동기 버전 (직렬화는 루프에서, lock 대기 + 파일 append는 executor 스레드)
+    resolved = resolve_path(path)
+    line = json.dumps(to_serializable(input), ensure_ascii=False) + "\n"
+    await asyncio.to_thread(_append_line, resolved, line)
+    return input
@@ -0,0 +1,15 @@
+"""
+📦 Gimbab Benchmarks
+──────────────────────────────────────────────
+- 실행기 / 직렬화 / bridge / API 경로의 성능 측정 (pytest 테스트가 아님)
+- benchmarks.run: suite 실행 → JSON 결과 파일
+- benchmarks.compare: baseline 대비 회귀 검사 (threshold 초과 시 종료 코드 1)
+- benchmarks.startup: 진입점 import 시간 프로파일 + startup 예산 검사 (위반 시 종료 코드 1)
+
+📌 사용 예시:
+python -m benchmarks.run --output bench/baseline.json
+(변경 후)
+python -m benchmarks.run --output bench/current.json
+python -m benchmarks.compare bench/baseline.json bench/current.json --threshold 0.10
+python -m benchmarks.startup --budget 2.0
+"""
@@ -0,0 +1,151 @@
+"""
+📦 Benchmark 회귀 검사
+──────────────────────────────────────────────
+- benchmarks.run 결과 파일 2개(baseline, current)를 케이스 이름 기준으로 비교
+- 비교 지표: median_ms (기본) 또는 min_ms / p95_ms / mean_ms
+- current / baseline 비율이 1 + threshold를 넘으면 회귀 → 종료 코드 1
+- noise floor: baseline과 current가 모두 --min-ms 미만인 케이스는 회귀로 판정하지 않음
+
+📌 사용 예시:
+python -m benchmarks.compare bench/baseline.json bench/current.json --threshold 0.10
+python -m benchmarks.compare base.json cur.json --threshold 0.10 --case-threshold e2e.=0.25
+
+📌 --case-threshold PREFIX=VALUE: 이름이 PREFIX로 시작하는 케이스의 threshold (가장 긴 prefix 우선)
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional
+
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_MIN_MS = 0.05
+METRICS = ("median_ms", "min_ms", "mean_ms", "p95_ms")
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    if report.get("schema") != 1 or not isinstance(report.get("results"), list):
+        raise ValueError(f"❌ Not a benchmark result file (schema 1): {path}")
+    return report
+
+def _threshold_for(name: str, default: float, overrides: Dict[str, float]) -> float:
+    # ✅ 가장 긴 prefix 일치 우선
+    matches = [prefix for prefix in overrides if name.startswith(prefix)]
+    return overrides[max(matches, key=len)] if matches else default
+
+def compare_reports(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    metric: str = "median_ms",
+    min_ms: float = DEFAULT_MIN_MS,
+    case_thresholds: Optional[Dict[str, float]] = None,
+) -> Dict[str, Any]:
+    """
+    ✅ 케이스별 비율 계산 + 회귀 판정
+
+    - status: "regression" | "improvement" | "ok" | "new" (baseline 없음) | "missing" (current 없음)
+    - improvement: 비율이 1 - threshold 미만
+    """
+    if metric not in METRICS:
+        raise ValueError(f"❌ Unknown metric: {metric} (expected one of {METRICS})")
+
+    case_thresholds = case_thresholds or {}
+    base = {result["name"]: result for result in baseline["results"]}
+    cur = {result["name"]: result for result in current["results"]}
+
+    rows: List[Dict[str, Any]] = []
+    for name in list(base) + [name for name in cur if name not in base]:
+        limit = _threshold_for(name, threshold, case_thresholds)
+        row = {"name": name, "threshold": limit, "baseline_ms": None, "current_ms": None, "ratio": None}
+
+        if name not in cur:
+            rows.append({**row, "baseline_ms": base[name][metric], "status": "missing"})
+            continue
+        if name not in base:
+            rows.append({**row, "current_ms": cur[name][metric], "status": "new"})
+            continue
+
+        before, after = base[name][metric], cur[name][metric]
+        ratio = after / before if before > 0 else float("inf")
+        if max(before, after) < min_ms:
+            status = "ok"
+        elif ratio > 1 + limit:
+            status = "regression"
+        elif ratio < 1 - limit:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append({**row, "baseline_ms": before, "current_ms": after, "ratio": round(ratio, 4), "status": status})
+
+    return {
+        "metric": metric,
+        "threshold": threshold,
+        "baseline_commit": baseline.get("meta", {}).get("git_commit"),
+        "current_commit": current.get("meta", {}).get("git_commit"),
+        "regressions": [row["name"] for row in rows if row["status"] == "regression"],
+        "rows": rows,
+    }
+
+# ------------------------------------------------------
+# 📌 CLI
+# ------------------------------------------------------
+STATUS_MARKS = {"regression": "🚨", "improvement": "✅", "ok": "  ", "new": "🆕", "missing": "❔"}
+
+def _format_ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.3f}"
+
+def print_table(comparison: Dict[str, Any], file=sys.stdout):
+    width = max([len(row["name"]) for row in comparison["rows"]] + [4])
+    print(f"{'case':<{width}}  {'baseline':>12}  {'current':>12}  {'ratio':>8}  status", file=file)
+    for row in comparison["rows"]:
+        ratio = "-" if row["ratio"] is None else f"{row['ratio']:.3f}"
+        print(
+            f"{row['name']:<{width}}  {_format_ms(row['baseline_ms']):>12}  {_format_ms(row['current_ms']):>12}  "
+            f"{ratio:>8}  {STATUS_MARKS[row['status']]} {row['status']}",
+            file=file,
+        )
+
+def _parse_case_thresholds(values: List[str]) -> Dict[str, float]:
+    overrides = {}
+    for value in values or []:
+        prefix, sep, limit = value.rpartition("=")
+        if not sep or not prefix:
+            raise ValueError(f"❌ Invalid --case-threshold (expected PREFIX=VALUE): {value}")
+        overrides[prefix] = float(limit)
+    return overrides
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files and fail on regressions.")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown ratio (0.10 = +10%%)")
+    parser.add_argument("--metric", choices=METRICS, default="median_ms")
+    parser.add_argument("--min-ms", type=float, default=DEFAULT_MIN_MS, help="ignore cases faster than this in both runs")
+    parser.add_argument("--case-threshold", action="append", default=[], metavar="PREFIX=VALUE")
+    parser.add_argument("--json", action="store_true", help="print the comparison as JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    comparison = compare_reports(
+        load_results(args.baseline),
+        load_results(args.current),
+        threshold=args.threshold,
+        metric=args.metric,
+        min_ms=args.min_ms,
+        case_thresholds=_parse_case_thresholds(args.case_threshold),
+    )
+
+    if args.json:
+        print(json.dumps(comparison, ensure_ascii=False, indent=2))
+    else:
+        print_table(comparison)
+
+    if comparison["regressions"]:
+        print(f"🚨 {len(comparison['regressions'])} regression(s) over threshold", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
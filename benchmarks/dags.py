@@ -0,0 +1,73 @@
+"""
+📦 Synthetic DAG 생성기
+──────────────────────────────────────────────
+- benchmark용 {"nodes", "edges"} 스펙을 노드 수 기준으로 생성 (stub 노드 사용)
+- wide: source 1개 → 병렬 relay (n - 2)개 → 모두를 받는 join 1개
+- deep: source → relay → relay → ... (길이 n 체인)
+- diamond: source → [width개 병렬 relay → join] 반복 (fan-out / fan-in 단계가 n개에 도달할 때까지)
+- relay 노드는 기본적으로 params.slot(=node id)이 달라 중복 노드 병합(dedupe) 대상이 아님
+  → wide(..., shared=True)는 병렬 relay가 모두 같은 노드 (병합 효과 측정용)
+"""
+
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.stubs import RELAY_MODULE, SOURCE_MODULE
+
+DEFAULT_DIAMOND_WIDTH = 8
+
+Spec = Tuple[List[Dict[str, Any]], List[Dict[str, str]]]
+
+
+def _source(node_id: str, text: str, sleep_ms: float) -> Dict[str, Any]:
+    params = {"text": text}
+    if sleep_ms:
+        params["sleep_ms"] = sleep_ms
+    return {"id": node_id, "type": "input", "module": SOURCE_MODULE, "params": params}
+
+
+def _relay(node_id: str, sleep_ms: float, shared: bool = False) -> Dict[str, Any]:
+    params = {} if shared else {"slot": node_id}
+    if sleep_ms:
+        params["sleep_ms"] = sleep_ms
+    return {"id": node_id, "type": "model", "module": RELAY_MODULE, "params": params}
+
+
+def wide(n: int, text: str = "bench", sleep_ms: float = 0, shared: bool = False) -> Spec:
+    n = max(3, n)
+    nodes = [_source("src", text, sleep_ms)]
+    edges = []
+    for i in range(n - 2):
+        nodes.append(_relay(f"w{i}", sleep_ms, shared))
+        edges.append({"from": "src", "to": f"w{i}"})
+        edges.append({"from": f"w{i}", "to": "join"})
+    nodes.append(_relay("join", sleep_ms))
+    return nodes, edges
+
+
+def deep(n: int, text: str = "bench", sleep_ms: float = 0) -> Spec:
+    n = max(2, n)
+    nodes = [_source("d0", text, sleep_ms)]
+    edges = []
+    for i in range(1, n):
+        nodes.append(_relay(f"d{i}", sleep_ms))
+        edges.append({"from": f"d{i - 1}", "to": f"d{i}"})
+    return nodes, edges
+
+
+def diamond(n: int, text: str = "bench", sleep_ms: float = 0, width: int = DEFAULT_DIAMOND_WIDTH) -> Spec:
+    width = max(1, width)
+    nodes = [_source("j0", text, sleep_ms)]
+    edges = []
+    stage = 0
+    while len(nodes) + width + 1 <= max(n, width + 2):
+        stage += 1
+        for i in range(width):
+            node_id = f"s{stage}_{i}"
+            nodes.append(_relay(node_id, sleep_ms))
+            edges.append({"from": f"j{stage - 1}", "to": node_id})
+            edges.append({"from": node_id, "to": f"j{stage}"})
+        nodes.append(_relay(f"j{stage}", sleep_ms))
+    return nodes, edges
+
+
+SHAPES = {"wide": wide, "deep": deep, "diamond": diamond}
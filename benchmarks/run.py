@@ -0,0 +1,174 @@
+"""
+📦 Benchmark 실행기
+──────────────────────────────────────────────
+- benchmarks.suites의 케이스를 반복 측정하여 JSON 결과 파일로 기록
+- 케이스별: warm-up 실행 후 repeat회 측정 → min / median / mean / p95 / stdev (ms)
+- 결과 파일은 benchmarks.compare로 baseline과 비교 (회귀 검사)
+
+📌 사용 예시:
+python -m benchmarks.run --output bench/baseline.json
+python -m benchmarks.run --suite graph --suite bridge --quick --repeat 3
+python -m benchmarks.run --filter execute_graph.diamond
+
+📌 결과 형식 (schema 1):
+{
+  "schema": 1,
+  "meta": { "created_at", "git_commit", "python", "platform", "cpu_count", "repeat", "warmup", "quick" },
+  "results": [ { "name", "suite", "params", "runs", "min_ms", "median_ms", "mean_ms", "p95_ms", "stdev_ms" } ],
+  "skipped": [ { "name", "suite", "reason" } ],
+  "errors": [ { "name", "suite", "error" } ]
+}
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks.suites import SUITES, Case, SkipCase, build_cases, close
+
+SCHEMA_VERSION = 1
+DEFAULT_REPEAT = int(os.getenv("GIMBAB_BENCH_REPEAT", "7"))
+DEFAULT_WARMUP = int(os.getenv("GIMBAB_BENCH_WARMUP", "1"))
+
+# ------------------------------------------------------
+# 📌 측정
+# ------------------------------------------------------
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    # ✅ 초 단위 측정값 → ms 통계 (소수점 4자리)
+    ms = [sample * 1000 for sample in samples]
+    return {
+        "runs": len(ms),
+        "min_ms": round(min(ms), 4),
+        "median_ms": round(statistics.median(ms), 4),
+        "mean_ms": round(statistics.fmean(ms), 4),
+        "p95_ms": round(_percentile(ms, 0.95), 4),
+        "stdev_ms": round(statistics.stdev(ms), 4) if len(ms) > 1 else 0.0,
+    }
+
+def measure(case: Case, repeat: int = DEFAULT_REPEAT, warmup: int = DEFAULT_WARMUP) -> Dict[str, Any]:
+    """
+    ✅ 케이스 1개 측정
+    - setup은 측정 밖에서 한 번 실행 (SkipCase는 호출자에게 전달)
+    - warm-up 실행(import / 캐시 채우기)은 통계에서 제외
+    """
+    state = case.setup() if case.setup else None
+
+    for _ in range(max(0, warmup)):
+        case.fn(state)
+
+    samples = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        case.fn(state)
+        samples.append(time.perf_counter() - start)
+
+    return {"name": case.name, "suite": case.suite, "params": case.params, **summarize(samples)}
+
+# ------------------------------------------------------
+# 📌 실행 환경 정보
+# ------------------------------------------------------
+def _git_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+def environment(repeat: int, warmup: int, quick: bool) -> Dict[str, Any]:
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": repeat,
+        "warmup": warmup,
+        "quick": quick,
+    }
+
+# ------------------------------------------------------
+# 📦 suite 실행
+# ------------------------------------------------------
+def run_benchmarks(
+    suites=SUITES,
+    repeat: int = DEFAULT_REPEAT,
+    warmup: int = DEFAULT_WARMUP,
+    quick: bool = False,
+    name_filter: Optional[str] = None,
+    verbose: bool = True,
+) -> Dict[str, Any]:
+    """
+    ✅ 선택된 suite의 케이스를 순서대로 측정하여 결과 dict 반환
+    - 한 케이스의 실패가 나머지 측정을 막지 않음 (errors에 기록)
+    """
+    report = {"schema": SCHEMA_VERSION, "meta": environment(repeat, warmup, quick), "results": [], "skipped": [], "errors": []}
+
+    try:
+        for case in build_cases(suites, quick=quick):
+            if name_filter and name_filter not in case.name:
+                continue
+            try:
+                result = measure(case, repeat, warmup)
+            except SkipCase as e:
+                report["skipped"].append({"name": case.name, "suite": case.suite, "reason": str(e)})
+                if verbose:
+                    print(f"⏭️  {case.name}: skipped ({e})", file=sys.stderr)
+                continue
+            except Exception as e:
+                report["errors"].append({"name": case.name, "suite": case.suite, "error": f"{type(e).__name__}: {e}"})
+                if verbose:
+                    print(f"❌ {case.name}: {type(e).__name__}: {e}", file=sys.stderr)
+                continue
+
+            report["results"].append(result)
+            if verbose:
+                print(f"📊 {case.name}: median {result['median_ms']:.3f} ms (p95 {result['p95_ms']:.3f} ms)", file=sys.stderr)
+    finally:
+        close()
+
+    return report
+
+# ------------------------------------------------------
+# 📌 CLI
+# ------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Gimbab benchmark suites and write JSON results.")
+    parser.add_argument("--suite", action="append", choices=SUITES, help="suite to run (repeatable, default: all)")
+    parser.add_argument("--filter", default=None, help="only run cases whose name contains this substring")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    parser.add_argument("--quick", action="store_true", help="smaller graph / record sizes")
+    parser.add_argument("--output", default=None, help="result JSON path (default: stdout)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.suite or SUITES, args.repeat, args.warmup, args.quick, args.filter)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"✅ {len(report['results'])} results → {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+📦 Startup 검사: import 시간 프로파일 + cold start 예산
+──────────────────────────────────────────────
+- 모듈별로 새 인터프리터에서 `python -X importtime -c "import <module>"` 실행 (캐시 없는 cold import)
+- 보고: 전체 wall time + 누적(cumulative) import 시간 상위 모듈
+- 예산 검사:
+  - wall time > --budget 초
+  - 무거운 라이브러리(torch / transformers / numpy 등)가 import 시점에 로딩됨
+    (태스크 실행기 / 모델 backend는 첫 사용 시 dynamic_loader로 로딩되어야 함)
+  → 위반이 있으면 종료 코드 1 (CI의 startup budget 테스트로 사용)
+- import 자체가 실패한 모듈(fastapi 미설치 등)은 skipped로 기록
+
+📌 사용 예시:
+python -m benchmarks.startup
+python -m benchmarks.startup --module main --budget 1.5 --top 15
+python -m benchmarks.startup --output bench/startup.json
+
+📌 환경 변수:
+- GIMBAB_STARTUP_BUDGET : 모듈당 import 예산 (초, 기본 2.0)
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+# ✅ 검사 대상 (API 프로세스 / 그래프 실행기 / 모델 워커 진입점)
+DEFAULT_MODULES = ("main", "pipeline_graph_runner", "models")
+
+# ✅ import 시점에 로딩되면 안 되는 무거운 라이브러리
+HEAVY_MODULES = ("torch", "transformers", "numpy", "onnxruntime", "optimum", "tokenizers")
+
+DEFAULT_BUDGET = float(os.getenv("GIMBAB_STARTUP_BUDGET", "2.0"))
+DEFAULT_TOP = 10
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 📌 자식 인터프리터: 대상 모듈 import 후 로딩된 무거운 라이브러리 목록 출력 (마지막 stdout 줄)
+_PROBE = (
+    "import json, sys, time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "seconds = time.perf_counter() - start\n"
+    "heavy = [name for name in {heavy!r} if name in sys.modules]\n"
+    "print(json.dumps({{'seconds': seconds, 'heavy': heavy}}))\n"
+)
+
+# ------------------------------------------------------
+# 📌 importtime 출력 파싱
+# - 형식: "import time: self [us] | cumulative | imported package"
+# ------------------------------------------------------
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # 헤더 줄
+        entries.append({
+            "module": fields[2].strip(),
+            "self_ms": int(fields[0]) / 1000,
+            "cumulative_ms": int(fields[1]) / 1000,
+        })
+    return entries
+
+def profile_import(module: str, top: int = DEFAULT_TOP) -> Dict[str, Any]:
+    """
+    ✅ 모듈 1개 cold import 측정
+
+    - wall_s: 인터프리터 시작 포함 전체 시간 (replica 준비 시간에 가까운 값)
+    - import_s: 대상 모듈 import 시간 (자식 프로세스에서 측정)
+    - top: 누적 import 시간 상위 모듈 (최상위 import 기준 중복 제외 없음)
+    """
+    command = [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)]
+    start = time.perf_counter()
+    completed = subprocess.run(command, capture_output=True, text=True, cwd=REPO_ROOT)
+    wall = time.perf_counter() - start
+
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()[-1:] or ["unknown error"]
+        return {"module": module, "skipped": error[0]}
+
+    probe = json.loads(completed.stdout.strip().splitlines()[-1])
+    entries = parse_importtime(completed.stderr)
+    entries.sort(key=lambda entry: entry["cumulative_ms"], reverse=True)
+
+    return {
+        "module": module,
+        "wall_s": round(wall, 4),
+        "import_s": round(probe["seconds"], 4),
+        "heavy": probe["heavy"],
+        "imported": len(entries),
+        "top": entries[:top],
+    }
+
+def check_budget(report: Dict[str, Any], budget: float) -> List[str]:
+    # 🚨 예산 위반 목록 (빈 리스트 = 통과)
+    if "skipped" in report:
+        return []
+    violations = []
+    if report["import_s"] > budget:
+        violations.append(f"{report['module']}: import took {report['import_s']:.3f}s (budget {budget:.3f}s)")
+    if report["heavy"]:
+        violations.append(f"{report['module']}: heavy modules loaded at import time: {', '.join(report['heavy'])}")
+    return violations
+
+# ------------------------------------------------------
+# 📌 CLI
+# ------------------------------------------------------
+def _print_report(report: Dict[str, Any]):
+    if "skipped" in report:
+        print(f"⏭️  {report['module']}: skipped ({report['skipped']})", file=sys.stderr)
+        return
+    print(
+        f"📊 {report['module']}: import {report['import_s'] * 1000:.1f} ms, wall {report['wall_s'] * 1000:.1f} ms, "
+        f"{report['imported']} modules",
+        file=sys.stderr,
+    )
+    for entry in report["top"]:
+        print(f"    {entry['cumulative_ms']:10.2f} ms  {entry['module']}", file=sys.stderr)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Profile cold imports of the Gimbab entry points and enforce a startup budget.")
+    parser.add_argument("--module", action="append", help=f"module to import (repeatable, default: {', '.join(DEFAULT_MODULES)})")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="import budget per module in seconds")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="number of slowest imports to report")
+    parser.add_argument("--output", default=None, help="write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    reports, violations = [], []
+    for module in args.module or DEFAULT_MODULES:
+        report = profile_import(module, args.top)
+        _print_report(report)
+        reports.append(report)
+        violations.extend(check_budget(report, args.budget))
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"budget_s": args.budget, "results": reports, "violations": violations}, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+
+    for violation in violations:
+        print(f"❌ {violation}", file=sys.stderr)
+    if not violations:
+        print(f"✅ startup budget {args.budget:.3f}s met", file=sys.stderr)
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
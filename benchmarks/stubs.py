@@ -0,0 +1,64 @@
+"""
+📦 Benchmark stub 노드
+──────────────────────────────────────────────
+- 모델 없이 실행기 / 스케줄러 오버헤드만 측정하기 위한 가벼운 노드 모듈
+- utils.dynamic_loader.register_module로 등록 → 일반 노드처럼 {"type", "module"}로 참조
+  - ("input", "bench.source"): params.text를 {"text": ...}로 반환
+  - ("model", "bench.relay"): 입력(단일 / 다중)을 받아 {"text", "hops"} 반환
+- params.sleep_ms 지정 시 I/O 대기(모델 호출 등)를 흉내내어 병렬 실행 효과 측정 가능
+"""
+
+import time
+from typing import Any, Dict, List
+
+from utils.dynamic_loader import register_module, unregister_module
+
+SOURCE_MODULE = "bench.source"
+RELAY_MODULE = "bench.relay"
+
+
+def _pause(params: Dict[str, Any]):
+    sleep_ms = params.get("sleep_ms")
+    if sleep_ms:
+        time.sleep(float(sleep_ms) / 1000)
+
+
+class SourceStub:
+    # ✅ 외부 입력 주입 노드 (plain_text 입력 어댑터와 같은 출력 형태)
+    @staticmethod
+    def run(input: Any = None, **params) -> Dict[str, Any]:
+        _pause(params)
+        return {"text": params.get("text", ""), "hops": 0}
+
+    @classmethod
+    def run_batch(cls, inputs: List[Any], **params) -> List[Dict[str, Any]]:
+        return [cls.run(item, **params) for item in inputs]
+
+
+class RelayStub:
+    # ✅ 중간 노드: 다중 입력(pid → 출력)은 hops 최대값 기준으로 하나로 합침
+    @staticmethod
+    def run(input: Any = None, **params) -> Dict[str, Any]:
+        _pause(params)
+        if isinstance(input, dict) and "text" not in input:
+            parents = [value for value in input.values() if isinstance(value, dict)]
+            hops = max((parent.get("hops", 0) for parent in parents), default=0)
+            text = parents[0].get("text", "") if parents else ""
+        else:
+            hops = (input or {}).get("hops", 0)
+            text = (input or {}).get("text", "")
+        return {"text": text, "hops": hops + 1}
+
+    @classmethod
+    def run_batch(cls, inputs: List[Any], **params) -> List[Dict[str, Any]]:
+        return [cls.run(item, **params) for item in inputs]
+
+
+def register_stubs():
+    register_module("input", SOURCE_MODULE, SourceStub)
+    register_module("model", RELAY_MODULE, RelayStub)
+
+
+def unregister_stubs():
+    unregister_module("input", SOURCE_MODULE)
+    unregister_module("model", RELAY_MODULE)
@@ -0,0 +1,302 @@
+"""
+📦 Benchmark 케이스 정의
+──────────────────────────────────────────────
+- suite별 케이스 목록을 생성 (실제 측정 / 결과 기록은 benchmarks.run)
+- graph: topological_sort / compile_plan / execute_graph (+ targets) / execute_plan_batch (synthetic DAG + stub 노드)
+- serialization: to_serializable / dumps (대형 중첩 출력)
+- bridge: adapters.bridge.text.* run_batch
+- e2e: FastAPI TestClient로 POST /pipeline/graph/run (stub 그래프 + tiny 모델 그래프)
+- startup: 진입점 모듈 cold import (새 인터프리터, benchmarks.startup)
+
+📌 케이스 규칙:
+- name은 실행 간 비교 key → 파라미터를 이름에 포함 (예: "graph.execute_graph.diamond.1000")
+- setup()은 측정 전에 한 번 실행, 반환값을 fn(state)에 전달
+- 필요한 의존성이 없으면 setup에서 SkipCase를 발생 → 결과에 skipped로 기록
+"""
+
+import importlib.util
+import os
+import random
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.dags import SHAPES
+from benchmarks.stubs import register_stubs
+
+# ✅ e2e 모델 케이스용 tiny 모델 (로컬 캐시 경로 또는 hub 이름)
+TINY_MODEL = os.getenv("GIMBAB_BENCH_TINY_MODEL", "sshleifer/tiny-distilbert-base-uncased-finetuned-sst-2-english")
+
+DEFAULT_SIZES = (100, 1000, 5000)
+QUICK_SIZES = (100, 1000)
+BATCH_RECORDS = 64
+
+SUITES = ("graph", "serialization", "bridge", "e2e", "startup")
+
+
+class SkipCase(Exception):
+    """케이스 실행 조건 미충족 (의존성 미설치 / 모델 로딩 실패 등)"""
+
+
+@dataclass
+class Case:
+    name: str
+    suite: str
+    fn: Callable[[Any], Any]
+    setup: Optional[Callable[[], Any]] = None
+    params: Dict[str, Any] = field(default_factory=dict)
+
+# ------------------------------------------------------
+# 📌 graph: 위상 정렬 / 컴파일 / 실행
+# ------------------------------------------------------
+def _graph_cases(sizes) -> List[Case]:
+    from utils.graph_executor import execute_graph, execute_plan_batch
+    from utils.plan_compiler import compile_plan, get_plan, topological_sort
+
+    register_stubs()
+    cases = []
+
+    for shape, build in SHAPES.items():
+        for n in sizes:
+            nodes, edges = build(n)
+            params = {"shape": shape, "nodes": len(nodes), "edges": len(edges)}
+
+            cases.append(Case(
+                f"graph.topological_sort.{shape}.{n}", "graph",
+                lambda _, nodes=nodes, edges=edges: topological_sort(nodes, edges),
+                params=params,
+            ))
+            cases.append(Case(
+                f"graph.compile_plan.{shape}.{n}", "graph",
+                lambda _, nodes=nodes, edges=edges: compile_plan(nodes, edges),
+                params=params,
+            ))
+            # 📌 계획 캐시 hit 상태의 요청 1건 (형태 해시 + 스케줄링 + 노드 실행)
+            cases.append(Case(
+                f"graph.execute_graph.{shape}.{n}", "graph",
+                lambda _, nodes=nodes, edges=edges: execute_graph(nodes, edges),
+                setup=lambda nodes=nodes, edges=edges: get_plan(nodes, edges),
+                params=params,
+            ))
+
+        # 📌 targets 가지치기: 첫 번째 분기 끝 노드 하나만 요청 (가장 큰 크기)
+        nodes, edges = build(sizes[-1])
+        target = next(node["id"] for node in nodes[1:])
+        cases.append(Case(
+            f"graph.execute_graph_targets.{shape}.{sizes[-1]}", "graph",
+            lambda _, nodes=nodes, edges=edges, target=target: execute_graph(nodes, edges, targets=[target]),
+            setup=lambda nodes=nodes, edges=edges: get_plan(nodes, edges),
+            params={"shape": shape, "nodes": len(nodes), "targets": [target]},
+        ))
+
+        # 📌 중복 노드 병합: 병렬 relay가 모두 같은 wide 그래프 (dedupe on / off)
+        if shape == "wide":
+            nodes, edges = build(sizes[-1], shared=True)
+            for dedupe in (True, False):
+                cases.append(Case(
+                    f"graph.execute_graph_shared.wide.{sizes[-1]}.dedupe_{'on' if dedupe else 'off'}", "graph",
+                    lambda _, nodes=nodes, edges=edges, dedupe=dedupe: execute_graph(nodes, edges, dedupe=dedupe),
+                    setup=lambda nodes=nodes, edges=edges: get_plan(nodes, edges),
+                    params={"shape": shape, "nodes": len(nodes), "dedupe": dedupe},
+                ))
+
+        # 📌 column-wise batch 실행 (가장 작은 크기 × BATCH_RECORDS 레코드)
+        nodes, edges = build(sizes[0])
+        cases.append(Case(
+            f"graph.execute_plan_batch.{shape}.{sizes[0]}x{BATCH_RECORDS}", "graph",
+            lambda plan: execute_plan_batch(plan, [f"record {i}" for i in range(BATCH_RECORDS)]),
+            setup=lambda nodes=nodes, edges=edges: get_plan(nodes, edges),
+            params={"shape": shape, "nodes": len(nodes), "records": BATCH_RECORDS},
+        ))
+
+    return cases
+
+# ------------------------------------------------------
+# 📌 serialization: 대형 중첩 출력
+# ------------------------------------------------------
+def _ner_like_output(records: int, entities: int, seed: int = 0) -> Dict[str, Any]:
+    # ✅ NER 노드 출력 형태 (dict 리스트 + float score + 정수 offset)
+    rng = random.Random(seed)
+    return {
+        f"node_{r}": [
+            {
+                "entity": rng.choice(("B-PER", "I-PER", "B-ORG", "B-LOC")),
+                "score": rng.random(),
+                "index": i,
+                "word": f"token{i}",
+                "start": i * 6,
+                "end": i * 6 + 5,
+            }
+            for i in range(entities)
+        ]
+        for r in range(records)
+    }
+
+
+def _array_output(records: int, dim: int):
+    try:
+        import numpy as np
+    except ImportError:
+        raise SkipCase("numpy is not installed")
+    rng = np.random.default_rng(0)
+    return {f"node_{r}": {"embedding": rng.random(dim, dtype=np.float32), "label": "POS"} for r in range(records)}
+
+
+def _serialization_cases() -> List[Case]:
+    from utils.serialization import dumps, to_serializable
+
+    def nested():
+        return _ner_like_output(200, 50)
+
+    return [
+        Case("serialization.to_serializable.ner.200x50", "serialization", to_serializable, setup=nested,
+             params={"records": 200, "entities": 50}),
+        Case("serialization.dumps.ner.200x50", "serialization", lambda data: dumps(to_serializable(data)), setup=nested,
+             params={"records": 200, "entities": 50}),
+        Case("serialization.to_serializable.arrays_list.100x768", "serialization",
+             lambda data: to_serializable(data, arrays="list"), setup=lambda: _array_output(100, 768),
+             params={"records": 100, "dim": 768}),
+        Case("serialization.to_serializable.arrays_base64.100x768", "serialization",
+             lambda data: to_serializable(data, arrays="base64"), setup=lambda: _array_output(100, 768),
+             params={"records": 100, "dim": 768}),
+    ]
+
+# ------------------------------------------------------
+# 📌 bridge: adapters.bridge.text.*
+# ------------------------------------------------------
+def _bridge_cases(records: int = 1000) -> List[Case]:
+    from adapters.bridge.text import from_ner, from_translation, from_zero_shot
+
+    def ner_inputs():
+        return [
+            [{"word": f"##w{i}" if i % 4 == 3 else f"word{i}", "entity": "B-ORG"} for i in range(40)] + [{"word": "."}]
+            for _ in range(records)
+        ]
+
+    def translation_inputs():
+        return [[{"translation_text": f"Sentence {i} of record {r}."} for i in range(4)] for r in range(records)]
+
+    def zero_shot_inputs():
+        labels = [f"label{i}" for i in range(20)]
+        rng = random.Random(0)
+        return [{"labels": labels, "scores": [rng.random() for _ in labels]} for _ in range(records)]
+
+    return [
+        Case(f"bridge.from_ner.{records}x41", "bridge", from_ner.run_batch, setup=ner_inputs,
+             params={"records": records, "tokens": 41}),
+        Case(f"bridge.from_translation.{records}x4", "bridge", from_translation.run_batch, setup=translation_inputs,
+             params={"records": records, "segments": 4}),
+        Case(f"bridge.from_zero_shot.{records}x20", "bridge", from_zero_shot.run_batch, setup=zero_shot_inputs,
+             params={"records": records, "labels": 20}),
+    ]
+
+# ------------------------------------------------------
+# 📌 e2e: POST /pipeline/graph/run (TestClient)
+# ------------------------------------------------------
+_client = None
+
+def _test_client():
+    # ✅ 프로세스당 한 번 생성 (startup 훅 = warm-up 실행)
+    global _client
+    if _client is None:
+        try:
+            from fastapi.testclient import TestClient
+        except ImportError:
+            raise SkipCase("fastapi / httpx is not installed")
+        from main import app
+
+        register_stubs()
+        _client = TestClient(app)
+        _client.__enter__()
+    return _client
+
+
+def _post(state):
+    client, body = state
+    response = client.post("/pipeline/graph/run", json=body)
+    if response.status_code != 200:
+        raise RuntimeError(f"❌ /pipeline/graph/run returned {response.status_code}: {response.text[:200]}")
+    return response
+
+
+def _e2e_cases() -> List[Case]:
+    def stub_graph():
+        nodes, edges = SHAPES["diamond"](100)
+        return _test_client(), {"nodes": nodes, "edges": edges, "options": {}}
+
+    def model_graph():
+        if importlib.util.find_spec("transformers") is None:
+            raise SkipCase("transformers is not installed")
+
+        client = _test_client()
+        body = {
+            "nodes": [
+                {"id": "input", "type": "input", "module": "plain_text", "params": {"text": "The benchmark sentence is short and friendly."}},
+                {"id": "sentiment", "type": "model", "module": "text-model",
+                 "params": {"task": "sentiment-analysis", "model_name": TINY_MODEL, "batching": False}},
+                {"id": "output", "type": "output", "module": "json_output"},
+            ],
+            "edges": [{"from": "input", "to": "sentiment"}, {"from": "sentiment", "to": "output"}],
+            "options": {},
+        }
+        # 📌 모델 로딩은 측정에서 제외 (첫 요청 = 로딩)
+        try:
+            _post((client, body))
+        except Exception as e:
+            raise SkipCase(f"tiny model unavailable: {e}")
+        return client, body
+
+    return [
+        Case("e2e.graph_run.stub_diamond.100", "e2e", _post, setup=stub_graph, params={"nodes": 100}),
+        Case("e2e.graph_run.tiny_sentiment", "e2e", _post, setup=model_graph, params={"model": TINY_MODEL}),
+    ]
+
+# ------------------------------------------------------
+# 📌 startup: 진입점 cold import (측정 1회 = 새 인터프리터 1개)
+# ------------------------------------------------------
+def _startup_cases() -> List[Case]:
+    from benchmarks.startup import DEFAULT_MODULES, profile_import
+
+    def importer(module):
+        def setup():
+            report = profile_import(module, top=0)
+            if "skipped" in report:
+                raise SkipCase(report["skipped"])
+            return module
+        return setup
+
+    def cold_import(module):
+        report = profile_import(module, top=0)
+        if "skipped" in report:
+            raise RuntimeError(f"❌ import {module} failed: {report['skipped']}")
+        return report
+
+    return [
+        Case(f"startup.import.{module}", "startup", cold_import, setup=importer(module), params={"module": module})
+        for module in DEFAULT_MODULES
+    ]
+
+# ------------------------------------------------------
+# 📦 suite → 케이스 목록
+# ------------------------------------------------------
+def build_cases(suites=SUITES, quick: bool = False) -> List[Case]:
+    builders = {
+        "graph": lambda: _graph_cases(QUICK_SIZES if quick else DEFAULT_SIZES),
+        "serialization": _serialization_cases,
+        "bridge": lambda: _bridge_cases(200 if quick else 1000),
+        "e2e": _e2e_cases,
+        "startup": _startup_cases,
+    }
+    cases = []
+    for suite in suites:
+        if suite not in builders:
+            raise ValueError(f"❌ Unknown benchmark suite: {suite} (expected one of {SUITES})")
+        cases.extend(builders[suite]())
+    return cases
+
+
+def close():
+    # ✅ TestClient 종료 (shutdown 훅 실행)
+    global _client
+    if _client is not None:
+        _client.__exit__(None, None, None)
+        _client = None
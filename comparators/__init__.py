@@ -0,0 +1,8 @@
+"""
+📦 Comparators
+──────────────────────────────────────────────
+- comparator 노드: 입력 하나를 여러 후보(task, model_name, backend)로 동시에 실행하고
+  후보별 출력 + 지연 시간 / 처리량 + 일치도(agreement)를 나란히 반환
+- 노드 예시: {"id": "cmp", "type": "comparator", "module": "text", "params": {"candidates": [...]}}
+- text: 텍스트 모델 비교 (같은 tokenizer를 쓰는 후보끼리 토큰화 공유)
+"""
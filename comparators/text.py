@@ -0,0 +1,235 @@
+"""
+📦 Comparator: text
+──────────────────────────────────────────────
+- 같은 텍스트 입력을 여러 후보(task, model_name, backend)로 동시에 실행 (GIMBAB_COMPARATOR_WORKERS)
+- 토큰화 공유: 공용 토큰화 캐시(models.text.tokenization) 기준 (tokenizer id, preprocess 설정)이 같은
+  후보끼리 그룹을 만들고 그룹 대표가 캐시를 한 번 채움 → 각 후보의 models.run_batch는 캐시 hit으로
+  forward + postprocess만 수행 (예: 같은 모델을 torch-fp32 / torch-int8-dynamic / onnxruntime으로 비교)
+- 모델 최대 길이를 넘는 입력이 있는 그룹은 캐시를 미리 채우지 않음 (chunk 단위로 실행기에서 토큰화)
+- 첫 번째 후보(baseline) 대비 일치도는 backend_compare.compare_outputs 지표 사용 (같은 task 후보만)
+- 후보 하나의 실패(backend 미설치 등)는 해당 후보의 error로 기록, 모든 후보가 실패하면 예외 전달
+- 워커 풀 모드(GIMBAB_MODEL_WORKERS > 0) / share_tokenization=False / GIMBAB_TOKEN_CACHE=0 이면
+  후보별 models.run_batch만 병렬 실행 (그룹 토큰화 없음)
+
+📌 params:
+- candidates: [ {"task", "model_name", "backend", "params", "id"} ] 또는 [ [task, model_name, backend] ]
+  (후보 params는 zero-shot candidate_labels 등 models.run_batch에 그대로 전달)
+- task: 후보에 task가 없을 때 기본값
+- share_tokenization: 기본 True
+
+📌 출력 형태 (run_batch는 레코드별 output + batch 전체 기준 지표):
+{
+  "baseline": "sentiment-analysis:default@torch-fp32",
+  "candidates": [
+    { "id", "task", "model_name", "backend", "output", "latency_ms", "total_ms", "throughput_per_s",
+      "tokenization": {"group", "shared_with", "ms"}, "agreement": {...}, "error" }
+  ]
+}
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from models import run_batch as run_model_batch
+from models.text import task_pipeline
+from models.text.backend_compare import compare_outputs
+from models.text.backends import resolve_backend
+from models.text.chunking import split_text, window_tokens
+from models.text.tokenization import TOKEN_CACHE_ENABLED, cache_scope, encode_batch, stage_params, supports_staging
+from models.worker_pool import worker_pool
+from utils.metrics import metrics
+
+# ✅ 후보 동시 실행 스레드 수 상한
+MAX_WORKERS = int(os.getenv("GIMBAB_COMPARATOR_WORKERS", "4"))
+
+# ✅ 토큰화 캐시를 쓰는 실행기 task (zero-shot은 엔진의 premise 토큰 캐시로 공유)
+SHARED_TASKS = ("sentiment-analysis", "ner", "translation", "summarization", "text2text-generation")
+
+# ------------------------------------------------------
+# 📌 후보 정리
+# ------------------------------------------------------
+def _candidates(candidates, default_task: Optional[str]) -> List[Dict[str, Any]]:
+    # 🚨 예외처리: 후보 없음 / task 없음 / id 중복
+    if not candidates:
+        raise ValueError("❌ comparator requires at least one candidate.")
+
+    normalized, seen = [], set()
+    for item in candidates:
+        if isinstance(item, (list, tuple)):
+            item = dict(zip(("task", "model_name", "backend"), item))
+        task = item.get("task") or default_task
+        if not task:
+            raise ValueError(f"❌ comparator candidate has no task: {item}")
+
+        backend = resolve_backend(item.get("backend"))
+        model_name = item.get("model_name")
+        candidate_id = item.get("id") or f"{task}:{model_name or 'default'}@{backend}"
+        if candidate_id in seen:
+            raise ValueError(f"❌ Duplicate comparator candidate: {candidate_id}")
+        seen.add(candidate_id)
+
+        normalized.append({
+            "id": candidate_id,
+            "task": task,
+            "model_name": model_name,
+            "backend": backend,
+            "params": dict(item.get("params") or {}),
+        })
+    return normalized
+
+# ------------------------------------------------------
+# 📦 후보 실행
+# ------------------------------------------------------
+def _run_direct(candidate: Dict[str, Any], inputs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # ✅ 후보 1개 batch 실행 (같은 tokenizer 후보는 공용 토큰화 캐시에서 encoded 입력 재사용)
+    start = time.perf_counter()
+    outputs = run_model_batch(
+        inputs, candidate["task"], "text", candidate["model_name"],
+        backend=candidate["backend"], **candidate["params"],
+    )
+    return {"outputs": outputs, "seconds": time.perf_counter() - start}
+
+def _prepare(candidate: Dict[str, Any]) -> Dict[str, Any]:
+    # ✅ pipeline 로딩 + 토큰화 공유 범위(tokenizer id, preprocess 설정) 계산 (실패 시 error 기록)
+    candidate["scope"] = None
+    if candidate["task"] not in SHARED_TASKS:
+        return candidate
+    try:
+        pipe = task_pipeline(candidate["task"], candidate["model_name"], False, candidate["backend"])
+    except Exception as e:
+        candidate["error"] = e
+        return candidate
+
+    if supports_staging(pipe):
+        preprocess_params = stage_params(pipe)[0]
+        candidate.update(pipe=pipe, preprocess_params=preprocess_params, scope=cache_scope(pipe, preprocess_params))
+    return candidate
+
+def _prime(leader: Dict[str, Any], texts: List[str]) -> Optional[Dict[str, Any]]:
+    # ✅ 그룹 대표 pipeline으로 encoded 입력 캐시 채우기 (chunk 분할 대상 입력이 있으면 건너뜀)
+    tokenizer = leader["pipe"].tokenizer
+    limit = window_tokens(tokenizer, leader["task"])
+    if any(split_text(tokenizer, text, limit, 0) is not None for text in texts):
+        return None
+
+    start = time.perf_counter()
+    encode_batch(leader["pipe"], texts, leader["preprocess_params"])
+    return {"seconds": time.perf_counter() - start}
+
+def _guarded(fn, *args) -> Dict[str, Any]:
+    try:
+        return fn(*args)
+    except Exception as e:
+        return {"error": e}
+
+def _execute(candidates: List[Dict[str, Any]], inputs: List[Dict[str, Any]], share_tokenization: bool) -> List[Dict[str, Any]]:
+    """
+    ✅ 후보별 {"outputs", "seconds", "tokenization"} 또는 {"error"} 반환 (후보 순서 유지)
+
+    1) pipeline 로딩 (병렬, 측정 제외)
+    2) tokenizer 그룹별 대표 pipeline으로 토큰화 캐시 채우기 (병렬, 그룹당 1회)
+    3) 후보별 batch 실행 (병렬, 같은 그룹 후보는 캐시 hit → forward + postprocess만)
+    """
+    texts = [item["text"] for item in inputs]
+    workers = max(1, min(MAX_WORKERS, len(candidates)))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gimbab-compare") as executor:
+        # ✅ 워커 풀 모드: 모델은 워커 프로세스에만 로딩 → 후보별 batch 호출만 병렬 실행
+        if worker_pool.enabled or not (share_tokenization and TOKEN_CACHE_ENABLED):
+            return list(executor.map(lambda c: _guarded(_run_direct, c, inputs), candidates))
+
+        prepared = list(executor.map(_prepare, candidates))
+
+        groups: Dict[Any, List[int]] = {}
+        for index, candidate in enumerate(prepared):
+            if "error" not in candidate and candidate["scope"] is not None:
+                groups.setdefault(candidate["scope"], []).append(index)
+
+        member_lists = list(groups.values())
+        primed = list(executor.map(lambda members: _guarded(_prime, prepared[members[0]], texts), member_lists))
+
+        tokenization: Dict[int, Dict[str, Any]] = {}
+        for group_index, (members, result) in enumerate(zip(member_lists, primed)):
+            if not result or "error" in result:
+                continue
+            for index in members:
+                tokenization[index] = {
+                    "group": group_index,
+                    "shared_with": [prepared[i]["id"] for i in members if i != index],
+                    "ms": round(result["seconds"] * 1000, 3),
+                }
+
+        def run_one(index: int) -> Dict[str, Any]:
+            candidate = prepared[index]
+            if "error" in candidate:
+                return {"error": candidate["error"]}
+            result = _guarded(_run_direct, candidate, inputs)
+            if index in tokenization and "error" not in result:
+                result["tokenization"] = tokenization[index]
+            return result
+
+        return list(executor.map(run_one, range(len(prepared))))
+
+# ------------------------------------------------------
+# 📊 결과 정리
+# ------------------------------------------------------
+def _report(candidates: List[Dict[str, Any]], results: List[Dict[str, Any]], count: int) -> List[Dict[str, Any]]:
+    baseline, base_result = candidates[0], results[0]
+
+    reports = []
+    for candidate, result in zip(candidates, results):
+        report = {key: candidate[key] for key in ("id", "task", "model_name", "backend")}
+        if "error" in result:
+            reports.append({**report, "error": f"{type(result['error']).__name__}: {result['error']}"})
+            continue
+
+        seconds = result["seconds"]
+        report.update({
+            "latency_ms": round(seconds * 1000 / (count or 1), 3),
+            "total_ms": round(seconds * 1000, 3),
+            "throughput_per_s": round(count / seconds, 3) if seconds > 0 else None,
+            "tokenization": result.get("tokenization"),
+            "agreement": None,
+        })
+        if candidate is not baseline and "error" not in base_result and candidate["task"] == baseline["task"]:
+            report["agreement"] = compare_outputs(candidate["task"], base_result["outputs"], result["outputs"])
+        reports.append(report)
+    return reports
+
+def _compare(inputs: List[Dict[str, Any]], params: Dict[str, Any]):
+    candidates = _candidates(params.get("candidates"), params.get("task"))
+    results = _execute(candidates, inputs, bool(params.get("share_tokenization", True)))
+
+    # 🚨 모든 후보 실패 → 첫 번째 오류 전달
+    if all("error" in result for result in results):
+        raise results[0]["error"]
+
+    metrics.inc("gimbab_comparator_inputs_total", len(inputs))
+    return candidates[0]["id"], _report(candidates, results, len(inputs)), results
+
+# ------------------------------------------------------
+# 📌 comparator 노드 실행 함수
+# ------------------------------------------------------
+def run(input: Dict[str, Any], **params) -> Dict[str, Any]:
+    # 📌 run(): 입력 1건을 모든 후보로 실행 → 후보별 출력 + 지표
+    baseline, reports, results = _compare([input], params)
+    for report, result in zip(reports, results):
+        if "outputs" in result:
+            report["output"] = result["outputs"][0]
+    return {"baseline": baseline, "candidates": reports}
+
+def run_batch(inputs: List[Dict[str, Any]], **params) -> List[Dict[str, Any]]:
+    # 📌 run_batch(): 입력 리스트를 한 번에 비교 → 레코드별 결과 (지표는 batch 전체 기준)
+    baseline, reports, results = _compare(list(inputs), params)
+    return [
+        {
+            "baseline": baseline,
+            "candidates": [
+                {**report, "output": result["outputs"][i]} if "outputs" in result else report
+                for report, result in zip(reports, results)
+            ],
+        }
+        for i in range(len(inputs))
+    ]
@@ -4,6 +4,7 @@
 - 실행 대상 모듈의 입력/출력에 대해 리소스 측정 로그 출력
 - 메모리 사용량 (byte) 및 토큰 수(단어 수 기반 추정)를 로깅
 - 디버깅 및 성능 최적화 분석에 유용
+- 비동기 모듈(arun)은 arun()으로 await 하며 측정
 
 📌 출력 예시:
 📦 resource_logger: hf_pipeline_runner
@@ -13,6 +14,8 @@
 
 import sys
 
+from utils.async_runtime import call_module, has_arun
+
 # ---------------------------------------------------
 # 📌 객체 크기 측정 유틸 함수
 # - sys.getsizeof 기반 단순 메모리 추정
@@ -44,21 +47,39 @@ def run(input: any, **params):
     if module is None or not hasattr(module, "run"):
         raise ValueError("resource_logger requires a valid 'module' with a 'run' method.")
 
-    # ✅ 입력 리소스 측정
-    input_size = get_size(input)
-    input_tokens = count_tokens(str(input))
-
     # 🔁 실제 실행
     result = module.run(input, **params)
 
-    # ✅ 출력 리소스 측정
+    # 🪵 입력 / 출력 리소스 측정 + 로그 출력
+    _log(module, input, result)
+
+    # ✅ 실행 결과 그대로 반환
+    return result
+
+# ---------------------------------------------------
+# 📌 비동기 evaluator 실행 함수
+# - 대상 모듈이 arun을 가진 경우 래퍼가 호출 (동기 모듈은 executor에서 실행)
+# ---------------------------------------------------
+async def arun(input: any, **params):
+    module = params.pop("module", None)
+
+    # 🚨 필수 조건: module 객체는 run() 또는 arun()을 가져야 함
+    if module is None or not (hasattr(module, "run") or has_arun(module)):
+        raise ValueError("resource_logger requires a valid 'module' with a 'run' or 'arun' method.")
+
+    result = await call_module(module, input, **params)
+    _log(module, input, result)
+
+    return result
+
+def _log(module, input, result):
+    # ✅ 입력 / 출력 리소스 측정
+    input_size = get_size(input)
+    input_tokens = count_tokens(str(input))
     output_size = get_size(result)
     output_tokens = count_tokens(str(result))
 
     # 🪵 리소스 로그 출력
     print(f"📦 resource_logger: {getattr(module, '__name__', module.__class__.__name__)}")
     print(f"  - input size:  {input_size} bytes, tokens: {input_tokens}")
-    print(f"  - output size: {output_size} bytes, tokens: {output_tokens}")
-
-    # ✅ 실행 결과 그대로 반환
-    return result
\ No newline at end of file
+    print(f"  - output size: {output_size} bytes, tokens: {output_tokens}")
\ No newline at end of file
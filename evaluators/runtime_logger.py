@@ -4,6 +4,7 @@
 - 대상 모듈(module.run)을 실행하면서 실행 시간을 측정함
 - 성능 모니터링 또는 디버깅 목적에 유용
 - 입력/출력 데이터는 수정 없이 그대로 통과시킴
+- 비동기 모듈(arun)은 arun()으로 await 하며 측정 (I/O 대기 시간 포함)
 
 📌 사용 예:
 - evaluator로 등록 시, 해당 노드의 실행 시간을 로그로 출력
@@ -12,6 +13,8 @@
 
 import time
 
+from utils.async_runtime import call_module, has_arun
+
 # ---------------------------------------------------
 # 📌 evaluator 실행 함수
 # - 파이프라인 노드 실행 전후로 시간 측정
@@ -31,12 +34,30 @@ def run(input: any, **params):
     # 🔁 원래 모듈 실행
     result = module.run(input, **params)
 
-    # ✅ 시간 측정 종료
-    elapsed = time.time() - start_time
+    # ✅ 시간 측정 종료 + 로그 출력
+    _log(module, "run", time.time() - start_time)
+
+    # ✅ 결과 그대로 반환
+    return result
+
+# ---------------------------------------------------
+# 📌 비동기 evaluator 실행 함수
+# - 대상 모듈이 arun을 가진 경우 래퍼가 호출 (동기 모듈은 executor에서 실행)
+# ---------------------------------------------------
+async def arun(input: any, **params):
+    module = params.pop("module", None)
 
+    # 🚨 유효성 검사: module.run 또는 module.arun이 존재해야 함
+    if module is None or not (hasattr(module, "run") or has_arun(module)):
+        raise ValueError("runtime_logger requires a valid 'module' with a 'run' or 'arun' method.")
+
+    start_time = time.time()
+    result = await call_module(module, input, **params)
+    _log(module, "arun" if has_arun(module) else "run", time.time() - start_time)
+
+    return result
+
+def _log(module, method: str, elapsed: float):
     # 🪵 로그 출력 (모듈 이름 또는 미지정 시 문자열 fallback)
     module_name = getattr(module, "__name__", str(module))
-    print(f"⏱️ runtime_logger: {module_name}.run() took {elapsed:.4f} seconds")
-
-    # ✅ 결과 그대로 반환
-    return result
\ No newline at end of file
+    print(f"⏱️ runtime_logger: {module_name}.{method}() took {elapsed:.4f} seconds")
\ No newline at end of file
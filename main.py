@@ -2,18 +2,91 @@
 # - 클라이언트로부터 JSON 형식의 파이프라인 실행 요청을 받음
 # - pipeline_graph_runner.py를 통해 실행 로직을 위임
 # - 결과를 JSON 형식으로 반환
+# - 실행은 이벤트 루프 밖의 bounded pool에서 수행 (admission control / timeout)
+# - 오래 걸리는 그래프는 job API(/pipeline/jobs)로 제출 후 조회 / long-poll
 # uvicorn main:app --reload
 
+import asyncio
+import os
+import threading
+
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 # 📌 파이프라인 실행 로직을 외부 모듈로 분리하여 호출
-from pipeline_graph_runner import run_pipeline_graph
+from pipeline_graph_runner import run_pipeline_graph, run_registered_plan, run_pipeline_batch, stream_pipeline_graph, run_pipeline_file
+from utils.plan_compiler import register_plan, unregister_plan, plan_stats, PlanNotFound, PlanLimitReached
+from utils.execution_pool import GraphExecutionPool, AdmissionRejected, DEFAULT_TIMEOUT
+from utils.graph_executor import GraphCancelled
+from utils.job_queue import JobQueue, JobNotFound, JobRejected
+from utils.serialization import dumps, packb, msgpack_available
+from utils.metrics import metrics
+
+# -----------------------------------------
+# 📌 빠른 JSON 응답 클래스
+# - utils.serialization.dumps (orjson 설치 시 orjson) 로 바로 인코딩
+# - 결과는 실행기에서 이미 변환되어 있으므로 jsonable_encoder를 거치지 않음
+# -----------------------------------------
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+def _encode_response(http_request: Request, content: Any, status_code: int = 200) -> Response:
+    # ✅ Accept: application/msgpack (또는 x-msgpack) + msgpack 설치 시 msgpack 응답
+    accept = http_request.headers.get("accept", "")
+    if msgpack_available() and ("application/msgpack" in accept or "application/x-msgpack" in accept):
+        return Response(content=packb(content), status_code=status_code, media_type=MSGPACK_MEDIA_TYPE)
+    return FastJSONResponse(content=content, status_code=status_code)
 
 # ✅ FastAPI 애플리케이션 인스턴스 생성
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
+
+# ✅ 그래프 실행 풀 (GIMBAB_MAX_INFLIGHT_GRAPHS / GIMBAB_MAX_QUEUED_GRAPHS)
+graph_pool = GraphExecutionPool()
+
+# ✅ 비동기 job 큐 (GIMBAB_JOB_DB / GIMBAB_JOB_WORKERS / GIMBAB_JOB_MAX_QUEUED / GIMBAB_JOB_RESULT_TTL)
+job_queue = JobQueue(runners={"graph": run_pipeline_graph, "batch": run_pipeline_batch, "file": run_pipeline_file})
+
+# ✅ warm-up 완료 전 트래픽 수신 여부 (1: 완료 후 수신, 0: 백그라운드 warm-up)
+WARMUP_BLOCKING = os.getenv("GIMBAB_WARMUP_BLOCKING", "1") == "1"
+
+# -----------------------------------------
+# 📌 서버 시작 훅: warm-up manifest 기반 모델 preload
+# - GIMBAB_WARMUP_MANIFEST 경로의 모델을 로딩 + 더미 입력 실행
+# - blocking 모드에서는 warm-up이 끝나야 uvicorn이 요청을 받기 시작함
+# -----------------------------------------
+@app.on_event("startup")
+async def warm_up_models():
+    from models.warmup import load_manifest, warm_up
+    from models.worker_pool import worker_pool
+
+    # ✅ 모델 워커 풀 모드: 워커 프로세스를 먼저 띄움 (spawn)
+    if worker_pool.enabled:
+        await asyncio.to_thread(worker_pool.start)
+
+    # ✅ job 워커 시작 (이전 실행에서 남은 job 복구 포함)
+    await asyncio.to_thread(job_queue.start)
+
+    manifest = load_manifest()
+    if WARMUP_BLOCKING:
+        await asyncio.to_thread(warm_up, manifest)
+    else:
+        asyncio.get_running_loop().run_in_executor(None, warm_up, manifest)
+
+# -----------------------------------------
+# 📌 서버 종료 훅: job 워커 / 모델 워커 프로세스 / 비동기 노드 이벤트 루프 정리
+# -----------------------------------------
+@app.on_event("shutdown")
+async def stop_model_workers():
+    from models.worker_pool import worker_pool
+    from utils.async_runtime import async_runtime
+    await asyncio.to_thread(job_queue.shutdown)
+    await asyncio.to_thread(worker_pool.shutdown)
+    await asyncio.to_thread(async_runtime.shutdown)
 
 # -----------------------------------------
 # 📌 입력 요청 바디 구조 정의
@@ -21,28 +94,392 @@ app = FastAPI()
 # - 예시 입력:
 #   {
 #       "nodes": [...],
-#       "edges": [...]
+#       "edges": [...],
+#       "options": {"max_workers": 4, "worker_limits": {"model": 2}, "timeout": 30, "cache": true, "timing": true}  # 선택
 #   }
 # -----------------------------------------
 class PipelineRequest(BaseModel):
     nodes: list
     edges: list
+    options: Dict[str, Any] = {}
+
+# -----------------------------------------
+# 📌 클라이언트 연결 종료 감시
+# - 연결이 끊기면 cancel_event를 set하여 남은 노드 실행 중단
+# -----------------------------------------
+async def _watch_disconnect(http_request: Request, cancel_event: threading.Event):
+    while not cancel_event.is_set():
+        if await http_request.is_disconnected():
+            cancel_event.set()
+            return
+        await asyncio.sleep(0.5)
+
+# -----------------------------------------
+# 📌 실행 풀 위임 공통 처리
+# - fn(*args, cancel_event, metadata) 형태로 실행 풀에서 호출
+# - 결과를 성공/실패 여부와 함께 JSON으로 응답 (Accept: application/msgpack 시 msgpack)
+# - 429: 실행/대기 상한 초과, 504: timeout 초과, 404: 미등록 plan_id
+# - 403: GIMBAB_STREAM_ROOT 밖의 파일 경로, 409: 덮어쓰기 미지정 상태의 기존 출력 파일
+# -----------------------------------------
+async def _run_in_pool(http_request: Request, options: Dict[str, Any], fn, *args):
+    cancel_event = threading.Event()
+    timeout = options.get("timeout") or DEFAULT_TIMEOUT or None
+    metadata = {}
+    watcher = asyncio.create_task(_watch_disconnect(http_request, cancel_event))
+
+    try:
+        result = await graph_pool.run(
+            fn,
+            *args,
+            cancel_event,
+            metadata,
+            cancel_event=cancel_event,
+            timeout=timeout,
+        )
+
+        # ✅ 정상 실행 결과 반환 (캐시 통계 등 부가 정보는 meta로 전달)
+        content = {"status": "success", "result": result}
+        if metadata:
+            content["meta"] = metadata
+        return _encode_response(http_request, content)
+
+    except AdmissionRejected as e:
+        # 🚦 과부하: 재시도 유도
+        return JSONResponse(status_code=429, content={"status": "error", "message": str(e)}, headers={"Retry-After": "1"})
+
+    except asyncio.TimeoutError:
+        return JSONResponse(status_code=504, content={"status": "error", "message": f"❌ Pipeline execution timed out after {timeout}s."})
+
+    except GraphCancelled as e:
+        return JSONResponse(status_code=499, content={"status": "error", "message": str(e)})
+
+    except PlanNotFound as e:
+        return JSONResponse(status_code=404, content={"status": "error", "message": str(e.args[0] if e.args else e)})
+
+    except PermissionError as e:
+        return JSONResponse(status_code=403, content={"status": "error", "message": str(e)})
+
+    except FileExistsError as e:
+        return JSONResponse(status_code=409, content={"status": "error", "message": str(e)})
+
+    except Exception as e:
+        # 🚨 실행 중 예외 발생 시 에러 메시지 반환
+        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+
+    finally:
+        watcher.cancel()
 
 # -----------------------------------------
 # ✅ 실행 API 엔드포인트
 # POST /pipeline/graph/run
-# - JSON 요청을 받아 실행 로직으로 전달
-# - 결과를 성공/실패 여부와 함께 JSON으로 응답
+# - JSON 요청을 받아 실행 풀로 전달 (이벤트 루프는 블로킹되지 않음)
 # -----------------------------------------
 @app.post("/pipeline/graph/run")
-async def run_pipeline(request: PipelineRequest):
+async def run_pipeline(request: PipelineRequest, http_request: Request):
+    # 🔄 파이프라인 실행 함수 호출 (JSON → dict 변환하여 전달)
+    return await _run_in_pool(http_request, request.options, run_pipeline_graph, request.dict())
+
+# -----------------------------------------
+# ✅ 스트리밍 실행 API 엔드포인트
+# POST /pipeline/graph/stream
+# - 노드가 끝날 때마다 결과(또는 오류)를 한 줄씩 전송, 마지막에 summary 이벤트
+# - Accept: text/event-stream → SSE, 그 외 → NDJSON (application/x-ndjson)
+# -----------------------------------------
+def _format_event(event: Dict[str, Any], sse: bool) -> str:
+    data = dumps(event).decode("utf-8")
+    if sse:
+        return f"event: {event['event']}\ndata: {data}\n\n"
+    return data + "\n"
+
+async def _stream_events(events: asyncio.Queue, cancel_event: threading.Event, timeout, sse: bool):
+    deadline = asyncio.get_running_loop().time() + timeout if timeout else None
+
+    try:
+        while True:
+            remaining = None if deadline is None else deadline - asyncio.get_running_loop().time()
+            try:
+                event = await asyncio.wait_for(events.get(), remaining)
+            except asyncio.TimeoutError:
+                cancel_event.set()
+                yield _format_event({"event": "summary", "status": "timeout", "message": f"❌ Pipeline execution timed out after {timeout}s."}, sse)
+                return
+
+            yield _format_event(event, sse)
+            if event["event"] == "summary":
+                return
+    finally:
+        # 🛑 클라이언트 연결 종료 / timeout 시 남은 노드 실행 중단
+        cancel_event.set()
+
+@app.post("/pipeline/graph/stream")
+async def stream_pipeline(request: PipelineRequest, http_request: Request):
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    cancel_event = threading.Event()
+    timeout = request.options.get("timeout") or DEFAULT_TIMEOUT or None
+
+    def emit(event):
+        loop.call_soon_threadsafe(events.put_nowait, event)
+
+    try:
+        graph_pool.submit(stream_pipeline_graph, request.dict(), emit, cancel_event, {})
+    except AdmissionRejected as e:
+        return JSONResponse(status_code=429, content={"status": "error", "message": str(e)}, headers={"Retry-After": "1"})
+
+    sse = "text/event-stream" in http_request.headers.get("accept", "")
+    media_type = "text/event-stream" if sse else "application/x-ndjson"
+    return StreamingResponse(_stream_events(events, cancel_event, timeout, sse), media_type=media_type)
+
+# -----------------------------------------
+# ✅ 배치 실행 API 엔드포인트
+# POST /pipeline/graph/run_batch
+# - 하나의 그래프 + 여러 입력 레코드 → 노드별 column-wise 실행
+# - 레코드별 오류는 해당 레코드 결과에만 기록 (나머지는 정상 처리)
+# -----------------------------------------
+class PipelineBatchRequest(PipelineRequest):
+    records: list
+
+@app.post("/pipeline/graph/run_batch")
+async def run_pipeline_batch_endpoint(request: PipelineBatchRequest, http_request: Request):
+    return await _run_in_pool(http_request, request.options, run_pipeline_batch, request.dict())
+
+# -----------------------------------------
+# ✅ 파일 코퍼스 스트리밍 실행 API 엔드포인트
+# POST /pipeline/graph/run_file
+# - 서버 로컬 파일을 입력 어댑터(line_text / jsonl / csv_column)로 lazy하게 읽어
+#   batch 단위로 실행하고, 결과는 출력 어댑터(jsonl_writer)로 바로 기록
+# - 응답은 처리 요약만 반환 (대용량 코퍼스는 options.timeout을 넉넉히 지정)
+# - 경로는 GIMBAB_STREAM_ROOT(기본 ~/.cache/gimbab/data) 기준 상대 경로만 허용 (밖의 경로는 403)
+# - sink 파일이 이미 있으면 409 (sink.overwrite / sink.append로 명시)
+# -----------------------------------------
+class PipelineFileRequest(PipelineRequest):
+    source: Dict[str, Any]
+    sink: Dict[str, Any]
+
+@app.post("/pipeline/graph/run_file")
+async def run_pipeline_file_endpoint(request: PipelineFileRequest, http_request: Request):
+    return await _run_in_pool(http_request, request.options, run_pipeline_file, request.dict())
+
+# -----------------------------------------
+# ✅ 비동기 job API
+# POST   /pipeline/jobs            : job 제출 → 202 + job_id (kind: graph / batch / file)
+# GET    /pipeline/jobs/{job_id}   : 상태 / 결과 조회 (?wait=초 → 종료될 때까지 long-poll)
+# DELETE /pipeline/jobs/{job_id}   : 취소 (대기 중이면 즉시, 실행 중이면 다음 노드 투입 전 중단)
+# GET    /pipeline/jobs            : 큐 상태
+# - priority: 큰 값 먼저 / deadline: 제출 후 완료까지 허용 시간(초) / ttl: 결과 보관 시간(초)
+# - 429: 대기 job 수 상한 초과, 404: 없는 job 또는 결과 TTL 만료
+# -----------------------------------------
+class JobRequest(PipelineRequest):
+    kind: str = "graph"
+    records: Optional[list] = None
+    source: Optional[Dict[str, Any]] = None
+    sink: Optional[Dict[str, Any]] = None
+    priority: int = 0
+    deadline: Optional[float] = None
+    ttl: Optional[float] = None
+
+def _job_not_found(job_id: str) -> JSONResponse:
+    return JSONResponse(status_code=404, content={"status": "error", "message": f"❌ Unknown or expired job: {job_id}"})
+
+@app.post("/pipeline/jobs")
+async def submit_job(request: JobRequest):
+    payload = request.dict(exclude={"kind", "priority", "deadline", "ttl"}, exclude_none=True)
+    try:
+        job = await asyncio.to_thread(job_queue.submit, request.kind, payload, request.priority, request.deadline, request.ttl)
+    except JobRejected as e:
+        return JSONResponse(status_code=429, content={"status": "error", "message": str(e)}, headers={"Retry-After": "1"})
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"status": "error", "message": str(e)})
+    return FastJSONResponse(status_code=202, content={"status": "accepted", "job": job})
+
+@app.get("/pipeline/jobs")
+async def job_queue_status():
+    return await asyncio.to_thread(job_queue.stats)
+
+@app.get("/pipeline/jobs/{job_id}")
+async def get_job(job_id: str, http_request: Request, wait: float = 0):
+    try:
+        # ✅ long-poll 대기는 이벤트 루프에서, 각 조회는 executor 스레드에서 (루프가 DB lock을 기다리지 않음)
+        job = await job_queue.wait_async(job_id, wait)
+    except JobNotFound:
+        return _job_not_found(job_id)
+    return _encode_response(http_request, {"status": "success", "job": job})
+
+@app.delete("/pipeline/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    try:
+        job = await asyncio.to_thread(job_queue.cancel, job_id)
+    except JobNotFound:
+        return _job_not_found(job_id)
+    return {"status": "success", "job": job}
+
+# -----------------------------------------
+# ✅ 등록형 실행 계획 API
+# POST   /pipeline/plans                : 스펙 컴파일 + 등록 → plan_id 반환 (등록 수 상한 초과 시 409)
+# POST   /pipeline/plans/{plan_id}/run  : 등록된 계획 실행 (inputs로 소스 노드 입력 주입)
+# DELETE /pipeline/plans/{plan_id}      : 등록 해제
+# GET    /pipeline/plans                : 계획 캐시 / 등록 현황
+# -----------------------------------------
+class PlanRunRequest(BaseModel):
+    inputs: Dict[str, Any] = {}
+    options: Dict[str, Any] = {}
+
+@app.post("/pipeline/plans")
+async def register_pipeline_plan(request: PipelineRequest):
     try:
-        # 🔄 파이프라인 실행 함수 호출 (JSON → dict 변환하여 전달)
-        result = run_pipeline_graph(request.dict())
-        
-        # ✅ 정상 실행 결과 반환
-        return JSONResponse(content={"status": "success", "result": result})
-    
+        plan_id = await asyncio.to_thread(register_plan, request.dict())
+        return {"status": "success", "plan_id": plan_id}
+    except PlanLimitReached as e:
+        return JSONResponse(status_code=409, content={"status": "error", "message": str(e)})
     except Exception as e:
-        # 🚨 실행 중 예외 발생 시 에러 메시지 반환
-        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
\ No newline at end of file
+        return JSONResponse(status_code=400, content={"status": "error", "message": str(e)})
+
+@app.post("/pipeline/plans/{plan_id}/run")
+async def run_pipeline_plan(plan_id: str, request: PlanRunRequest, http_request: Request):
+    return await _run_in_pool(http_request, request.options, run_registered_plan, plan_id, request.inputs, request.options)
+
+@app.delete("/pipeline/plans/{plan_id}")
+async def delete_pipeline_plan(plan_id: str):
+    if not unregister_plan(plan_id):
+        return JSONResponse(status_code=404, content={"status": "error", "message": f"❌ Unknown plan id: {plan_id}"})
+    return {"status": "success"}
+
+@app.get("/pipeline/plans")
+async def pipeline_plans():
+    return plan_stats()
+
+# -----------------------------------------
+# ✅ 헬스 체크
+# GET /health/live  : 프로세스 생존 여부 (항상 200)
+# GET /health/ready : warm-up 완료 여부 (완료 전 503)
+# -----------------------------------------
+@app.get("/health/live")
+async def liveness():
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness():
+    from models.warmup import get_warmup_state
+
+    state = get_warmup_state()
+    status_code = 200 if state["ready"] else 503
+    return JSONResponse(status_code=status_code, content={"status": "ready" if state["ready"] else "warming-up", **state})
+
+# -----------------------------------------
+# ✅ 노드 결과 캐시 통계 조회 / 초기화
+# GET    /pipeline/cache
+# DELETE /pipeline/cache
+# -----------------------------------------
+@app.get("/pipeline/cache")
+async def cache_status():
+    from utils.result_cache import result_cache
+    return result_cache.stats()
+
+@app.delete("/pipeline/cache")
+async def clear_cache():
+    from utils.result_cache import result_cache
+    result_cache.clear()
+    return {"status": "success"}
+
+# -----------------------------------------
+# ✅ 실행 풀 상태 조회
+# GET /pipeline/pool
+# -----------------------------------------
+@app.get("/pipeline/pool")
+async def pool_status():
+    return graph_pool.stats()
+
+# -----------------------------------------
+# ✅ 동일 요청 병합(single-flight) 상태 조회
+# GET /pipeline/singleflight
+# - graph: 동일 그래프 + 입력 요청 / node: 동일 모델 노드 호출
+# - in_flight: 진행 중 key 수, leaders: 실제 실행 수, shared: 결과를 공유받은 호출 수
+# -----------------------------------------
+@app.get("/pipeline/singleflight")
+async def singleflight_status():
+    from utils.single_flight import graph_flight, node_flight
+    return {"graph": graph_flight.stats(), "node": node_flight.stats()}
+
+# -----------------------------------------
+# ✅ 지표 조회 (Prometheus text format)
+# GET /metrics
+# - 노드별 실행/대기 시간 histogram, 모델 로딩/추론 시간, 토큰 수, RSS 등
+# - 실행 풀 상태는 조회 시점 gauge로 함께 노출
+# -----------------------------------------
+@app.get("/metrics")
+async def metrics_endpoint():
+    for name, value in graph_pool.stats().items():
+        metrics.set(f"gimbab_pool_{name}", value)
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+# -----------------------------------------
+# ✅ micro-batching 지표 조회
+# GET /models/batching
+# - (task, model_name, 옵션)별 batch 크기 / 대기 시간 통계
+# -----------------------------------------
+@app.get("/models/batching")
+async def batching_status():
+    from models.text.batching import batcher
+    return batcher.stats()
+
+# -----------------------------------------
+# ✅ 토큰화 캐시 지표 조회 / 초기화
+# GET    /models/tokenization
+# DELETE /models/tokenization
+# - tokenizer id 목록 + encoded 입력 캐시 hit / miss / eviction
+# -----------------------------------------
+@app.get("/models/tokenization")
+async def tokenization_status():
+    from models.text.tokenization import encoding_cache
+    return encoding_cache.stats()
+
+@app.delete("/models/tokenization")
+async def clear_tokenization():
+    from models.text.tokenization import encoding_cache
+    encoding_cache.clear()
+    return {"status": "success"}
+
+# -----------------------------------------
+# ✅ 공용 모델 registry 조회 / pin 관리
+# GET    /models/registry
+# POST   /models/registry/pin/{key}   (예: key = "ner:default")
+# DELETE /models/registry/pin/{key}
+# - 워커 풀 모드(GIMBAB_MODEL_WORKERS > 0)에서는 모든 모델 워커의 registry에도 적용
+# -----------------------------------------
+@app.get("/models/registry")
+async def registry_status():
+    from models.registry import model_registry
+    return model_registry.stats()
+
+async def _apply_pin(op: str, key: str):
+    # ✅ 워커 풀 모드: 모델은 워커 프로세스 registry에 있으므로 모든 워커에 전달
+    from models.registry import model_registry
+    from models.worker_pool import worker_pool
+
+    getattr(model_registry, op)(key)
+    if worker_pool.enabled:
+        await asyncio.to_thread(worker_pool.broadcast, op, key)
+
+@app.post("/models/registry/pin/{key:path}")
+async def pin_model(key: str):
+    await _apply_pin("pin", key)
+    return {"status": "success", "pinned": key}
+
+@app.delete("/models/registry/pin/{key:path}")
+async def unpin_model(key: str):
+    await _apply_pin("unpin", key)
+    return {"status": "success", "unpinned": key}
+
+# -----------------------------------------
+# ✅ 모델 워커 풀 상태 조회
+# GET /models/workers           : 워커별 pid / 생존 여부 / 처리 중 요청 수
+# GET /models/workers?detail=1  : 각 워커의 model_registry 상태 포함
+# -----------------------------------------
+@app.get("/models/workers")
+async def model_workers(detail: bool = False):
+    from models.worker_pool import worker_pool
+
+    report = worker_pool.stats()
+    if detail and worker_pool.enabled:
+        report["registries"] = await asyncio.to_thread(worker_pool.broadcast, "stats")
+    return report
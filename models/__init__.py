@@ -3,9 +3,12 @@
 ──────────────────────────────────────────────
 - 도메인(text, vision, audio, multimodal)에 따라 내부 실행기로 분기하는 공통 진입점
 - 예시: domain="text", task="sentiment-analysis" → models.text.run() 호출
+- run_batch(): 입력 리스트를 도메인별 batch 실행기로 분기 (배치 실행 엔진에서 사용)
+- GIMBAB_MODEL_WORKERS > 0 이면 모델 워커 프로세스(worker_pool.py)로 위임
 """
 
-from models.text import run as run_text
+from models.worker_pool import worker_pool
+from models.text import run as run_text, run_batch as run_text_batch
 # from models.vision import run as run_vision
 # from models.audio import run as run_audio
 # from models.multimodal import run as run_multimodal
@@ -13,6 +16,10 @@ from models.text import run as run_text
 def run(input, task, domain="text", model_name=None, reload=False, **kwargs):
     # 📌 run(): domain에 따라 전용 실행기로 분기하여 모델 실행
 
+    # ✅ 워커 풀 모드: 모델 key 기준으로 워커 프로세스에 위임
+    if worker_pool.enabled:
+        return worker_pool.call("run", f"{task}:{model_name or 'default'}", input, task, domain, model_name, reload, **kwargs)
+
     # ✅ 텍스트 도메인 실행
     if domain == "text":
         return run_text(input, task, model_name, reload, **kwargs)
@@ -27,4 +34,18 @@ def run(input, task, domain="text", model_name=None, reload=False, **kwargs):
 
     # ❌ 알 수 없는 도메인 입력 시 예외 처리
     else:
-        raise ValueError(f"❌ Unknown model domain: {domain}")
\ No newline at end of file
+        raise ValueError(f"❌ Unknown model domain: {domain}")
+
+def run_batch(inputs, task, domain="text", model_name=None, reload=False, **kwargs):
+    # 📌 run_batch(): 입력 리스트 → 입력별 결과 리스트 (domain별 batch 실행기로 분기)
+
+    if worker_pool.enabled:
+        return worker_pool.call("run_batch", f"{task}:{model_name or 'default'}", inputs, task, domain, model_name, reload, **kwargs)
+
+    # ✅ 텍스트 도메인 실행
+    if domain == "text":
+        return run_text_batch(inputs, task, model_name, reload, **kwargs)
+
+    # ❌ 알 수 없는 도메인 입력 시 예외 처리
+    else:
+        raise ValueError(f"❌ Unknown model domain: {domain}")
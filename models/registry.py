@@ -0,0 +1,222 @@
+"""
+📦 Model Registry
+──────────────────────────────────────────────
+- 모든 모델 실행기가 공유하는 중앙 모델(pipeline) 캐시
+- 개수 / 메모리(byte) 예산 + LRU 기반 eviction
+- key별 로딩 lock: 같은 모델에 대한 동시 첫 요청이 모델을 두 번 로딩하지 않음
+- pin / unpin: 자주 쓰는 모델은 eviction 대상에서 제외
+- reload 정책: 클라이언트의 reload=True 요청을 허용 / 차단 / 빈도 제한
+
+📌 사용 예시:
+from models.registry import model_registry
+pipe = model_registry.get("ner:default", lambda: pipeline("ner"), reload=False)
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from utils.metrics import metrics
+
+# ------------------------------------------------------
+# ⚙️ 기본 예산 (환경 변수로 조정 가능, 0 = 제한 없음)
+# ------------------------------------------------------
+DEFAULT_MAX_MODELS = int(os.getenv("GIMBAB_MODEL_CACHE_MAX_MODELS", "8"))
+DEFAULT_MAX_BYTES = int(float(os.getenv("GIMBAB_MODEL_CACHE_MAX_MB", "0")) * 1024 * 1024)
+
+# ------------------------------------------------------
+# ⚙️ 클라이언트 reload 정책
+# - allow: 항상 재로딩 / deny: 무시하고 캐시 사용
+# - rate-limit: key별로 GIMBAB_RELOAD_MIN_INTERVAL 초에 한 번만 재로딩
+# ------------------------------------------------------
+RELOAD_POLICIES = ("allow", "deny", "rate-limit")
+DEFAULT_RELOAD_POLICY = os.getenv("GIMBAB_RELOAD_POLICY", "allow")
+DEFAULT_RELOAD_MIN_INTERVAL = float(os.getenv("GIMBAB_RELOAD_MIN_INTERVAL", "300"))
+
+# ------------------------------------------------------
+# 📌 모델 메모리 추정 유틸 함수
+# - HF pipeline / torch 모듈의 parameter + buffer 크기 합산
+# - 측정 불가 시 0 (개수 예산만 적용됨)
+# ------------------------------------------------------
+def estimate_model_bytes(obj: Any) -> int:
+    model = getattr(obj, "model", obj)
+    try:
+        total = sum(p.numel() * p.element_size() for p in model.parameters())
+        total += sum(b.numel() * b.element_size() for b in model.buffers())
+        return int(total)
+    except Exception:
+        return 0
+
+
+class _Entry:
+    __slots__ = ("value", "size_bytes", "loaded_at", "load_seconds", "hits")
+
+    def __init__(self, value, size_bytes, load_seconds):
+        self.value = value
+        self.size_bytes = size_bytes
+        self.loaded_at = time.time()
+        self.load_seconds = load_seconds
+        self.hits = 0
+
+
+# ------------------------------------------------------
+# 📦 ModelRegistry
+# ------------------------------------------------------
+class ModelRegistry:
+    """
+    ✅ LRU + 메모리 예산 기반 공용 모델 캐시
+
+    - get(key, loader, reload): 캐시 hit 시 반환, miss 시 loader()로 로딩 후 등록
+    - pin(key) / unpin(key): pin된 모델은 eviction 되지 않음 (로딩 전에 pin 가능)
+    - evict(key): 명시적 제거
+    - reload_policy: 허용되지 않은 reload 요청은 캐시 조회로 처리 (reloads_suppressed 집계)
+    - stats(): 캐시 상태 조회
+    """
+
+    def __init__(
+        self,
+        max_models: int = DEFAULT_MAX_MODELS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        reload_policy: str = DEFAULT_RELOAD_POLICY,
+        reload_min_interval: float = DEFAULT_RELOAD_MIN_INTERVAL,
+    ):
+        if reload_policy not in RELOAD_POLICIES:
+            raise ValueError(f"❌ Unknown reload policy: {reload_policy}")
+
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+        self.reload_policy = reload_policy
+        self.reload_min_interval = reload_min_interval
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._pinned = set()
+        self._load_locks: Dict[str, list] = {}
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "loads": 0, "evictions": 0, "reloads_suppressed": 0}
+
+    def get(self, key: str, loader: Callable[[], Any], reload: bool = False) -> Any:
+        # ✅ 0. reload 정책 적용 (이미 로딩된 모델에 한해)
+        if reload and not self._reload_allowed(key):
+            reload = False
+
+        # ✅ 1. 캐시 hit → LRU 순서 갱신 후 반환
+        hit = None if reload else self._lookup(key)
+        if hit is not None:
+            return hit
+
+        # 📌 key별 load lock은 기다리는 호출이 있는 동안만 유지 ([lock, 대기 수], 0이 되면 제거)
+        with self._lock:
+            slot = self._load_locks.get(key)
+            if slot is None:
+                slot = self._load_locks[key] = [threading.Lock(), 0]
+            slot[1] += 1
+
+        try:
+            # ✅ 2. key별 lock: 동시에 들어온 첫 요청 중 하나만 로딩
+            with slot[0]:
+                hit = None if reload else self._lookup(key)
+                if hit is not None:
+                    return hit
+
+                with self._lock:
+                    self._counters["misses"] += 1
+
+                start = time.perf_counter()
+                value = loader()
+                load_seconds = time.perf_counter() - start
+                metrics.observe("gimbab_model_load_seconds", load_seconds, model=key)
+
+                entry = _Entry(value, estimate_model_bytes(value), load_seconds)
+                with self._lock:
+                    self._counters["loads"] += 1
+                    self._entries.pop(key, None)
+                    self._entries[key] = entry
+                    self._evict_over_budget(keep=key)
+
+                return value
+        finally:
+            with self._lock:
+                slot[1] -= 1
+                if slot[1] == 0:
+                    del self._load_locks[key]
+
+    def _reload_allowed(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self.reload_policy == "allow":
+                return True
+
+            allowed = (
+                self.reload_policy == "rate-limit"
+                and time.time() - entry.loaded_at >= self.reload_min_interval
+            )
+            if not allowed:
+                self._counters["reloads_suppressed"] += 1
+            return allowed
+
+    def _lookup(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            entry.hits += 1
+            self._counters["hits"] += 1
+            return entry.value
+
+    def _evict_over_budget(self, keep: str):
+        # 🔁 LRU 순서로 pin되지 않은 모델부터 제거 (방금 로딩한 모델은 유지)
+        def over_budget():
+            if self.max_models and len(self._entries) > self.max_models:
+                return True
+            if self.max_bytes and sum(e.size_bytes for e in self._entries.values()) > self.max_bytes:
+                return True
+            return False
+
+        for key in list(self._entries.keys()):
+            if not over_budget():
+                break
+            if key == keep or key in self._pinned:
+                continue
+            del self._entries[key]
+            self._counters["evictions"] += 1
+
+    def pin(self, key: str):
+        with self._lock:
+            self._pinned.add(key)
+
+    def unpin(self, key: str):
+        with self._lock:
+            self._pinned.discard(key)
+            self._evict_over_budget(keep=None)
+
+    def evict(self, key: str) -> bool:
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def stats(self) -> Dict[str, Any]:
+        # 📊 캐시 상태 (LRU 순서: 오래된 것 → 최근 사용)
+        with self._lock:
+            return {
+                **self._counters,
+                "max_models": self.max_models,
+                "max_bytes": self.max_bytes,
+                "reload_policy": self.reload_policy,
+                "total_bytes": sum(e.size_bytes for e in self._entries.values()),
+                "models": [
+                    {
+                        "key": key,
+                        "size_bytes": entry.size_bytes,
+                        "load_seconds": round(entry.load_seconds, 4),
+                        "hits": entry.hits,
+                        "pinned": key in self._pinned,
+                    }
+                    for key, entry in self._entries.items()
+                ],
+                "pinned": sorted(self._pinned),
+            }
+
+
+# ✅ 프로세스 공용 registry 인스턴스
+model_registry = ModelRegistry()
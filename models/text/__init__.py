@@ -3,32 +3,122 @@
 ──────────────────────────────────────────────
 - 입력된 task 이름에 따라 알맞은 실행기로 분기 처리
 - sentiment / ner / zero-shot / translation 등 텍스트 기반 태스크를 처리함
+- 단일 문장 입력은 micro-batching 엔진(batching.py)을 거쳐
+  동시 요청들과 함께 batched forward로 실행됨 (GIMBAB_BATCHING=0 으로 비활성화)
+- backend param: torch-fp32 (기본) / torch-int8-dynamic / onnxruntime (backends.py)
+- 모델 최대 길이를 넘는 문서는 chunk로 나눠 batch 실행 후 병합 (chunking.py, GIMBAB_CHUNKING)
+- 태스크 실행기는 첫 사용 시 dynamic_loader로 import (사용하지 않는 task는 로딩하지 않음)
 """
 
-from .sentiment import run as run_sentiment
-from .ner import run as run_ner
-from .zero_shot import run as run_zero_shot
-from .translation import run as run_translation
+import json
+import os
+
+from utils.dynamic_loader import load_module
+from .batching import batcher
+from .backends import resolve_backend
+from .chunking import CHUNKING_ENABLED, run_chunked
+
+BATCHING_ENABLED = os.getenv("GIMBAB_BATCHING", "1") == "1"
+
+# ✅ task → 실행기 모듈 이름 (models.text.<모듈>)
+TASK_RUNNERS = {
+    "sentiment-analysis": "sentiment",
+    "ner": "ner",
+    "zero-shot-classification": "zero_shot",
+    "translation": "translation",
+    "summarization": "translation",
+    "text2text-generation": "translation",
+}
+
+def _runner(task):
+    # 📌 태스크 실행기 모듈 (첫 호출 시 import, 이후 sys.modules 캐시)
+    if task not in TASK_RUNNERS:
+        raise ValueError(f"❌ Unsupported text task: {task}")
+    return load_module("model", f"text.{TASK_RUNNERS[task]}")
 
 def run(input, task, model_name=None, reload=False, **kwargs):
     # 📌 run(): 태스크명을 기반으로 각 전용 실행기(run_*)로 분기 수행
+    batching = kwargs.pop("batching", BATCHING_ENABLED)
+    backend = resolve_backend(kwargs.pop("backend", None))
+
+    # ✅ 단일 문장 입력 → 같은 (task, model_name, backend, 옵션) 호출과 묶어서 실행
+    if batching and not reload and isinstance(input, dict) and isinstance(input.get("text"), str):
+        key = (task, model_name or "default", backend, json.dumps(kwargs, sort_keys=True, default=str))
+        return batcher.submit(
+            key,
+            input,
+            lambda inputs: run_batch(inputs, task, model_name, False, backend=backend, **kwargs)
+        )
+
+    # ✅ 긴 문서 분할 실행은 batch 경로에서 처리 (입력 1건 batch)
+    if kwargs.get("chunking", CHUNKING_ENABLED) and isinstance(input, dict) and isinstance(input.get("text"), str):
+        return run_batch([input], task, model_name, reload, backend=backend, **kwargs)[0]
 
     # ✅ 감정 분석 태스크
     if task == "sentiment-analysis":
-        return run_sentiment(input, model_name, reload)
+        return _runner(task).run(input, model_name, reload, backend)
 
     # ✅ 개체명 인식(NER) 태스크
     elif task == "ner":
-        return run_ner(input, model_name, reload)
+        return _runner(task).run(input, model_name, reload, backend)
 
     # ✅ 제로샷 분류 태스크 (라벨 후보 필요)
     elif task == "zero-shot-classification":
-        return run_zero_shot(input, model_name, reload, **kwargs)
+        return _runner(task).run(input, model_name, reload, backend, **kwargs)
 
     # ✅ 번역/요약/text2text 생성 등 (같은 실행기 사용)
     elif task in ["translation", "summarization", "text2text-generation"]:
-        return run_translation(input, task, model_name, reload)
+        return _runner(task).run(input, task, model_name, reload, backend)
 
     # ❌ 미지원 태스크 입력 시 예외 처리
     else:
-        raise ValueError(f"❌ Unsupported text task: {task}")
\ No newline at end of file
+        raise ValueError(f"❌ Unsupported text task: {task}")
+
+def task_pipeline(task, model_name=None, reload=False, backend=None):
+    # 📌 태스크 실행기의 캐시된 pipeline (chunk 분할용 tokenizer 조회, comparator 공용)
+    if task in ["translation", "summarization", "text2text-generation"]:
+        return _runner(task)._get_pipeline(task, model_name, reload, backend)
+    return _runner(task)._get_pipeline(model_name, reload, backend)
+
+def run_batch(inputs, task, model_name=None, reload=False, **kwargs):
+    # 📌 run_batch(): 입력 리스트를 태스크별 batch 실행기로 분기 → 입력별 결과 리스트 반환
+    kwargs.pop("batching", None)
+    backend = resolve_backend(kwargs.pop("backend", None))
+    chunking = kwargs.pop("chunking", CHUNKING_ENABLED)
+    chunk_tokens = kwargs.pop("chunk_tokens", None)
+    chunk_overlap = kwargs.pop("chunk_overlap", None)
+
+    # ✅ 긴 문서: chunk로 펼쳐 한 batch로 실행 후 입력별 병합 (reload는 pipeline 조회 시 한 번만)
+    # - zero-shot top_k는 chunk 실행에서 빼고 병합 후 적용 (chunk별 top_k는 라벨 점수 평균을 왜곡)
+    if chunking:
+        tokenizer = getattr(task_pipeline(task, model_name, reload, backend), "tokenizer", None)
+        if tokenizer is not None:
+            chunk_kwargs = {key: value for key, value in kwargs.items() if key != "top_k"}
+            top_k = kwargs.get("top_k") if task == "zero-shot-classification" else None
+            return run_chunked(
+                inputs,
+                task,
+                tokenizer,
+                lambda items: _dispatch_batch(items, task, model_name, False, backend, **chunk_kwargs),
+                chunk_tokens,
+                chunk_overlap,
+                int(top_k) if top_k else None,
+            )
+
+    return _dispatch_batch(inputs, task, model_name, reload, backend, **kwargs)
+
+def _dispatch_batch(inputs, task, model_name, reload, backend, **kwargs):
+    if task == "sentiment-analysis":
+        return _runner(task).run_batch(inputs, model_name, reload, backend)
+
+    elif task == "ner":
+        return _runner(task).run_batch(inputs, model_name, reload, backend)
+
+    elif task == "zero-shot-classification":
+        return _runner(task).run_batch(inputs, model_name, reload, backend, **kwargs)
+
+    elif task in ["translation", "summarization", "text2text-generation"]:
+        return _runner(task).run_batch(inputs, task, model_name, reload, backend)
+
+    else:
+        raise ValueError(f"❌ Unsupported text task: {task}")
@@ -0,0 +1,198 @@
+"""
+📦 Backend 비교 도구
+──────────────────────────────────────────────
+- 같은 task / 모델을 여러 backend로 실행하여 지연 시간과 정확도 차이를 비교
+- 첫 번째 backend를 기준(baseline)으로 나머지 backend의 출력 일치도를 계산
+- 결과는 JSON으로 출력 (CI / 배포 전 점검용)
+
+📌 사용 예시:
+python -m models.text.backend_compare --task sentiment-analysis --inputs corpus.txt \
+    --backends torch-fp32,torch-int8-dynamic,onnxruntime --batch-size 8 --repeat 3
+
+📌 task별 정확도 지표 (baseline 대비):
+- sentiment-analysis: label 일치율, 같은 label일 때 score 평균 절대 차이
+- zero-shot-classification: top label 일치율, top score 평균 절대 차이
+- ner: 엔티티 (word, entity, start, end) 기준 micro F1
+- translation / summarization / text2text-generation: 출력 문장 완전 일치율
+"""
+
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+
+from models.text import run_batch
+from models.text.backends import BACKENDS, resolve_backend
+
+DEFAULT_SAMPLE_TEXTS = [
+    "I absolutely loved this movie, the acting was wonderful.",
+    "The service was slow and the food arrived cold.",
+    "Hugging Face is a company based in New York City.",
+    "Angela Merkel met Emmanuel Macron in Berlin on Tuesday.",
+]
+
+# ------------------------------------------------------
+# 📌 task별 출력 비교
+# ------------------------------------------------------
+def _top(output):
+    # ✅ [ {label, score} ] (sentiment) 또는 {labels, scores} (zero-shot) → (label, score)
+    if isinstance(output, list):
+        output = output[0]
+    if "labels" in output:
+        return output["labels"][0], output["scores"][0]
+    return output["label"], output["score"]
+
+def _compare_classification(baseline: List[Any], candidate: List[Any]) -> Dict[str, float]:
+    agree, score_diffs = 0, []
+    for base, cand in zip(baseline, candidate):
+        base_label, base_score = _top(base)
+        cand_label, cand_score = _top(cand)
+        if base_label == cand_label:
+            agree += 1
+            score_diffs.append(abs(float(base_score) - float(cand_score)))
+    return {
+        "label_agreement": agree / (len(baseline) or 1),
+        "mean_abs_score_diff": statistics.fmean(score_diffs) if score_diffs else None,
+    }
+
+def _compare_ner(baseline: List[Any], candidate: List[Any]) -> Dict[str, float]:
+    def entities(outputs):
+        return {(i, e.get("word"), e.get("entity"), e.get("start"), e.get("end")) for i, ents in enumerate(outputs) for e in ents}
+
+    base, cand = entities(baseline), entities(candidate)
+    matched = len(base & cand)
+    precision = matched / (len(cand) or 1)
+    recall = matched / (len(base) or 1)
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"entity_precision": precision, "entity_recall": recall, "entity_f1": f1}
+
+def _compare_text(baseline: List[Any], candidate: List[Any]) -> Dict[str, float]:
+    def text(output):
+        item = output[0] if isinstance(output, list) else output
+        return next((v for k, v in item.items() if k.endswith("_text")), None)
+
+    same = sum(1 for base, cand in zip(baseline, candidate) if text(base) == text(cand))
+    return {"exact_match": same / (len(baseline) or 1)}
+
+def compare_outputs(task: str, baseline: List[Any], candidate: List[Any]) -> Dict[str, float]:
+    if task in ("sentiment-analysis", "zero-shot-classification"):
+        return _compare_classification(baseline, candidate)
+    if task == "ner":
+        return _compare_ner(baseline, candidate)
+    return _compare_text(baseline, candidate)
+
+# ------------------------------------------------------
+# 📌 backend별 측정
+# ------------------------------------------------------
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+def measure_backend(task: str, texts: List[str], backend: str, model_name: Optional[str] = None,
+                    batch_size: int = 8, repeat: int = 3, **task_kwargs) -> Dict[str, Any]:
+    """
+    ✅ 한 backend의 로딩 시간 + batch 지연 시간(p50 / p95) + 처리량 측정
+    - 첫 호출(로딩 + 1건 실행)은 측정에서 제외하고 load_seconds로 따로 보고
+    """
+    inputs = [{"text": text} for text in texts]
+    batches = [inputs[i:i + batch_size] for i in range(0, len(inputs), batch_size)]
+
+    start = time.perf_counter()
+    run_batch(inputs[:1], task, model_name, backend=backend, **task_kwargs)
+    load_seconds = time.perf_counter() - start
+
+    latencies, outputs = [], []
+    total_start = time.perf_counter()
+    for _ in range(max(1, repeat)):
+        outputs = []
+        for batch in batches:
+            batch_start = time.perf_counter()
+            outputs.extend(run_batch(batch, task, model_name, backend=backend, **task_kwargs))
+            latencies.append(time.perf_counter() - batch_start)
+    total_seconds = time.perf_counter() - total_start
+
+    return {
+        "backend": backend,
+        "load_seconds": round(load_seconds, 4),
+        "batch_latency_p50_ms": round(_percentile(latencies, 0.5) * 1000, 3),
+        "batch_latency_p95_ms": round(_percentile(latencies, 0.95) * 1000, 3),
+        "throughput_per_s": round(len(inputs) * max(1, repeat) / total_seconds, 2),
+        "outputs": outputs,
+    }
+
+def compare_backends(task: str, texts: List[str], backends: List[str], model_name: Optional[str] = None,
+                     batch_size: int = 8, repeat: int = 3, **task_kwargs) -> Dict[str, Any]:
+    """
+    ✅ 여러 backend 측정 후 baseline(첫 backend) 대비 속도 / 정확도 차이 보고
+    - 실패한 backend(의존성 미설치 등)는 error로 기록하고 나머지는 계속 측정
+    """
+    backends = [resolve_backend(backend) for backend in backends]
+    results = []
+    baseline = None
+
+    for backend in backends:
+        try:
+            result = measure_backend(task, texts, backend, model_name, batch_size, repeat, **task_kwargs)
+        except Exception as e:
+            results.append({"backend": backend, "error": str(e)})
+            continue
+
+        outputs = result.pop("outputs")
+        if baseline is None:
+            baseline = {"backend": backend, "outputs": outputs, "throughput": result["throughput_per_s"]}
+        else:
+            result["speedup_vs_baseline"] = round(result["throughput_per_s"] / (baseline["throughput"] or 1), 3)
+            result["accuracy_vs_baseline"] = compare_outputs(task, baseline["outputs"], outputs)
+        results.append(result)
+
+    return {
+        "task": task,
+        "model_name": model_name or "default",
+        "num_inputs": len(texts),
+        "baseline": baseline["backend"] if baseline else None,
+        "results": results,
+    }
+
+# ------------------------------------------------------
+# 📌 CLI
+# ------------------------------------------------------
+def _load_texts(path: Optional[str], limit: Optional[int]) -> List[str]:
+    if not path:
+        texts = list(DEFAULT_SAMPLE_TEXTS)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    return texts[:limit] if limit else texts
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare text inference backends (latency + accuracy delta).")
+    parser.add_argument("--task", required=True)
+    parser.add_argument("--model-name", default=None)
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="comma separated; the first one is the baseline")
+    parser.add_argument("--inputs", default=None, help="text file with one input per line (default: built-in samples)")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--candidate-labels", default=None, help="zero-shot-classification labels, comma separated")
+    args = parser.parse_args(argv)
+
+    task_kwargs = {}
+    if args.candidate_labels:
+        task_kwargs["candidate_labels"] = args.candidate_labels
+
+    report = compare_backends(
+        args.task,
+        _load_texts(args.inputs, args.limit),
+        [b.strip() for b in args.backends.split(",") if b.strip()],
+        model_name=args.model_name,
+        batch_size=args.batch_size,
+        repeat=args.repeat,
+        **task_kwargs
+    )
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+📦 Text Inference Backends
+──────────────────────────────────────────────
+- 텍스트 실행기가 사용할 pipeline을 backend(정밀도 / 런타임)별로 생성
+- torch-fp32: 기본 transformers pipeline (기존 동작)
+- torch-int8-dynamic: nn.Linear 가중치를 int8로 동적 양자화 (CPU 추론 가속)
+- onnxruntime: optimum으로 ONNX export 후 ONNX Runtime으로 실행
+  → export 결과는 GIMBAB_BACKEND_CACHE_DIR에 저장, 다음 로딩부터 재사용
+  → 임시 디렉터리에 저장 후 rename으로 한 번에 공개 (여러 프로세스가 동시에 export해도 반쯤 쓰인 결과를 읽지 않음)
+
+📌 사용 시점:
+- 모델 노드 params: { "task": "ner", "backend": "torch-int8-dynamic" }
+- 기본 backend: GIMBAB_TEXT_BACKEND (기본 torch-fp32)
+- registry key: 기본 backend는 "{task}:{model}", 그 외는 "{task}:{model}@{backend}"
+- transformers / torch는 첫 pipeline 생성 시 import (모듈 import 시점에는 로딩하지 않음)
+"""
+
+import os
+import re
+import shutil
+import tempfile
+
+# ------------------------------------------------------
+# ⚙️ 기본 설정 (환경 변수로 조정 가능)
+# ------------------------------------------------------
+BACKENDS = ("torch-fp32", "torch-int8-dynamic", "onnxruntime")
+DEFAULT_BACKEND = os.getenv("GIMBAB_TEXT_BACKEND", "torch-fp32")
+CACHE_DIR = os.getenv("GIMBAB_BACKEND_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "gimbab", "backends"))
+
+# ✅ task → optimum ORTModel 클래스 이름
+ORT_MODEL_CLASSES = {
+    "sentiment-analysis": "ORTModelForSequenceClassification",
+    "zero-shot-classification": "ORTModelForSequenceClassification",
+    "ner": "ORTModelForTokenClassification",
+    "translation": "ORTModelForSeq2SeqLM",
+    "summarization": "ORTModelForSeq2SeqLM",
+    "text2text-generation": "ORTModelForSeq2SeqLM",
+}
+
+def resolve_backend(backend=None) -> str:
+    # 📌 미지정 시 기본 backend, 알 수 없는 값은 예외
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"❌ Unknown text backend: {backend} (expected one of {BACKENDS})")
+    return backend
+
+def registry_key(task, model_name=None, backend=None) -> str:
+    # 📌 기본 backend는 기존 key 형태 유지 (warm-up manifest / pin 호환)
+    key = f"{task}:{model_name or 'default'}"
+    backend = resolve_backend(backend)
+    return key if backend == "torch-fp32" else f"{key}@{backend}"
+
+# ------------------------------------------------------
+# 📌 backend별 pipeline 생성
+# ------------------------------------------------------
+def build_pipeline(task, model_name=None, backend=None, **pipeline_kwargs):
+    """
+    ✅ backend에 맞는 pipeline 생성 (registry loader에서 호출 → 모델당 한 번)
+    """
+    from transformers import pipeline
+
+    backend = resolve_backend(backend)
+
+    if backend == "torch-fp32":
+        return pipeline(task, model=model_name, **pipeline_kwargs)
+
+    if backend == "torch-int8-dynamic":
+        return _build_int8_dynamic(task, model_name, **pipeline_kwargs)
+
+    return _build_onnxruntime(task, model_name, **pipeline_kwargs)
+
+def _build_int8_dynamic(task, model_name=None, **pipeline_kwargs):
+    # ✅ fp32 pipeline 로딩 후 Linear 계층만 int8 동적 양자화 (활성값은 실행 시 양자화)
+    import torch
+    from transformers import pipeline
+
+    pipe = pipeline(task, model=model_name, device=-1, **pipeline_kwargs)
+    pipe.model = torch.quantization.quantize_dynamic(pipe.model, {torch.nn.Linear}, dtype=torch.qint8)
+    pipe.model.eval()
+    return pipe
+
+def _artifact_dir(task, model_name=None) -> str:
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "--", model_name or "default")
+    return os.path.join(CACHE_DIR, "onnxruntime", task, slug)
+
+def _has_artifact(path) -> bool:
+    return os.path.isdir(path) and any(name.endswith(".onnx") for name in os.listdir(path))
+
+def _publish_artifact(path, save):
+    """
+    ✅ save(임시 디렉터리) 후 path로 rename (같은 파일 시스템 안에서 원자적)
+
+    - 다른 프로세스가 먼저 공개했으면 그 결과를 그대로 두고 임시 디렉터리 삭제
+    - export 결과가 없는 (이전 버전이 중간에 멈춘) path는 지우고 공개
+    """
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f".{os.path.basename(path)}.", dir=parent)
+    try:
+        save(staging)
+        if os.path.isdir(path) and not _has_artifact(path):
+            shutil.rmtree(path, ignore_errors=True)
+        try:
+            os.rename(staging, path)
+        except OSError:
+            if not _has_artifact(path):
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+def _build_onnxruntime(task, model_name=None, **pipeline_kwargs):
+    # ✅ 캐시 디렉터리에 export 결과가 있으면 그대로 로딩, 없으면 export 후 저장
+    try:
+        import optimum.onnxruntime as ort
+    except ImportError as e:
+        raise ImportError("❌ backend 'onnxruntime' requires `pip install optimum[onnxruntime]`.") from e
+
+    from transformers import AutoTokenizer, pipeline
+
+    if task not in ORT_MODEL_CLASSES:
+        raise ValueError(f"❌ backend 'onnxruntime' does not support task: {task}")
+    model_class = getattr(ort, ORT_MODEL_CLASSES[task])
+
+    path = _artifact_dir(task, model_name)
+    if _has_artifact(path):
+        model = model_class.from_pretrained(path)
+        tokenizer = AutoTokenizer.from_pretrained(path)
+    else:
+        # 📌 model_name 미지정 시 transformers의 task 기본 모델로 export
+        source = model_name or pipeline(task).model.config._name_or_path
+        model = model_class.from_pretrained(source, export=True)
+        tokenizer = AutoTokenizer.from_pretrained(source)
+
+        def save(directory):
+            model.save_pretrained(directory)
+            tokenizer.save_pretrained(directory)
+
+        _publish_artifact(path, save)
+
+    return pipeline(task, model=model, tokenizer=tokenizer, **pipeline_kwargs)
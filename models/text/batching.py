@@ -0,0 +1,196 @@
+"""
+📦 Micro-batching 엔진
+──────────────────────────────────────────────
+- 동시에 들어온 같은 (task, model_name, 옵션) 호출을 하나의 batch로 모아 실행
+- batch 크기(max_batch_size)와 최대 대기 시간(max_wait_ms)으로 제한
+- 한 번의 batched pipeline 호출 결과를 각 호출자에게 나누어 반환
+- batch 크기 / 대기 시간 지표를 stats()로 제공
+
+📌 동작 방식 (leader 방식):
+- 대기열이 비어 있을 때 들어온 호출자가 leader가 되어 batch를 모으고 실행
+- 나머지 호출자는 결과가 채워질 때까지 대기 (별도 백그라운드 스레드 없음)
+- batch 실행이 실패하면 입력별로 재실행하여 오류를 해당 호출자에게만 전달
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Hashable, List
+
+# ------------------------------------------------------
+# ⚙️ 기본 설정 (환경 변수로 조정 가능)
+# ------------------------------------------------------
+DEFAULT_MAX_BATCH_SIZE = int(os.getenv("GIMBAB_BATCH_MAX_SIZE", "16"))
+DEFAULT_MAX_WAIT_MS = float(os.getenv("GIMBAB_BATCH_MAX_WAIT_MS", "5"))
+
+# ✅ pipeline 한 번의 forward에 넣을 최대 입력 수 (대량 배치 실행 시 padding / 메모리 제한)
+FORWARD_BATCH_SIZE = int(os.getenv("GIMBAB_FORWARD_BATCH_SIZE", "32"))
+
+# 📊 batch 크기 히스토그램 구간 (상한 기준)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+
+def forward_batch_size(num_inputs: int) -> int:
+    # 📌 입력 수에 맞춘 pipeline batch_size (1 이상, FORWARD_BATCH_SIZE 이하)
+    return max(1, min(num_inputs, FORWARD_BATCH_SIZE))
+
+
+class _PendingCall:
+    __slots__ = ("item", "enqueued_at", "done", "result", "error")
+
+    def __init__(self, item):
+        self.item = item
+        self.enqueued_at = time.monotonic()
+        self.done = False
+        self.result = None
+        self.error = None
+
+
+class _KeyQueue:
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.items = deque()
+        self.leader_active = False
+        self.stats = {
+            "batches": 0,
+            "items": 0,
+            "max_batch_size": 0,
+            "queue_wait_ms_total": 0.0,
+            "queue_wait_ms_max": 0.0,
+            "fallbacks": 0,
+            "batch_size_histogram": {str(b): 0 for b in BATCH_SIZE_BUCKETS + ("inf",)},
+        }
+
+
+# ------------------------------------------------------
+# 📦 MicroBatcher
+# ------------------------------------------------------
+class MicroBatcher:
+    """
+    ✅ key별 대기열에 호출을 모아 batch_fn(items) 한 번으로 실행
+
+    - submit(key, item, batch_fn): 결과가 나올 때까지 블로킹 후 item에 대응하는 결과 반환
+    - batch_fn: 입력 리스트를 받아 같은 길이의 결과 리스트를 반환해야 함
+    """
+
+    def __init__(self, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queues: Dict[Hashable, _KeyQueue] = {}
+        self._lock = threading.Lock()
+
+    def _get_queue(self, key: Hashable) -> _KeyQueue:
+        with self._lock:
+            if key not in self._queues:
+                self._queues[key] = _KeyQueue()
+            return self._queues[key]
+
+    def submit(self, key: Hashable, item: Any, batch_fn: Callable[[List[Any]], List[Any]]) -> Any:
+        queue = self._get_queue(key)
+        call = _PendingCall(item)
+
+        with queue.cond:
+            queue.items.append(call)
+            queue.cond.notify_all()
+
+            # ⏳ 다른 leader가 처리해 주거나, leader 자리가 비면 직접 leader가 됨
+            while not call.done and queue.leader_active:
+                queue.cond.wait()
+
+            if not call.done:
+                queue.leader_active = True
+
+        if not call.done:
+            try:
+                # 🔁 자신의 호출이 처리될 때까지 batch 수집 → 실행 반복
+                while not call.done:
+                    batch = self._collect(queue)
+                    self._execute(queue, batch, batch_fn)
+            finally:
+                with queue.cond:
+                    queue.leader_active = False
+                    queue.cond.notify_all()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def _collect(self, queue: _KeyQueue) -> List[_PendingCall]:
+        # 📥 가장 오래된 호출 기준 max_wait 동안, 또는 batch가 찰 때까지 수집
+        with queue.cond:
+            deadline = queue.items[0].enqueued_at + self.max_wait
+            while len(queue.items) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                queue.cond.wait(remaining)
+
+            size = min(len(queue.items), self.max_batch_size)
+            return [queue.items.popleft() for _ in range(size)]
+
+    def _execute(self, queue: _KeyQueue, batch: List[_PendingCall], batch_fn: Callable):
+        dispatched_at = time.monotonic()
+        waits_ms = [(dispatched_at - call.enqueued_at) * 1000.0 for call in batch]
+
+        try:
+            results = batch_fn([call.item for call in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"❌ batch_fn returned {len(results)} results for {len(batch)} inputs.")
+            for call, result in zip(batch, results):
+                call.result = result
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0].error = e
+            else:
+                # ↩️ batch 실패 시 입력별 재실행 → 오류는 해당 입력에만 전달
+                queue.stats["fallbacks"] += 1
+                for call in batch:
+                    try:
+                        call.result = batch_fn([call.item])[0]
+                    except Exception as item_error:
+                        call.error = item_error
+
+        with queue.cond:
+            self._record(queue, len(batch), waits_ms)
+            for call in batch:
+                call.done = True
+            queue.cond.notify_all()
+
+    def _record(self, queue: _KeyQueue, size: int, waits_ms: List[float]):
+        stats = queue.stats
+        stats["batches"] += 1
+        stats["items"] += size
+        stats["max_batch_size"] = max(stats["max_batch_size"], size)
+        stats["queue_wait_ms_total"] += sum(waits_ms)
+        stats["queue_wait_ms_max"] = max([stats["queue_wait_ms_max"]] + waits_ms)
+
+        bucket = next((str(b) for b in BATCH_SIZE_BUCKETS if size <= b), "inf")
+        stats["batch_size_histogram"][bucket] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        📊 key별 batching 지표 반환
+
+        - batches / items: 실행된 batch 수 / 처리된 입력 수
+        - avg_batch_size, max_batch_size, batch_size_histogram
+        - avg_queue_wait_ms, queue_wait_ms_max: 대기열에서 batch 실행까지 걸린 시간
+        - fallbacks: batch 실패로 입력별 재실행한 횟수
+        """
+        with self._lock:
+            queues = dict(self._queues)
+
+        report = {}
+        for key, queue in queues.items():
+            with queue.cond:
+                stats = dict(queue.stats)
+                stats["batch_size_histogram"] = dict(stats["batch_size_histogram"])
+            items = stats["items"] or 1
+            stats["avg_batch_size"] = stats["items"] / (stats["batches"] or 1)
+            stats["avg_queue_wait_ms"] = stats.pop("queue_wait_ms_total") / items
+            report[":".join(str(part) for part in key)] = stats
+        return report
+
+
+# ✅ 프로세스 공용 batcher 인스턴스
+batcher = MicroBatcher()
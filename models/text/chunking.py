@@ -0,0 +1,205 @@
+"""
+📦 Long-document Chunking
+──────────────────────────────────────────────
+- 모델 최대 길이를 넘는 텍스트를 토큰 기준 sliding window(겹침 포함)로 분할
+- 모든 입력의 chunk를 모아 하나의 batch로 실행한 뒤 task별로 다시 합침
+  - ner: 엔티티 offset을 원문 기준으로 보정 + 겹침 구간 중복 제거 (같은 (start, end)는 label과 무관하게 score 높은 쪽 유지)
+  - sentiment-analysis: chunk 토큰 길이 가중 라벨 점수 합산 → 최고 라벨
+  - zero-shot-classification: chunk 토큰 길이 가중 라벨별 평균 점수 → 재정렬 → top_k 적용
+    (chunk는 모든 후보 라벨 점수로 실행, top_k는 병합 후에만 적용)
+  - translation / summarization / text2text-generation: 겹침 없이 분할 후 출력 이어 붙이기
+- 최대 길이 이내의 입력은 분할하지 않음 (기존과 동일한 결과)
+
+📌 params (모델 노드):
+- chunking: True / False (기본 GIMBAB_CHUNKING=1)
+- chunk_tokens: window 토큰 수 (기본: 모델 최대 길이 - special tokens)
+- chunk_overlap: 겹침 토큰 수 (기본 GIMBAB_CHUNK_OVERLAP=64, 생성 task는 항상 0)
+"""
+
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+CHUNKING_ENABLED = os.getenv("GIMBAB_CHUNKING", "1") == "1"
+DEFAULT_OVERLAP = int(os.getenv("GIMBAB_CHUNK_OVERLAP", "64"))
+
+# ✅ model_max_length가 비정상적으로 큰 tokenizer(1e30 등)의 상한
+FALLBACK_MAX_LENGTH = 512
+
+# ✅ zero-shot은 hypothesis 문장이 같은 sequence에 붙으므로 여유 토큰 확보
+ZERO_SHOT_HYPOTHESIS_RESERVE = 32
+
+GENERATION_TASKS = ("translation", "summarization", "text2text-generation")
+
+# ------------------------------------------------------
+# 📌 window 계산
+# ------------------------------------------------------
+def window_tokens(tokenizer, task: str, chunk_tokens: Optional[int] = None) -> int:
+    # ✅ chunk 하나에 넣을 수 있는 토큰 수 (special tokens 제외)
+    if chunk_tokens:
+        return max(8, int(chunk_tokens))
+
+    max_length = getattr(tokenizer, "model_max_length", FALLBACK_MAX_LENGTH) or FALLBACK_MAX_LENGTH
+    if max_length > 100_000:
+        max_length = FALLBACK_MAX_LENGTH
+
+    room = max_length - tokenizer.num_special_tokens_to_add(pair=task == "zero-shot-classification")
+    if task == "zero-shot-classification":
+        room -= ZERO_SHOT_HYPOTHESIS_RESERVE
+    return max(8, room)
+
+def split_text(tokenizer, text: str, max_tokens: int, overlap: int) -> Optional[List[Tuple[int, int, int, int]]]:
+    """
+    ✅ 텍스트를 토큰 window로 분할 → [(시작 문자, 끝 문자, 시작 토큰 index, 끝 토큰 index)] 또는 None (분할 불필요)
+
+    - UTF-8 byte 수가 max_tokens 이하이면 토큰화 없이 바로 None (토큰 수 ≤ byte 수)
+    - offset mapping을 지원하지 않는 (slow) tokenizer는 분할하지 않음
+    """
+    if len(text.encode("utf-8")) <= max_tokens:
+        return None
+
+    try:
+        offsets = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)["offset_mapping"]
+    except Exception:
+        return None
+
+    if len(offsets) <= max_tokens:
+        return None
+
+    step = max(1, max_tokens - max(0, min(overlap, max_tokens - 1)))
+    windows = []
+    for start in range(0, len(offsets), step):
+        end = min(start + max_tokens, len(offsets))
+        windows.append((offsets[start][0], offsets[end - 1][1], start, end))
+        if end == len(offsets):
+            break
+    return windows
+
+# ------------------------------------------------------
+# 📌 task별 결과 병합
+# ------------------------------------------------------
+def _merge_ner(chunks: List[Tuple[Tuple[int, int, int, int], Any]]) -> List[Dict[str, Any]]:
+    # ✅ 원문 offset으로 보정 후 (start, end) 기준 중복 제거
+    # - 겹침 구간의 같은 span은 chunk마다 label이 달라도 하나만 유지 (score 높은 쪽)
+    merged: Dict[tuple, Dict[str, Any]] = {}
+    for (char_start, _, token_start, _), entities in chunks:
+        for entity in entities:
+            entity = dict(entity)
+            if entity.get("start") is not None:
+                entity["start"] += char_start
+                entity["end"] += char_start
+            if entity.get("index") is not None:
+                entity["index"] += token_start
+
+            key = (entity.get("start"), entity.get("end"))
+            if key == (None, None):
+                # ⚠️ offset이 없는 (slow tokenizer) 결과는 token index + 단어로 구분
+                key = (entity.get("index"), entity.get("word"))
+            current = merged.get(key)
+            if current is None or entity.get("score", 0) > current.get("score", 0):
+                merged[key] = entity
+
+    return sorted(merged.values(), key=lambda e: (e.get("start") or 0, e.get("end") or 0))
+
+def _weights(chunks) -> List[int]:
+    # ✅ chunk 토큰 수 (special tokens 제외)
+    return [max(1, token_end - token_start) for (_, _, token_start, token_end), _ in chunks]
+
+def _merge_sentiment(chunks) -> List[Dict[str, Any]]:
+    # ✅ chunk 토큰 길이 가중 라벨 점수 합 → 최고 라벨, score는 가중 평균
+    totals: Dict[str, float] = {}
+    weights = _weights(chunks)
+    for weight, (_, output) in zip(weights, chunks):
+        item = output[0] if isinstance(output, list) else output
+        totals[item["label"]] = totals.get(item["label"], 0.0) + weight * float(item["score"])
+
+    label = max(totals, key=totals.get)
+    return [{"label": label, "score": totals[label] / sum(weights)}]
+
+def _top_k(output: Dict[str, Any], top_k: Optional[int]) -> Dict[str, Any]:
+    # ✅ zero-shot 결과 상위 top_k 라벨만 유지 (None이면 그대로)
+    if not top_k:
+        return output
+    return {**output, "labels": output["labels"][:top_k], "scores": output["scores"][:top_k]}
+
+def _merge_zero_shot(text: str, chunks, top_k: Optional[int] = None) -> Dict[str, Any]:
+    # ✅ 라벨별 chunk 토큰 길이 가중 평균 점수 → 내림차순 재정렬 → 상위 top_k
+    # - chunk 결과는 모든 후보 라벨을 포함해야 함 (일부만 있으면 빠진 라벨이 0점으로 평균됨)
+    totals: Dict[str, float] = {}
+    weights = _weights(chunks)
+    for weight, (_, output) in zip(weights, chunks):
+        for label, score in zip(output["labels"], output["scores"]):
+            totals[label] = totals.get(label, 0.0) + weight * float(score)
+
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+    return _top_k({
+        "sequence": text,
+        "labels": [label for label, _ in ranked],
+        "scores": [score / sum(weights) for _, score in ranked],
+    }, top_k)
+
+def _merge_generation(chunks) -> List[Dict[str, Any]]:
+    # ✅ chunk 순서대로 생성 결과 이어 붙이기 (출력 key는 translation_text / summary_text 등 그대로)
+    parts, field = [], None
+    for _, output in chunks:
+        item = output[0] if isinstance(output, list) else output
+        field = field or next((k for k in item if k.endswith("_text")), None)
+        parts.append(item.get(field, "") if field else "")
+    return [{field or "generated_text": " ".join(part.strip() for part in parts if part)}]
+
+def merge(task: str, text: str, chunks: List[Tuple[Tuple[int, int, int, int], Any]], top_k: Optional[int] = None) -> Any:
+    if task == "ner":
+        return _merge_ner(chunks)
+    if task == "sentiment-analysis":
+        return _merge_sentiment(chunks)
+    if task == "zero-shot-classification":
+        return _merge_zero_shot(text, chunks, top_k)
+    if task in GENERATION_TASKS:
+        return _merge_generation(chunks)
+    raise ValueError(f"❌ Chunking is not supported for task: {task}")
+
+# ------------------------------------------------------
+# 📦 chunk 단위 batch 실행
+# ------------------------------------------------------
+def run_chunked(
+    inputs: List[Dict[str, Any]],
+    task: str,
+    tokenizer,
+    run_batch: Callable[[List[Dict[str, Any]]], List[Any]],
+    chunk_tokens: Optional[int] = None,
+    chunk_overlap: Optional[int] = None,
+    top_k: Optional[int] = None,
+) -> List[Any]:
+    """
+    ✅ 긴 입력은 chunk로 펼쳐 다른 입력과 함께 run_batch 한 번으로 실행 후 입력별로 병합
+
+    - run_batch(items): 입력 리스트 → 같은 길이의 결과 리스트 (태스크 batch 실행기)
+    - 분할이 필요 없는 입력은 그대로 batch에 포함 (병합 없음)
+    - top_k (zero-shot): run_batch에는 넘기지 않고 병합 후 모든 입력 결과에 적용
+    """
+    max_tokens = window_tokens(tokenizer, task, chunk_tokens)
+    overlap = 0 if task in GENERATION_TASKS else (DEFAULT_OVERLAP if chunk_overlap is None else int(chunk_overlap))
+
+    flat: List[Dict[str, Any]] = []
+    layout: List[Optional[List[Tuple[int, int, int, int]]]] = []
+    for item in inputs:
+        text = item["text"]
+        windows = split_text(tokenizer, text, max_tokens, overlap) if isinstance(text, str) else None
+        layout.append(windows)
+        if windows is None:
+            flat.append(item)
+        else:
+            flat.extend({**item, "text": text[start:end]} for start, end, _, _ in windows)
+
+    outputs = run_batch(flat)
+
+    results, cursor = [], 0
+    for item, windows in zip(inputs, layout):
+        if windows is None:
+            output = outputs[cursor]
+            results.append(_top_k(output, top_k) if task == "zero-shot-classification" else output)
+            cursor += 1
+            continue
+        chunk_outputs = outputs[cursor:cursor + len(windows)]
+        cursor += len(windows)
+        results.append(merge(task, item["text"], list(zip(windows, chunk_outputs)), top_k))
+    return results
@@ -2,22 +2,39 @@
 📦 NER 실행기
 ──────────────────────────────────────────────
 - 개체명 인식(Named Entity Recognition) 태스크 실행
-- model_name 지정 가능, 캐싱 처리 포함
+- model_name 지정 가능, 공용 model_registry 캐시 사용
+- backend: torch-fp32 / torch-int8-dynamic / onnxruntime (backends.py)
+- run_batch(): 여러 입력을 한 번의 batched forward로 처리
+- 토큰화: tokenization.run_pipeline (같은 tokenizer / 텍스트의 encoded 입력 캐시 재사용)
 """
 
-from transformers import pipeline
+from models.registry import model_registry
+from utils.metrics import track_inference
+from .backends import build_pipeline, registry_key, resolve_backend
+from .batching import forward_batch_size
+from .tokenization import run_pipeline
 
-_cached_models = {}
+def _get_pipeline(model_name=None, reload=False, backend=None):
+    # 📌 캐시된 pipeline 반환 (없거나 reload 요청 시 새로 생성)
+    key = registry_key("ner", model_name, backend)
 
-def run(input, model_name=None, reload=False):
+    # ✅ 공용 registry에서 조회 (miss 또는 reload 시 backend별 pipeline 로딩)
+    return model_registry.get(key, lambda: build_pipeline("ner", model_name, backend, grouped_entities=False), reload)
+
+def run(input, model_name=None, reload=False, backend=None):
     # 📌 run(): 개체명 인식 pipeline 실행 (캐시 포함)
-    key = f"ner:{model_name or 'default'}"
+    pipe = _get_pipeline(model_name, reload, backend)
 
-    # ✅ 모델 캐싱 또는 강제 재로딩 처리
-    if reload or key not in _cached_models:
-        _cached_models[key] = pipeline("ner", model=model_name, grouped_entities=False)
+    # 📤 텍스트에 대해 개체명 인식 실행
+    with track_inference(pipe, input["text"], "ner", model_name, resolve_backend(backend)):
+        if isinstance(input["text"], str):
+            return run_pipeline(pipe, [input["text"]], 1)[0]
+        return pipe(input["text"])
 
-    pipe = _cached_models[key]
+def run_batch(inputs, model_name=None, reload=False, backend=None):
+    # 📌 run_batch(): 입력 리스트를 한 번에 실행 → 입력별 엔티티 리스트 반환
+    pipe = _get_pipeline(model_name, reload, backend)
+    texts = [item["text"] for item in inputs]
 
-    # 📤 텍스트에 대해 개체명 인식 실행
-    return pipe(input["text"])
\ No newline at end of file
+    with track_inference(pipe, texts, "ner", model_name, resolve_backend(backend)):
+        return list(run_pipeline(pipe, texts, forward_batch_size(len(texts))))
@@ -0,0 +1,62 @@
+"""
+📦 단계 분리 경로 parity 검사
+──────────────────────────────────────────────
+- tokenization.run_pipeline의 단계 분리 경로(preprocess → pad_collate_fn → forward → postprocess)가
+  기본 pipeline 호출(pipe(texts, batch_size=...))과 같은 결과를 내는지 task별로 비교
+- 단계 분리 경로는 transformers 내부 API를 사용하므로 transformers 버전을 올릴 때 실행 (CI / 배포 전 점검용)
+- 불일치 또는 단계 분리 실패가 있으면 종료 코드 1
+
+📌 사용 예시:
+python -m models.text.staging_parity
+python -m models.text.staging_parity --task ner --inputs corpus.txt --batch-size 4
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional
+
+from .backend_compare import _load_texts
+from .backends import build_pipeline
+from .tokenization import PARITY_TOLERANCE, check_parity
+
+# ✅ run_pipeline을 사용하는 task (zero-shot은 자체 엔진 사용)
+DEFAULT_TASKS = ("sentiment-analysis", "ner", "translation_en_to_de")
+
+def check_task(task: str, texts: List[str], model_name: Optional[str] = None, backend: Optional[str] = None,
+               batch_size: int = 8, tolerance: float = PARITY_TOLERANCE) -> Dict[str, Any]:
+    # ✅ task 1개 검사 (pipeline 로딩 실패는 error로 기록)
+    try:
+        pipe = build_pipeline(task, model_name, backend)
+    except Exception as e:
+        return {"task": task, "supported": False, "match": False, "mismatches": [], "error": f"load failed: {e}"}
+    return {"task": task, **check_parity(pipe, texts, batch_size, tolerance)}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check that staged text inference matches the stock transformers pipeline.")
+    parser.add_argument("--task", action="append", help=f"task to check (repeatable, default: {', '.join(DEFAULT_TASKS)})")
+    parser.add_argument("--model-name", default=None)
+    parser.add_argument("--backend", default=None)
+    parser.add_argument("--inputs", default=None, help="text file with one input per line (default: built-in samples)")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--tolerance", type=float, default=PARITY_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    texts = _load_texts(args.inputs, args.limit)
+    reports = [
+        check_task(task, texts, args.model_name, args.backend, args.batch_size, args.tolerance)
+        for task in args.task or DEFAULT_TASKS
+    ]
+    print(json.dumps(reports, ensure_ascii=False, indent=2, default=str))
+
+    failed = [report["task"] for report in reports if not report["match"]]
+    for task in failed:
+        print(f"❌ {task}: staged output differs from pipe(texts)", file=sys.stderr)
+    if not failed:
+        print("✅ staged outputs match pipe(texts)", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,420 @@
+"""
+📦 Tokenization Cache
+──────────────────────────────────────────────
+- tokenizer registry: tokenizer 객체 → tokenizer id (클래스 + 이름 + vocab 크기)
+  → 모델 / backend가 달라도 같은 tokenizer를 쓰는 pipeline은 같은 id
+- encoded 입력 LRU 캐시: key = (tokenizer id, 텍스트 sha256, preprocess 설정(truncation 등 + pipeline 종류))
+  → 값은 pipeline.preprocess 결과 (ChunkPipeline(ner)은 chunk 리스트)
+- 실행기(sentiment / ner / translation)는 run_pipeline()으로 실행:
+  캐시 hit은 저장된 encoded 입력 사용, miss만 preprocess → batch forward + postprocess
+  (padding / unbatch는 transformers Pipeline의 batch 경로와 동일)
+- zero-shot 엔진의 premise 토큰(encode_ids)도 같은 캐시 사용
+- hit / miss / eviction: metrics(gimbab_token_cache_*) + stats()
+- 입력 토큰 수 지표(gimbab_model_tokens)도 여기서 encoded 입력 길이로 기록 (추가 토큰화 없음)
+- 단계 분리를 지원하지 않는 pipeline / 지원 범위 밖 transformers 버전은 기존 pipe(texts) 호출로 fallback
+  (단계 분리 경로는 transformers 내부 API(_sanitize_parameters, pad_collate_fn)를 사용 → requirements.txt 범위로 고정)
+- 단계 분리 경로에서 예외가 나면 pipe(texts, batch_size=...)로 다시 실행 (gimbab_token_cache_fallbacks_total)
+- check_parity(): 단계 분리 결과 ↔ 기본 pipeline 결과 비교 (python -m models.text.staging_parity)
+
+📌 환경 변수:
+- GIMBAB_TOKEN_CACHE=0 : 비활성화 (pipeline 기본 호출)
+- GIMBAB_TOKEN_CACHE_SIZE : 최대 entry 수 (기본 4096)
+- GIMBAB_TOKEN_CACHE_MAX_BYTES : encoded 입력 메모리 예산 (기본 256MB, 0 = 개수 예산만)
+  → 예산의 1/8을 넘는 긴 입력의 encoded 결과는 저장하지 않음 (한 entry가 캐시를 비우지 않도록)
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from utils.metrics import metrics, record_token_counts
+
+# ------------------------------------------------------
+# ⚙️ 기본 설정 (환경 변수로 조정 가능)
+# ------------------------------------------------------
+TOKEN_CACHE_ENABLED = os.getenv("GIMBAB_TOKEN_CACHE", "1") == "1"
+DEFAULT_MAX_ENTRIES = int(os.getenv("GIMBAB_TOKEN_CACHE_SIZE", "4096"))
+DEFAULT_MAX_BYTES = int(os.getenv("GIMBAB_TOKEN_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# ✅ entry 하나가 차지할 수 있는 예산 비율 (초과 시 저장하지 않음)
+MAX_ENTRY_FRACTION = 8
+
+# ✅ 단계 분리 경로를 검증한 transformers 버전 범위 [이상, 미만) (requirements.txt와 같게 유지)
+STAGING_TRANSFORMERS_RANGE = ((4, 11), (5, 0))
+
+# ✅ check_parity 점수 비교 허용 오차 (padding 길이 차이로 인한 미세한 수치 차이)
+PARITY_TOLERANCE = 1e-4
+
+# ------------------------------------------------------
+# 📦 tokenizer registry
+# ------------------------------------------------------
+class TokenizerRegistry:
+    """
+    ✅ tokenizer 객체별 id 부여 (weak reference, pipeline이 evict되면 함께 정리)
+
+    - identify(tokenizer): 캐시 key에 쓰는 tokenizer id
+    - stats(): 현재 살아있는 tokenizer id 목록
+    """
+
+    def __init__(self):
+        self._ids: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+        self._tokenizers: "weakref.WeakValueDictionary[str, Any]" = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _describe(tokenizer) -> str:
+        name = getattr(tokenizer, "name_or_path", "") or "unnamed"
+        return f"{type(tokenizer).__name__}:{name}:{len(tokenizer)}"
+
+    def identify(self, tokenizer) -> str:
+        with self._lock:
+            try:
+                tokenizer_id = self._ids.get(tokenizer)
+            except TypeError:
+                # ⚠️ weakref 불가 객체는 매번 계산
+                return self._describe(tokenizer)
+
+            if tokenizer_id is None:
+                tokenizer_id = self._describe(tokenizer)
+                self._ids[tokenizer] = tokenizer_id
+                self._tokenizers.setdefault(tokenizer_id, tokenizer)
+            return tokenizer_id
+
+    def get(self, tokenizer_id: str):
+        return self._tokenizers.get(tokenizer_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"tokenizers": sorted(self._tokenizers.keys())}
+
+# ------------------------------------------------------
+# 📌 encoded 입력 메모리 추정
+# - tensor: numel × element_size, numpy: nbytes, 정수 리스트: 원소당 8 byte (근사치)
+# ------------------------------------------------------
+def estimate_encoded_bytes(value: Any) -> int:
+    if hasattr(value, "element_size") and hasattr(value, "numel"):
+        return int(value.numel() * value.element_size())
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if isinstance(value, dict) or hasattr(value, "items"):
+        try:
+            return sum(estimate_encoded_bytes(item) for item in value.values())
+        except Exception:
+            return 0
+    if isinstance(value, (list, tuple)):
+        if value and isinstance(value[0], int):
+            return 8 * len(value)
+        return sum(estimate_encoded_bytes(item) for item in value)
+    return 8 if isinstance(value, (int, float)) else 0
+
+# ------------------------------------------------------
+# 📦 encoded 입력 LRU 캐시
+# ------------------------------------------------------
+class EncodingCache:
+    """
+    ✅ 개수 + 메모리(byte) 예산 기반 LRU (thread-safe)
+
+    - 둘 중 하나라도 넘으면 오래 사용하지 않은 entry부터 제거
+    - max_bytes / MAX_ENTRY_FRACTION을 넘는 entry는 저장하지 않음 (skipped)
+    - 저장된 encoded 입력은 여러 호출이 공유 → 사용하는 쪽에서 수정하지 않음
+    - tokenizer id별 hit / miss 카운터를 metrics에 기록
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "skipped": 0}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any):
+        size = estimate_encoded_bytes(value)
+        with self._lock:
+            if self.max_bytes and size > self.max_bytes // MAX_ENTRY_FRACTION:
+                self._stats["skipped"] += 1
+                metrics.inc("gimbab_token_cache_skipped_total")
+                return
+
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+
+            while len(self._entries) > max(1, self.max_entries) or (self.max_bytes and self._bytes > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._stats["evictions"] += 1
+                metrics.inc("gimbab_token_cache_evictions_total")
+            metrics.set("gimbab_token_cache_bytes", self._bytes)
+
+    def record(self, tokenizer_id: str, hits: int, misses: int):
+        # 📊 hit / miss 집계 + 누적 hit rate gauge
+        with self._lock:
+            self._stats["hits"] += hits
+            self._stats["misses"] += misses
+            total = self._stats["hits"] + self._stats["misses"]
+            hit_rate = self._stats["hits"] / total if total else 0.0
+        if hits:
+            metrics.inc("gimbab_token_cache_hits_total", hits, tokenizer=tokenizer_id)
+        if misses:
+            metrics.inc("gimbab_token_cache_misses_total", misses, tokenizer=tokenizer_id)
+        metrics.set("gimbab_token_cache_hit_rate", hit_rate)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        metrics.set("gimbab_token_cache_bytes", 0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self._stats["hits"] + self._stats["misses"]
+            return {
+                "enabled": TOKEN_CACHE_ENABLED,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / total, 4) if total else 0.0,
+                **tokenizer_registry.stats(),
+            }
+
+
+# ✅ 전역 인스턴스
+tokenizer_registry = TokenizerRegistry()
+encoding_cache = EncodingCache()
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def _cached(tokenizer_id: str, settings: str, texts: List[str], encode_many) -> List[Any]:
+    # ✅ 텍스트별 캐시 조회 → miss 텍스트만 모아 encode_many(texts) 한 번 실행 후 저장 (batch 안 중복은 1회)
+    keys = [(tokenizer_id, _text_hash(text), settings) for text in texts]
+    found = {key: encoding_cache.get(key) for key in set(keys)}
+    missing = [key for key in dict.fromkeys(keys) if found[key] is None]
+
+    if missing:
+        text_of = dict(zip(keys, texts))
+        for key, value in zip(missing, encode_many([text_of[key] for key in missing])):
+            encoding_cache.put(key, value)
+            found[key] = value
+
+    encoding_cache.record(tokenizer_id, len(keys) - len(missing), len(missing))
+    return [found[key] for key in keys]
+
+# ------------------------------------------------------
+# 📌 pipeline 단계 분리 (transformers Pipeline.__call__과 같은 순서)
+# - _sanitize_parameters → preprocess → forward → postprocess
+# ------------------------------------------------------
+@lru_cache(maxsize=1)
+def _transformers_supported() -> bool:
+    # ✅ 설치된 transformers 버전이 STAGING_TRANSFORMERS_RANGE 안인지 (확인 불가 시 False → 기본 pipeline 호출)
+    try:
+        import transformers
+        major, minor = (int(part) for part in transformers.__version__.split(".")[:2])
+    except Exception:
+        return False
+    lower, upper = STAGING_TRANSFORMERS_RANGE
+    return lower <= (major, minor) < upper
+
+def supports_staging(pipe) -> bool:
+    return (
+        _transformers_supported()
+        and getattr(pipe, "tokenizer", None) is not None
+        and callable(getattr(pipe, "_sanitize_parameters", None))
+        and all(callable(getattr(pipe, name, None)) for name in ("preprocess", "forward", "postprocess"))
+    )
+
+def stage_params(pipe) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    # ✅ pipeline 생성 시 지정된 기본 옵션 + 호출 옵션 없음 (실행기들은 pipe(texts)만 호출)
+    preprocess, forward, postprocess = pipe._sanitize_parameters()
+    return (
+        {**getattr(pipe, "_preprocess_params", {}), **preprocess},
+        {**getattr(pipe, "_forward_params", {}), **forward},
+        {**getattr(pipe, "_postprocess_params", {}), **postprocess},
+    )
+
+def cache_scope(pipe, preprocess_params: Dict[str, Any]) -> Tuple[str, str]:
+    # ✅ (tokenizer id, preprocess 설정) → 같은 값이면 encoded 입력 공유 가능
+    settings = f"{type(pipe).__name__}|{json.dumps(preprocess_params, sort_keys=True, default=str)}"
+    return tokenizer_registry.identify(pipe.tokenizer), settings
+
+def encode_batch(pipe, texts: List[str], preprocess_params: Dict[str, Any]) -> List[Any]:
+    # 📌 텍스트별 preprocess 결과 (캐시 우선)
+    def encode(text):
+        encoded = pipe.preprocess(text, **preprocess_params)
+        return list(encoded) if inspect.isgenerator(encoded) else encoded
+
+    tokenizer_id, settings = cache_scope(pipe, preprocess_params)
+    return _cached(tokenizer_id, settings, texts, lambda missing: [encode(text) for text in missing])
+
+def encode_ids(tokenizer, texts: List[str], add_special_tokens: bool = False) -> List[List[int]]:
+    # 📌 tokenizer input_ids만 필요한 경로 (zero-shot premise 등)
+    if not TOKEN_CACHE_ENABLED:
+        ids = tokenizer(list(texts), add_special_tokens=add_special_tokens)["input_ids"]
+    else:
+        def encode_many(missing):
+            return tokenizer(missing, add_special_tokens=add_special_tokens)["input_ids"]
+
+        ids = _cached(tokenizer_registry.identify(tokenizer), f"input_ids|special={add_special_tokens}", texts, encode_many)
+
+    record_token_counts(len(item) for item in ids)
+    return ids
+
+def _token_length(item) -> int:
+    # ✅ preprocess 결과의 토큰 수 (chunk 리스트는 합계, input_ids는 tensor [1, n] 또는 (중첩) 리스트)
+    if isinstance(item, list):
+        return sum(_token_length(chunk) for chunk in item)
+    ids = item.get("input_ids") if hasattr(item, "get") else None
+    if ids is None:
+        return 0
+    shape = getattr(ids, "shape", None)
+    if shape:
+        return int(shape[-1])
+    return len(ids[-1]) if ids and isinstance(ids[-1], (list, tuple)) else len(ids)
+
+def _slice(element, index: int):
+    # ✅ batch 출력 → index번째 항목 (batch 차원 1 유지, transformers PipelineIterator와 동일)
+    if element is None:
+        return None
+    if hasattr(element, "to_tuple"):
+        element = element.to_tuple()
+    if isinstance(element, tuple):
+        return tuple(_slice(item, index) for item in element)
+
+    value = element[index]
+    if hasattr(value, "unsqueeze"):
+        return value.unsqueeze(0)
+    if hasattr(value, "ndim") and hasattr(value, "reshape"):
+        return value[None]
+    return value
+
+def forward_encoded(pipe, encoded: List[Any], forward_params: Dict[str, Any],
+                    postprocess_params: Dict[str, Any], batch_size: int) -> List[Any]:
+    """
+    ✅ encoded 입력 리스트 → batch forward → 입력별 postprocess 결과
+
+    - chunk 리스트(ner)는 모든 입력의 chunk를 펼쳐 batch로 실행 후 입력별로 다시 모아 postprocess
+    - collate는 transformers pad_collate_fn (tokenizer padding 방향 / pad id 사용)
+    """
+    from transformers.pipelines.base import pad_collate_fn
+
+    collate = pad_collate_fn(pipe.tokenizer, getattr(pipe, "feature_extractor", None))
+
+    items, owners = [], []
+    for index, item in enumerate(encoded):
+        chunks = item if isinstance(item, list) else [item]
+        items.extend(chunks)
+        owners.extend([index] * len(chunks))
+
+    outputs = []
+    for start in range(0, len(items), max(1, batch_size)):
+        batch = items[start:start + max(1, batch_size)]
+        model_outputs = pipe.forward(collate(batch), **forward_params)
+        outputs.extend(
+            model_outputs.__class__({key: _slice(value, i) for key, value in model_outputs.items()})
+            for i in range(len(batch))
+        )
+
+    grouped: List[List[Any]] = [[] for _ in encoded]
+    for owner, output in zip(owners, outputs):
+        grouped[owner].append(output)
+
+    return [
+        pipe.postprocess(group if isinstance(item, list) else group[0], **postprocess_params)
+        for item, group in zip(encoded, grouped)
+    ]
+
+# ------------------------------------------------------
+# 📌 실행기 공용 진입점
+# ------------------------------------------------------
+def run_pipeline(pipe, texts: List[str], batch_size: int) -> List[Any]:
+    """
+    ✅ 문자열 리스트 실행 → 입력별 postprocess 결과
+
+    - 캐시 비활성화 / 단계 분리 미지원 pipeline: pipe(texts, batch_size=...) 그대로 반환
+    - 단계 분리 경로의 예외(transformers 내부 API 변경 등): pipe(texts, batch_size=...)로 다시 실행
+    - 결과 형태 차이(단일 dict ↔ 리스트)는 각 실행기의 run_batch()가 기존과 같이 정리
+    """
+    if not (TOKEN_CACHE_ENABLED and texts and supports_staging(pipe)):
+        return pipe(texts, batch_size=batch_size)
+
+    try:
+        outputs, encoded = _run_staged(pipe, texts, batch_size)
+    except Exception:
+        # ↩️ 기본 pipeline 호출로 fallback (입력 자체의 오류라면 여기서 다시 발생)
+        metrics.inc("gimbab_token_cache_fallbacks_total", pipeline=type(pipe).__name__)
+        return pipe(texts, batch_size=batch_size)
+
+    record_token_counts(_token_length(item) for item in encoded)
+    return outputs
+
+def _run_staged(pipe, texts: List[str], batch_size: int) -> Tuple[List[Any], List[Any]]:
+    # ✅ (입력별 postprocess 결과, encoded 입력)
+    preprocess_params, forward_params, postprocess_params = stage_params(pipe)
+    encoded = encode_batch(pipe, texts, preprocess_params)
+    return forward_encoded(pipe, encoded, forward_params, postprocess_params, batch_size), encoded
+
+# ------------------------------------------------------
+# 📌 parity 검사 (단계 분리 경로 ↔ 기본 pipeline)
+# ------------------------------------------------------
+def _same(staged: Any, stock: Any, tolerance: float) -> bool:
+    # ✅ 구조 / 문자열 / label은 완전 일치, 숫자(score 등)는 허용 오차 안
+    if isinstance(staged, dict) and isinstance(stock, dict):
+        return staged.keys() == stock.keys() and all(_same(staged[key], stock[key], tolerance) for key in staged)
+    if isinstance(staged, (list, tuple)) and isinstance(stock, (list, tuple)):
+        return len(staged) == len(stock) and all(_same(a, b, tolerance) for a, b in zip(staged, stock))
+    if isinstance(staged, bool) or isinstance(stock, bool) or isinstance(staged, str) or isinstance(stock, str):
+        return staged == stock
+    try:
+        return abs(float(staged) - float(stock)) <= tolerance
+    except (TypeError, ValueError):
+        return staged == stock
+
+def check_parity(pipe, texts: List[str], batch_size: int = 8, tolerance: float = PARITY_TOLERANCE) -> Dict[str, Any]:
+    """
+    ✅ 같은 입력을 단계 분리 경로와 pipe(texts, batch_size=...)로 각각 실행해 입력별 결과 비교
+
+    - 캐시를 거치지 않음 (항상 preprocess 새로 실행)
+    - 반환: {"supported", "match", "mismatches": [{index, text, staged, stock}], "error"}
+    """
+    stock = pipe(list(texts), batch_size=batch_size)
+    if not supports_staging(pipe):
+        return {"supported": False, "match": True, "mismatches": [], "error": None}
+
+    try:
+        preprocess_params, forward_params, postprocess_params = stage_params(pipe)
+        encoded = []
+        for text in texts:
+            item = pipe.preprocess(text, **preprocess_params)
+            encoded.append(list(item) if inspect.isgenerator(item) else item)
+        staged = forward_encoded(pipe, encoded, forward_params, postprocess_params, batch_size)
+    except Exception as e:
+        return {"supported": True, "match": False, "mismatches": [], "error": f"{type(e).__name__}: {e}"}
+
+    # 📌 pipe(list)의 입력별 결과는 ChunkPipeline(ner)에서도 입력 순서대로 반환
+    mismatches = [
+        {"index": index, "text": text, "staged": a, "stock": b}
+        for index, (text, a, b) in enumerate(zip(texts, staged, stock))
+        if not _same(a, b, tolerance)
+    ]
+    if len(staged) != len(stock):
+        mismatches.append({"index": None, "text": None, "staged": len(staged), "stock": len(stock)})
+    return {"supported": True, "match": not mismatches, "mismatches": mismatches, "error": None}
@@ -3,17 +3,32 @@
 ──────────────────────────────────────────────
 - zero-shot-classification 태스크 실행
 - candidate_labels 필수, 문자열 또는 리스트 형태 모두 지원
+- 공용 model_registry 캐시 사용 (매 호출마다 pipeline을 새로 만들지 않음)
+- backend: torch-fp32 / torch-int8-dynamic / onnxruntime (backends.py)
+- run_batch(): 같은 라벨 후보를 쓰는 여러 입력을 한 번에 처리
+- 전용 엔진(zero_shot_engine.py): 라벨 hypothesis 토큰 캐시 + (텍스트, 라벨) 쌍 batch forward
+- params: candidate_labels, hypothesis_template, multi_label, top_k, engine
 """
 
-from transformers import pipeline
+import os
 
-def run(input, model_name=None, reload=False, **kwargs):
-    # 📌 run(): 주어진 후보 라벨(candidate_labels) 기반 제로샷 분류 수행
-    pipe = pipeline("zero-shot-classification", model=model_name)
+from models.registry import model_registry
+from utils.metrics import track_inference
+from .backends import build_pipeline, registry_key, resolve_backend
+from .batching import forward_batch_size
+from .zero_shot_engine import DEFAULT_HYPOTHESIS_TEMPLATE, classify
 
-    text = input["text"]
-    candidate_labels = kwargs.get("candidate_labels", [])
+# ✅ 전용 zero-shot 엔진 사용 여부 (노드 params의 engine으로 개별 지정 가능)
+ENGINE_ENABLED = os.getenv("GIMBAB_ZS_ENGINE", "1") == "1"
+
+def _get_pipeline(model_name=None, reload=False, backend=None):
+    # 📌 캐시된 pipeline 반환 (없거나 reload 요청 시 새로 생성)
+    key = registry_key("zero-shot-classification", model_name, backend)
+
+    # ✅ 공용 registry에서 조회 (miss 또는 reload 시 backend별 pipeline 로딩)
+    return model_registry.get(key, lambda: build_pipeline("zero-shot-classification", model_name, backend), reload)
 
+def _parse_labels(candidate_labels):
     # ✅ 문자열 하나로 전달된 경우 쉼표 분리 처리
     if isinstance(candidate_labels, str):
         candidate_labels = [x.strip() for x in candidate_labels.split(",")]
@@ -22,5 +37,47 @@ def run(input, model_name=None, reload=False, **kwargs):
     if not candidate_labels:
         raise ValueError("❌ candidate_labels required for zero-shot-classification.")
 
+    return candidate_labels
+
+def _options(kwargs):
+    # ✅ 분류 옵션 정리 (hypothesis_template / multi_label / top_k)
+    top_k = kwargs.get("top_k")
+    return {
+        "hypothesis_template": kwargs.get("hypothesis_template") or DEFAULT_HYPOTHESIS_TEMPLATE,
+        "multi_label": bool(kwargs.get("multi_label", False)),
+        "top_k": int(top_k) if top_k else None,
+    }
+
+def _classify(pipe, texts, candidate_labels, engine=None, **options):
+    # ✅ 전용 엔진 사용 가능 시 엔진으로, 아니면 기본 pipeline 호출 후 top_k 적용
+    use_engine = ENGINE_ENABLED if engine is None else bool(engine)
+    if use_engine and getattr(pipe, "tokenizer", None) is not None and hasattr(pipe, "entailment_id"):
+        return classify(pipe, texts, candidate_labels, **options)
+
+    top_k = options.pop("top_k")
+    outputs = pipe(texts, candidate_labels=candidate_labels, batch_size=forward_batch_size(len(texts)), **options)
+    outputs = outputs if isinstance(outputs, list) else [outputs]
+    if top_k:
+        outputs = [{**output, "labels": output["labels"][:top_k], "scores": output["scores"][:top_k]} for output in outputs]
+    return outputs
+
+def run(input, model_name=None, reload=False, backend=None, **kwargs):
+    # 📌 run(): 주어진 후보 라벨(candidate_labels) 기반 제로샷 분류 수행
+    pipe = _get_pipeline(model_name, reload, backend)
+
+    text = input["text"]
+    candidate_labels = _parse_labels(kwargs.get("candidate_labels", []))
+
     # 📤 분류 실행 결과 반환
-    return pipe(text, candidate_labels=candidate_labels)
\ No newline at end of file
+    with track_inference(pipe, text, "zero-shot-classification", model_name, resolve_backend(backend)):
+        return _classify(pipe, [text], candidate_labels, kwargs.get("engine"), **_options(kwargs))[0]
+
+def run_batch(inputs, model_name=None, reload=False, backend=None, **kwargs):
+    # 📌 run_batch(): 입력 리스트를 한 번에 분류 → 입력별 결과 dict 리스트 반환
+    pipe = _get_pipeline(model_name, reload, backend)
+
+    texts = [item["text"] for item in inputs]
+    candidate_labels = _parse_labels(kwargs.get("candidate_labels", []))
+
+    with track_inference(pipe, texts, "zero-shot-classification", model_name, resolve_backend(backend)):
+        return _classify(pipe, texts, candidate_labels, kwargs.get("engine"), **_options(kwargs))
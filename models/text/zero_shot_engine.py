@@ -0,0 +1,155 @@
+"""
+📦 Zero-shot 분류 엔진
+──────────────────────────────────────────────
+- ZeroShotClassificationPipeline의 모델 / tokenizer를 직접 사용하는 NLI 기반 분류기
+- 라벨 집합별 hypothesis 토큰화 결과를 LRU 캐시 (같은 taxonomy는 한 번만 토큰화)
+- premise 토큰은 공용 encoded 입력 캐시(tokenization.encode_ids) 사용
+- 여러 텍스트 × 모든 라벨 (premise, hypothesis) 쌍을 pair batch 단위로 한 번에 forward
+- 결과 형태는 pipeline과 동일: {"sequence", "labels", "scores"} (점수 내림차순)
+- top_k: 상위 k개 라벨만 반환 (정렬 / 직렬화 비용도 k개로 제한)
+
+📌 설정 (환경 변수):
+- GIMBAB_ZS_LABEL_CACHE: 캐시할 라벨 집합 수 (기본 64)
+- GIMBAB_ZS_PAIR_BATCH: forward 한 번에 넣을 (텍스트, 라벨) 쌍 수 (기본 64)
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+from .tokenization import encode_ids
+
+DEFAULT_HYPOTHESIS_TEMPLATE = "This example is {}."
+LABEL_CACHE_SIZE = int(os.getenv("GIMBAB_ZS_LABEL_CACHE", "64"))
+PAIR_BATCH_SIZE = int(os.getenv("GIMBAB_ZS_PAIR_BATCH", "64"))
+
+# ✅ model_max_length가 비정상적으로 큰 tokenizer(1e30 등)의 상한
+FALLBACK_MAX_LENGTH = 512
+
+# ------------------------------------------------------
+# 📦 hypothesis 토큰 캐시
+# - key: (tokenizer 이름, vocab 크기, template, labels)
+# ------------------------------------------------------
+_hypothesis_cache: "OrderedDict[tuple, List[List[int]]]" = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0}
+
+def _hypothesis_ids(tokenizer, template: str, labels: Sequence[str]) -> List[List[int]]:
+    key = (getattr(tokenizer, "name_or_path", ""), len(tokenizer), template, tuple(labels))
+
+    with _cache_lock:
+        cached = _hypothesis_cache.get(key)
+        if cached is not None:
+            _hypothesis_cache.move_to_end(key)
+            _cache_stats["hits"] += 1
+            return cached
+        _cache_stats["misses"] += 1
+
+    hypotheses = [template.format(label) for label in labels]
+    encoded = tokenizer(hypotheses, add_special_tokens=False)["input_ids"]
+
+    with _cache_lock:
+        _hypothesis_cache[key] = encoded
+        while len(_hypothesis_cache) > max(1, LABEL_CACHE_SIZE):
+            _hypothesis_cache.popitem(last=False)
+    return encoded
+
+def cache_stats() -> Dict[str, int]:
+    with _cache_lock:
+        return {**_cache_stats, "size": len(_hypothesis_cache)}
+
+# ------------------------------------------------------
+# 📌 (premise, hypothesis) 쌍 구성
+# ------------------------------------------------------
+def _max_length(tokenizer) -> int:
+    length = getattr(tokenizer, "model_max_length", FALLBACK_MAX_LENGTH) or FALLBACK_MAX_LENGTH
+    return length if length <= 100_000 else FALLBACK_MAX_LENGTH
+
+def _build_pairs(tokenizer, premises: List[List[int]], hypotheses: List[List[int]]) -> Dict[str, List[List[int]]]:
+    # ✅ premise를 잘라 (premise + hypothesis + special tokens) 가 max_length 이내가 되도록 구성
+    max_length = _max_length(tokenizer)
+    num_special = tokenizer.num_special_tokens_to_add(pair=True)
+    with_token_types = "token_type_ids" in getattr(tokenizer, "model_input_names", [])
+
+    pairs = {"input_ids": []}
+    if with_token_types:
+        pairs["token_type_ids"] = []
+
+    for premise in premises:
+        for hypothesis in hypotheses:
+            room = max(1, max_length - num_special - len(hypothesis))
+            truncated = premise[:room]
+            pairs["input_ids"].append(tokenizer.build_inputs_with_special_tokens(truncated, hypothesis))
+            if with_token_types:
+                pairs["token_type_ids"].append(tokenizer.create_token_type_ids_from_sequences(truncated, hypothesis))
+    return pairs
+
+def _forward(pipe, pairs: Dict[str, List[List[int]]], batch_size: int):
+    # ✅ pair batch 단위 forward → 모든 쌍의 logits (num_pairs, num_classes)
+    import torch
+
+    tokenizer, model = pipe.tokenizer, pipe.model
+    device = getattr(pipe, "device", None)
+    total = len(pairs["input_ids"])
+    chunks = []
+
+    with torch.inference_mode():
+        for start in range(0, total, batch_size):
+            batch = {name: values[start:start + batch_size] for name, values in pairs.items()}
+            encoded = tokenizer.pad(batch, return_tensors="pt")
+            if device is not None:
+                encoded = {name: tensor.to(device) for name, tensor in encoded.items()}
+            chunks.append(model(**encoded).logits.float().cpu())
+
+    return torch.cat(chunks, dim=0)
+
+# ------------------------------------------------------
+# 📦 분류
+# ------------------------------------------------------
+def classify(
+    pipe,
+    texts: List[str],
+    candidate_labels: List[str],
+    hypothesis_template: str = DEFAULT_HYPOTHESIS_TEMPLATE,
+    multi_label: bool = False,
+    top_k: Optional[int] = None,
+    pair_batch_size: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    ✅ 여러 텍스트를 모든 후보 라벨에 대해 한 번에 분류
+
+    - 점수 계산은 transformers ZeroShotClassificationPipeline과 동일
+      - multi_label=False: 라벨 간 entailment logit softmax
+      - multi_label=True (또는 라벨 1개): 쌍마다 [contradiction, entailment] softmax
+    """
+    if not texts:
+        return []
+
+    tokenizer = pipe.tokenizer
+    hypotheses = _hypothesis_ids(tokenizer, hypothesis_template, candidate_labels)
+    premises = encode_ids(tokenizer, list(texts))
+
+    pairs = _build_pairs(tokenizer, premises, hypotheses)
+    logits = _forward(pipe, pairs, max(1, pair_batch_size or PAIR_BATCH_SIZE))
+    logits = logits.view(len(texts), len(candidate_labels), -1)
+
+    entailment_id = pipe.entailment_id
+    if multi_label or len(candidate_labels) == 1:
+        contradiction_id = -1 if entailment_id == 0 else 0
+        pair_logits = logits[..., [contradiction_id, entailment_id]]
+        scores = pair_logits.softmax(dim=-1)[..., 1]
+    else:
+        scores = logits[..., entailment_id].softmax(dim=-1)
+
+    k = len(candidate_labels) if not top_k else min(int(top_k), len(candidate_labels))
+    top_scores, top_index = scores.topk(k, dim=-1)
+
+    return [
+        {
+            "sequence": text,
+            "labels": [candidate_labels[i] for i in top_index[row].tolist()],
+            "scores": top_scores[row].tolist(),
+        }
+        for row, text in enumerate(texts)
+    ]
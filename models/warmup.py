@@ -0,0 +1,141 @@
+"""
+📦 Model Warm-up
+──────────────────────────────────────────────
+- 서버 시작 시 warm-up manifest에 정의된 모델을 미리 로딩하고 더미 입력으로 실행
+- 첫 요청이 pipeline 생성 비용을 떠안지 않도록 함
+- warm-up 대상 모델은 기본적으로 registry에 pin → eviction 되지 않음
+- readiness 상태(warmup_state)를 제공하여 /health/ready 응답에 사용
+- 모델 워커 풀 사용 시 모든 워커에서 pin + warm-up 실행
+
+📌 manifest 예시 (JSON, 경로는 GIMBAB_WARMUP_MANIFEST):
+{
+  "models": [
+    { "task": "sentiment-analysis" },
+    { "task": "ner", "model_name": "dslim/bert-base-NER", "inputs": ["Hugging Face is in Paris."] },
+    { "task": "zero-shot-classification", "params": { "candidate_labels": "sports, politics" }, "pin": false },
+    { "task": "sentiment-analysis", "params": { "backend": "torch-int8-dynamic" } }
+  ]
+}
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from models.registry import model_registry
+
+DEFAULT_MANIFEST_PATH = os.getenv("GIMBAB_WARMUP_MANIFEST", "")
+DEFAULT_WARMUP_INPUT = "Warm-up sentence for the inference pipeline."
+
+# ✅ readiness 상태 (warm-up 완료 전까지 ready=False)
+warmup_state: Dict[str, Any] = {
+    "ready": False,
+    "started_at": None,
+    "finished_at": None,
+    "loaded": [],
+    "errors": [],
+}
+_state_lock = threading.Lock()
+
+# ------------------------------------------------------
+# 📌 manifest 로딩
+# ------------------------------------------------------
+def load_manifest(path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    ✅ warm-up manifest(JSON) 파일을 읽어 반환
+    - 경로 미지정 / 빈 문자열 → 빈 manifest ({"models": []})
+    """
+    path = path if path is not None else DEFAULT_MANIFEST_PATH
+    if not path:
+        return {"models": []}
+
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if not isinstance(manifest.get("models"), list):
+        raise ValueError("❌ Warm-up manifest requires a 'models' list.")
+
+    return manifest
+
+# ------------------------------------------------------
+# 📌 warm-up 실행
+# ------------------------------------------------------
+def warm_up(manifest: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    ✅ manifest의 각 모델을 로딩 + 더미 입력으로 실행
+
+    - 항목별 필드: task (필수), domain, model_name, inputs, params, pin (기본 True)
+    - 한 모델의 실패가 나머지 warm-up을 막지 않음 (errors에 기록)
+    - 완료 후 warmup_state["ready"] = True
+    """
+    from models import run as run_model
+    from models.text.backends import registry_key
+    from models.worker_pool import worker_pool
+
+    # ✅ 워커 풀 모드: 요청이 어느 워커로 가도 warm 상태가 되도록 모든 워커에서 실행
+    def broadcast_run(*args, **kwargs):
+        return worker_pool.broadcast("run", *args, **kwargs)
+
+    runner = broadcast_run if worker_pool.enabled else run_model
+
+    with _state_lock:
+        warmup_state.update(ready=False, started_at=time.time(), finished_at=None, loaded=[], errors=[])
+
+    for spec in manifest.get("models", []):
+        task = spec.get("task")
+        model_name = spec.get("model_name")
+        key = f"{task}:{model_name or 'default'}"
+
+        try:
+            if not task:
+                raise ValueError("❌ Warm-up entry requires 'task'.")
+
+            # ✅ backend 지정 시 registry key에 backend 포함 (예: "ner:default@onnxruntime")
+            key = registry_key(task, model_name, spec.get("params", {}).get("backend"))
+
+            # 📌 로딩 전에 pin → 로딩 직후부터 eviction 대상에서 제외
+            if spec.get("pin", True):
+                model_registry.pin(key)
+                if worker_pool.enabled:
+                    worker_pool.broadcast("pin", key)
+
+            start = time.perf_counter()
+            for text in _warmup_inputs(spec):
+                runner(
+                    {"text": text},
+                    task,
+                    domain=spec.get("domain", "text"),
+                    model_name=model_name,
+                    batching=False,
+                    **spec.get("params", {})
+                )
+            elapsed = time.perf_counter() - start
+
+            with _state_lock:
+                warmup_state["loaded"].append({"key": key, "seconds": round(elapsed, 4)})
+            print(f"🔥 warm-up: {key} ready in {elapsed:.2f}s")
+
+        except Exception as e:
+            with _state_lock:
+                warmup_state["errors"].append({"key": key, "error": str(e)})
+            print(f"❌ warm-up failed: {key} → {e}")
+
+    with _state_lock:
+        warmup_state.update(ready=True, finished_at=time.time())
+
+    return get_warmup_state()
+
+def _warmup_inputs(spec: Dict[str, Any]) -> List[str]:
+    # ✅ inputs 미지정 시 기본 더미 문장 1개 사용
+    inputs = spec.get("inputs") or [DEFAULT_WARMUP_INPUT]
+    return [inputs] if isinstance(inputs, str) else list(inputs)
+
+def get_warmup_state() -> Dict[str, Any]:
+    with _state_lock:
+        return {
+            **warmup_state,
+            "loaded": list(warmup_state["loaded"]),
+            "errors": list(warmup_state["errors"]),
+        }
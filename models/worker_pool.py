@@ -0,0 +1,346 @@
+"""
+📦 Model Worker Pool
+──────────────────────────────────────────────
+- models.run / models.run_batch 호출을 N개의 모델 워커 프로세스로 위임 (GIL 분리)
+- 워커마다 torch intra-op 스레드 수를 고정 (코어 / 워커 수) → 프로세스 간 스레드 경합 방지
+- 워커는 각자 model_registry / micro-batcher를 가짐 (워커 안에서 동시 요청끼리 batching)
+- API 프로세스 ↔ 워커: 워커별 요청 / 응답 multiprocessing Queue (로컬 IPC), 결과는 요청 id로 매칭
+  (응답 Queue를 워커끼리 공유하지 않음 → 강제 종료된 워커가 Queue lock을 잡은 채 죽어도 다른 워커에 영향 없음)
+
+📌 메모리:
+- 가중치는 공유하지 않음: 워커마다 from_pretrained로 모델을 따로 올림 (파라미터는 프로세스별 텐서로 복사)
+  → 상주 메모리 ≈ 모델 크기 × 워커 수 (체크포인트 파일 읽기만 OS 페이지 캐시로 공유)
+- 큰 모델은 워커 수를 메모리 예산에 맞춰 정하거나 affinity 라우팅으로 모델별 워커를 고정
+
+📌 설정 (환경 변수):
+- GIMBAB_MODEL_WORKERS: 워커 프로세스 수 (0 = 비활성, 기본값 → 프로세스 내 실행)
+- GIMBAB_MODEL_WORKER_THREADS: 워커당 torch 스레드 수 (0 = CPU 코어 수 / 워커 수)
+- GIMBAB_MODEL_WORKER_CONCURRENCY: 워커당 동시 처리 요청 수 (micro-batching 대상)
+- GIMBAB_MODEL_WORKER_ROUTING: least-loaded (기본) | affinity (모델 key 해시로 고정 배치)
+- GIMBAB_MODEL_WORKER_TIMEOUT: call / broadcast 응답 대기 상한 (초, 0 = 무제한, 기본 300)
+
+📌 장애 처리:
+- 결과 수집 스레드의 매 반복 + submit 시 워커 생존 확인
+- 죽은 워커의 처리 중 요청은 WorkerCrashed로 실패, 워커는 같은 index로 다시 시작 (affinity 배치 유지)
+"""
+
+import itertools
+import multiprocessing
+import os
+import pickle
+import queue
+import threading
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Dict, List
+
+# ------------------------------------------------------
+# ⚙️ 기본 설정
+# ------------------------------------------------------
+WORKER_COUNT = int(os.getenv("GIMBAB_MODEL_WORKERS", "0"))
+WORKER_THREADS = int(os.getenv("GIMBAB_MODEL_WORKER_THREADS", "0"))
+WORKER_CONCURRENCY = int(os.getenv("GIMBAB_MODEL_WORKER_CONCURRENCY", "8"))
+WORKER_ROUTING = os.getenv("GIMBAB_MODEL_WORKER_ROUTING", "least-loaded")
+ROUTING_POLICIES = ("least-loaded", "affinity")
+WORKER_TIMEOUT = float(os.getenv("GIMBAB_MODEL_WORKER_TIMEOUT", "300"))
+
+# ✅ 결과 대기 중 생존 확인 주기 (초)
+LIVENESS_INTERVAL = 0.5
+
+# ✅ 워커 프로세스 안에서는 True → models.run이 다시 위임하지 않고 직접 실행
+IN_WORKER = False
+
+
+class WorkerCrashed(RuntimeError):
+    """요청을 처리하던 모델 워커 프로세스가 종료됨"""
+
+
+class WorkerTimeout(TimeoutError):
+    """모델 워커 응답이 GIMBAB_MODEL_WORKER_TIMEOUT 안에 오지 않음"""
+
+# ------------------------------------------------------
+# 📌 워커 프로세스 (spawn으로 시작)
+# ------------------------------------------------------
+def _dump_error(error: BaseException) -> bytes:
+    # ✅ pickle 불가능한 예외는 타입명 + 메시지만 담은 RuntimeError로 대체
+    try:
+        return pickle.dumps(error)
+    except Exception:
+        return pickle.dumps(RuntimeError(f"{type(error).__name__}: {error}"))
+
+def _worker_main(index: int, requests, responses, num_threads: int, concurrency: int):
+    global IN_WORKER
+    IN_WORKER = True
+
+    # ✅ intra-op 스레드 고정 (워커 수 × 스레드 수 ≈ 코어 수)
+    try:
+        import torch
+        torch.set_num_threads(num_threads)
+        torch.set_num_interop_threads(1)
+    except Exception:
+        pass
+
+    import models
+    from models.registry import model_registry
+
+    def handle(request_id, op, args, kwargs):
+        try:
+            if op == "run":
+                result = models.run(*args, **kwargs)
+            elif op == "run_batch":
+                result = models.run_batch(*args, **kwargs)
+            elif op == "pin":
+                result = model_registry.pin(*args)
+            elif op == "unpin":
+                result = model_registry.unpin(*args)
+            elif op == "stats":
+                result = {"pid": os.getpid(), "registry": model_registry.stats()}
+            else:
+                raise ValueError(f"❌ Unknown worker op: {op}")
+            # ⚠️ 결과는 여기서 pickle → 실패 시 호출자에게 오류로 전달 (Queue feeder 스레드에서 유실 방지)
+            payload = (request_id, True, pickle.dumps(result))
+        except BaseException as e:
+            payload = (request_id, False, _dump_error(e))
+        responses.put(payload)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix=f"gimbab-model-worker-{index}") as executor:
+        while True:
+            message = requests.get()
+            if message is None:
+                break
+            executor.submit(handle, *message)
+
+# ------------------------------------------------------
+# 📦 ModelWorkerPool (API 프로세스 측)
+# ------------------------------------------------------
+class _Worker:
+    __slots__ = ("index", "process", "requests", "responses", "outstanding", "routed", "restarts", "retired")
+
+    def __init__(self, index, process, requests, responses, restarts: int = 0):
+        self.index = index
+        self.process = process
+        self.requests = requests
+        self.responses = responses
+        self.retired = False
+        self.outstanding = 0
+        self.routed = 0
+        self.restarts = restarts
+
+
+class ModelWorkerPool:
+    """
+    ✅ 모델 워커 프로세스 풀
+
+    - call(op, key, *args, **kwargs): 워커 하나로 라우팅 후 결과 반환 (블로킹)
+    - broadcast(op, *args, **kwargs): 모든 워커에서 실행 (warm-up / pin / unpin)
+    - 응답 대기는 timeout 초까지 (초과 시 WorkerTimeout, 요청은 pending에서 제거)
+    - 첫 호출 시 워커 시작 (lazy), shutdown()으로 종료
+    """
+
+    def __init__(
+        self,
+        num_workers: int = WORKER_COUNT,
+        threads_per_worker: int = WORKER_THREADS,
+        concurrency: int = WORKER_CONCURRENCY,
+        routing: str = WORKER_ROUTING,
+        timeout: float = WORKER_TIMEOUT,
+    ):
+        if routing not in ROUTING_POLICIES:
+            raise ValueError(f"❌ Unknown worker routing policy: {routing}")
+
+        self.num_workers = max(0, num_workers)
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // max(1, self.num_workers))
+        self.concurrency = concurrency
+        self.routing = routing
+        self.timeout = timeout or None
+        self._ctx = None
+        self._workers: List[_Worker] = []
+        self._pending: Dict[int, tuple] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.num_workers > 0 and not IN_WORKER
+
+    def start(self):
+        with self._lock:
+            if self._workers or self._closed:
+                return
+
+            self._ctx = multiprocessing.get_context("spawn")
+            for index in range(self.num_workers):
+                self._workers.append(self._spawn(index))
+
+    def _spawn(self, index: int, restarts: int = 0) -> _Worker:
+        # ✅ 워커 프로세스 + 전용 요청 / 응답 Queue + 결과 수집 스레드
+        requests, responses = self._ctx.Queue(), self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(index, requests, responses, self.threads_per_worker, self.concurrency),
+            name=f"gimbab-model-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        worker = _Worker(index, process, requests, responses, restarts)
+        threading.Thread(target=self._collect, args=(worker,), name=f"gimbab-model-worker-results-{index}", daemon=True).start()
+        return worker
+
+    def _reap_locked(self) -> List[tuple]:
+        """
+        ✅ 죽은 워커 정리 (self._lock 보유 상태에서 호출) → 실패 처리할 (Future, 오류) 목록
+
+        - 해당 워커로 보낸 처리 중 요청은 pending에서 제거
+        - 종료 중이 아니면 같은 index로 새 워커 시작 (affinity 해시가 계속 같은 자리로 라우팅)
+        """
+        failed = []
+        for position, worker in enumerate(self._workers):
+            if worker.process.is_alive():
+                continue
+
+            error = WorkerCrashed(f"❌ Model worker {worker.index} exited (code {worker.process.exitcode}).")
+            for request_id in [rid for rid, (_, owner) in self._pending.items() if owner is worker]:
+                failed.append((self._pending.pop(request_id)[0], error))
+
+            worker.retired = True
+            worker.requests.cancel_join_thread()
+            worker.requests.close()
+            if not self._closed:
+                self._workers[position] = self._spawn(worker.index, worker.restarts + 1)
+        return failed
+
+    def _reap(self):
+        with self._lock:
+            failed = self._reap_locked()
+        for future, error in failed:
+            future.set_exception(error)
+
+    def _route(self, key: str) -> _Worker:
+        # 📌 affinity: 같은 모델은 항상 같은 워커 / least-loaded: 처리 중 요청이 가장 적은 워커
+        if self.routing == "affinity":
+            return self._workers[zlib.crc32(key.encode("utf-8")) % len(self._workers)]
+        return min(self._workers, key=lambda w: (w.outstanding, w.routed))
+
+    def _send(self, worker: _Worker, op: str, args: tuple, kwargs: dict) -> Future:
+        future: Future = Future()
+        request_id = next(self._ids)
+        future.request_id = request_id
+        self._pending[request_id] = (future, worker)
+        worker.outstanding += 1
+        worker.routed += 1
+        worker.requests.put((request_id, op, args, kwargs))
+        return future
+
+    def submit(self, op: str, key: str, *args, **kwargs) -> Future:
+        self.start()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("❌ Model worker pool is shut down.")
+            # ✅ 죽은 워커로 라우팅하지 않도록 먼저 정리 / 재시작
+            failed = self._reap_locked()
+            future = self._send(self._route(key), op, args, kwargs)
+        for pending, error in failed:
+            pending.set_exception(error)
+        return future
+
+    def _result(self, future: Future) -> Any:
+        # ✅ timeout 초과 시 pending에서 제거 (늦게 온 응답은 수집 스레드에서 무시)
+        try:
+            return future.result(self.timeout)
+        except FutureTimeout:
+            with self._lock:
+                entry = self._pending.pop(future.request_id, None)
+                if entry is not None:
+                    entry[1].outstanding -= 1
+            raise WorkerTimeout(f"❌ Model worker did not respond within {self.timeout}s.")
+
+    def call(self, op: str, key: str, *args, **kwargs) -> Any:
+        return self._result(self.submit(op, key, *args, **kwargs))
+
+    def broadcast(self, op: str, *args, **kwargs) -> List[Any]:
+        self.start()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("❌ Model worker pool is shut down.")
+            failed = self._reap_locked()
+            futures = [self._send(worker, op, args, kwargs) for worker in self._workers]
+        for pending, error in failed:
+            pending.set_exception(error)
+        return [self._result(future) for future in futures]
+
+    def _collect(self, worker: _Worker):
+        # 🔁 워커별 결과 수집 스레드: 요청 id로 Future 완료, 매 반복마다 죽은 워커 정리 (요청 WorkerCrashed + 재시작)
+        while True:
+            try:
+                message = worker.responses.get(timeout=LIVENESS_INTERVAL)
+            except queue.Empty:
+                message = None
+            except (EOFError, OSError):
+                return
+
+            self._reap()
+            if message is None:
+                if worker.retired or self._closed:
+                    return
+                continue
+
+            request_id, ok, payload = message
+            with self._lock:
+                entry = self._pending.pop(request_id, None)
+                if entry is not None:
+                    entry[1].outstanding -= 1
+            if entry is None:
+                continue
+
+            future = entry[0]
+            try:
+                value = pickle.loads(payload)
+            except Exception as e:
+                future.set_exception(e)
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def stats(self) -> Dict[str, Any]:
+        # 📊 워커별 상태 (registry 상세는 /models/workers?detail=1 에서 broadcast로 조회)
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "num_workers": self.num_workers,
+                "threads_per_worker": self.threads_per_worker,
+                "concurrency": self.concurrency,
+                "routing": self.routing,
+                "timeout": self.timeout,
+                "workers": [
+                    {
+                        "index": worker.index,
+                        "pid": worker.process.pid,
+                        "alive": worker.process.is_alive(),
+                        "outstanding": worker.outstanding,
+                        "routed": worker.routed,
+                        "restarts": worker.restarts,
+                    }
+                    for worker in self._workers
+                ],
+            }
+
+    def shutdown(self, timeout: float = 5.0):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+
+        for worker in workers:
+            worker.requests.put(None)
+        for worker in workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+
+
+# ✅ 프로세스 공용 워커 풀 (GIMBAB_MODEL_WORKERS=0 이면 비활성)
+worker_pool = ModelWorkerPool()
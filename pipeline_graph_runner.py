@@ -2,14 +2,74 @@
 # - FastAPI 엔드포인트(main.py)에서 호출됨
 # - JSON 형식으로 정의된 파이프라인(DAG)을 받아
 #   실행 전 유효성 검사 후 execute_graph로 전달함
+# - 등록형 계획(plan_id)은 run_registered_plan으로 실행
+# - 여러 입력 레코드는 run_pipeline_batch로 column-wise 실행
+# - stream_pipeline_graph는 노드가 끝날 때마다 이벤트를 내보냄 (NDJSON / SSE)
+# - run_pipeline_file은 로컬 파일 코퍼스를 batch 단위로 흘려보내고 결과를 파일에 기록
+# - 동일한 그래프 + 입력 요청이 동시에 들어오면 한 번만 실행하고 결과 / 오류를 공유 (single-flight)
 
-from utils.graph_executor import execute_graph
+import hashlib
+import threading
+import time
+from typing import Callable, Optional
 
+from utils.graph_executor import (
+    execute_graph,
+    execute_plan,
+    execute_plan_batch,
+    GraphCancelled,
+    NodeExecutionError,
+)
+from utils.serialization import to_serializable
+from utils.plan_compiler import get_plan, get_registered_plan, spec_params
+from utils.result_cache import canonical_json
+from utils.single_flight import SINGLE_FLIGHT_ENABLED, FlightCancelled, graph_flight
+from utils.stream_runner import run_stream
 
-def run_pipeline_graph(pipeline_json: dict):
+
+def _coalesced(payload: dict, options: dict, execute: Callable, cancel_event, metadata):
+    """
+    📌 동일 요청(payload) 단위 single-flight 실행
+    - execute(metadata): 실제 실행 (leader만 호출, 전용 metadata dict에 기록)
+    - follower는 leader의 결과 / 오류 / metadata를 공유하고 meta.coalesced = True
+    - leader 요청만 취소된 경우(GraphCancelled) follower는 다시 시도, 자신의 취소는 GraphCancelled
+    - options.coalesce=False 또는 GIMBAB_SINGLE_FLIGHT=0 이면 바로 실행
+    """
+    if not options.get("coalesce", SINGLE_FLIGHT_ENABLED):
+        return execute(metadata)
+
+    def run():
+        flight_metadata = {}
+        return execute(flight_metadata), flight_metadata
+
+    key = hashlib.sha256(canonical_json(payload).encode("utf-8")).hexdigest()
+    try:
+        (result, flight_metadata), shared = graph_flight.do(key, run, cancel_event, retry_on=(GraphCancelled,))
+    except FlightCancelled as e:
+        raise GraphCancelled(str(e))
+
+    if metadata is not None:
+        metadata.update(flight_metadata)
+        if shared:
+            metadata["coalesced"] = True
+    return result
+
+
+def run_pipeline_graph(
+    pipeline_json: dict,
+    cancel_event: Optional[threading.Event] = None,
+    metadata: Optional[dict] = None,
+):
     """
     📌 외부 요청에서 받은 JSON DAG을 받아 실행 흐름으로 넘김
-    - 입력: {"nodes": [...], "edges": [...]}
+    - 입력: {"nodes": [...], "edges": [...], "options": {...}}
+    - options (선택): max_workers, worker_limits, cache, arrays("list" / "base64"),
+                     timing(True 시 meta.timing에 노드별 시간),
+                     targets(출력 노드 id 리스트 → 조상 노드만 실행, 해당 노드 결과만 반환),
+                     dedupe(False 시 중복 노드 병합 끔),
+                     coalesce(False 시 동시 동일 요청 / 모델 노드 결과 공유 끔) 등 실행 설정
+    - cancel_event (선택): set 시 남은 노드 실행 중단 (timeout / 취소)
+    - metadata (선택): 실행 부가 정보(캐시 통계 등)를 채워 받을 dict
     - 출력: 실행 결과 (모든 노드 실행 후 출력 반환)
 
     ✅ 처리 과정 요약:
@@ -22,11 +82,202 @@ def run_pipeline_graph(pipeline_json: dict):
     if "nodes" not in pipeline_json or "edges" not in pipeline_json:
         raise ValueError("Invalid pipeline format. 'nodes' and 'edges' are required.")
 
-    # ✅ DAG 실행 (실질적 처리 로직은 graph_executor로 위임)
-    result = execute_graph(
-        nodes=pipeline_json["nodes"],
-        edges=pipeline_json["edges"]
-    )
+    options = pipeline_json.get("options") or {}
+
+    # ✅ DAG 실행 (실질적 처리 로직은 graph_executor로 위임, 동시 동일 요청은 한 번만 실행)
+    def execute(run_metadata):
+        return execute_graph(
+            nodes=pipeline_json["nodes"],
+            edges=pipeline_json["edges"],
+            max_workers=options.get("max_workers"),
+            worker_limits=options.get("worker_limits"),
+            cancel_event=cancel_event,
+            cache=options.get("cache"),
+            metadata=run_metadata,
+            arrays=options.get("arrays"),
+            timing=bool(options.get("timing")),
+            targets=options.get("targets"),
+            dedupe=options.get("dedupe"),
+            coalesce=options.get("coalesce")
+        )
+
+    result = _coalesced({"graph": pipeline_json}, options, execute, cancel_event, metadata)
 
     # 🔁 실행 결과 반환
-    return result
\ No newline at end of file
+    return result
+
+
+def run_registered_plan(
+    plan_id: str,
+    inputs: Optional[dict] = None,
+    options: Optional[dict] = None,
+    cancel_event: Optional[threading.Event] = None,
+    metadata: Optional[dict] = None,
+):
+    """
+    📌 register_plan()으로 등록된 계획을 plan_id로 실행
+    - inputs (선택): {source_node_id: 입력값} → 등록 시 params 대신 외부 입력 사용
+    - options (선택): 등록 시 options 위에 덮어쓰기
+
+    ✅ 계획 컴파일 / 모듈 import / evaluator 래핑 비용 없이 바로 실행
+    """
+    registered = get_registered_plan(plan_id)
+    merged_options = {**registered.options, **(options or {})}
+
+    def execute(run_metadata):
+        return execute_plan(
+            registered.plan,
+            params=registered.params,
+            inputs=inputs,
+            max_workers=merged_options.get("max_workers"),
+            worker_limits=merged_options.get("worker_limits"),
+            cancel_event=cancel_event,
+            cache=merged_options.get("cache"),
+            cache_settings=registered.cache_settings,
+            metadata=run_metadata,
+            arrays=merged_options.get("arrays"),
+            timing=bool(merged_options.get("timing")),
+            targets=merged_options.get("targets"),
+            dedupe=merged_options.get("dedupe"),
+            coalesce=merged_options.get("coalesce")
+        )
+
+    # ✅ 등록 객체 id 포함 (같은 plan_id로 재등록된 계획과 섞이지 않도록)
+    payload = {"plan": plan_id, "registered": id(registered), "inputs": inputs, "options": merged_options}
+    return _coalesced(payload, merged_options, execute, cancel_event, metadata)
+
+
+
+def run_pipeline_batch(
+    pipeline_json: dict,
+    cancel_event: Optional[threading.Event] = None,
+    metadata: Optional[dict] = None,
+):
+    """
+    📌 하나의 그래프를 여러 입력 레코드에 대해 실행
+    - 입력: {"nodes": [...], "edges": [...], "records": [...], "options": {...}}
+    - records: 소스 노드가 하나면 입력값(예: 문자열) 리스트,
+               여럿이면 {source_node_id: 입력값} 리스트
+    - 출력: 레코드 순서대로 성공 결과 또는 레코드별 오류
+    """
+    if "nodes" not in pipeline_json or "edges" not in pipeline_json:
+        raise ValueError("Invalid pipeline format. 'nodes' and 'edges' are required.")
+    if not isinstance(pipeline_json.get("records"), list):
+        raise ValueError("Invalid batch format. 'records' must be a list.")
+
+    options = pipeline_json.get("options") or {}
+    plan = get_plan(pipeline_json["nodes"], pipeline_json["edges"])
+
+    return execute_plan_batch(
+        plan,
+        pipeline_json["records"],
+        params=spec_params(pipeline_json["nodes"]),
+        max_workers=options.get("max_workers"),
+        worker_limits=options.get("worker_limits"),
+        cancel_event=cancel_event,
+        metadata=metadata,
+        arrays=options.get("arrays"),
+        timing=bool(options.get("timing")),
+        targets=options.get("targets"),
+        dedupe=options.get("dedupe")
+    )
+
+
+
+def stream_pipeline_graph(
+    pipeline_json: dict,
+    emit: Callable[[dict], None],
+    cancel_event: Optional[threading.Event] = None,
+    metadata: Optional[dict] = None,
+):
+    """
+    📌 그래프를 실행하면서 노드별 결과를 이벤트로 즉시 전달
+    - emit(event): 스케줄러 스레드에서 호출됨 (스레드 안전한 전달은 호출자 책임)
+
+    ✅ 이벤트 형태:
+    - {"event": "node", "node": id, "output": ...}       : 노드 완료 (직렬화된 출력)
+    - {"event": "error", "node": id, "message": ...}     : 노드 실패
+    - {"event": "summary", "status": ..., ...}           : 마지막 이벤트 (항상 1회)
+
+    ✅ 메모리: 후속 노드가 모두 입력을 가져간 출력은 즉시 해제 (retain_results=False)
+    """
+    start = time.perf_counter()
+    completed = []
+    summary = {"event": "summary", "status": "success"}
+
+    options = pipeline_json.get("options") or {}
+
+    def on_node_complete(node_id, output):
+        completed.append(node_id)
+        emit({"event": "node", "node": node_id, "output": to_serializable(output, options.get("arrays"))})
+
+    try:
+        if "nodes" not in pipeline_json or "edges" not in pipeline_json:
+            raise ValueError("Invalid pipeline format. 'nodes' and 'edges' are required.")
+
+        execute_graph(
+            nodes=pipeline_json["nodes"],
+            edges=pipeline_json["edges"],
+            max_workers=options.get("max_workers"),
+            worker_limits=options.get("worker_limits"),
+            cancel_event=cancel_event,
+            cache=options.get("cache"),
+            metadata=metadata,
+            on_node_complete=on_node_complete,
+            retain_results=False,
+            timing=bool(options.get("timing")),
+            targets=options.get("targets"),
+            dedupe=options.get("dedupe")
+        )
+
+    except NodeExecutionError as e:
+        emit({"event": "error", "node": e.node_id, "message": str(e)})
+        summary.update(status="error", message=str(e))
+
+    except GraphCancelled as e:
+        summary.update(status="cancelled", message=str(e))
+
+    except Exception as e:
+        summary.update(status="error", message=str(e))
+
+    summary.update(nodes_completed=completed, elapsed_seconds=round(time.perf_counter() - start, 4))
+    if metadata:
+        summary["meta"] = metadata
+    emit(summary)
+
+
+
+def run_pipeline_file(
+    pipeline_json: dict,
+    cancel_event: Optional[threading.Event] = None,
+    metadata: Optional[dict] = None,
+):
+    """
+    📌 로컬 파일 코퍼스 전체를 그래프로 스트리밍 실행
+    - 입력: {"nodes": [...], "edges": [...], "source": {...}, "sink": {...}, "options": {...}}
+    - source: {"module": "line_text" | "jsonl" | "csv_column", "path": ..., 어댑터 params}
+    - sink: {"module": "jsonl_writer", "path": ...}
+    - options (선택): batch_size, max_pending_batches, output_nodes, max_workers, worker_limits
+    - 출력: 처리 요약 (결과 자체는 sink 파일에 레코드마다 기록)
+    """
+    if "nodes" not in pipeline_json or "edges" not in pipeline_json:
+        raise ValueError("Invalid pipeline format. 'nodes' and 'edges' are required.")
+    if not pipeline_json.get("source") or not pipeline_json.get("sink"):
+        raise ValueError("Invalid stream format. 'source' and 'sink' are required.")
+
+    options = pipeline_json.get("options") or {}
+    plan = get_plan(pipeline_json["nodes"], pipeline_json["edges"])
+
+    return run_stream(
+        plan,
+        source=pipeline_json["source"],
+        sink=pipeline_json["sink"],
+        params=spec_params(pipeline_json["nodes"]),
+        batch_size=options.get("batch_size"),
+        max_pending_batches=options.get("max_pending_batches"),
+        output_nodes=options.get("output_nodes"),
+        max_workers=options.get("max_workers"),
+        worker_limits=options.get("worker_limits"),
+        cancel_event=cancel_event,
+        metadata=metadata
+    )
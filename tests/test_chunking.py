@@ -0,0 +1,76 @@
+"""
+📦 models.text.chunking 테스트
+──────────────────────────────────────────────
+- 공백 단위 토큰 tokenizer + 가짜 batch 실행기로 분할 → 실행 → 병합 경로 검사 (transformers 불필요)
+
+📌 실행:
+python -m pytest -q tests
+"""
+
+import re
+
+from models.text.chunking import run_chunked
+
+LABELS = ["sports", "politics", "science", "music"]
+
+
+class WhitespaceTokenizer:
+    # ✅ 공백 단위 토큰 + offset mapping (fast tokenizer 흉내)
+    model_max_length = 512
+
+    def num_special_tokens_to_add(self, pair=False):
+        return 3 if pair else 2
+
+    def __call__(self, text, add_special_tokens=False, return_offsets_mapping=False):
+        return {"offset_mapping": [match.span() for match in re.finditer(r"\S+", text)]}
+
+
+def _zero_shot_batch(items, top_k=None):
+    # ✅ chunk 텍스트에 들어있는 라벨 단어 수로 모든 후보 라벨 점수 계산 (top_k는 실행기와 같게 자름)
+    outputs = []
+    for item in items:
+        words = item["text"].split()
+        counts = {label: words.count(label) + 1 for label in LABELS}
+        total = sum(counts.values())
+        ranked = sorted(LABELS, key=lambda label: counts[label], reverse=True)
+        output = {"sequence": item["text"], "labels": ranked, "scores": [counts[label] / total for label in ranked]}
+        if top_k:
+            output = {**output, "labels": output["labels"][:top_k], "scores": output["scores"][:top_k]}
+        outputs.append(output)
+    return outputs
+
+
+def test_zero_shot_top_k_applied_after_merge():
+    # 📌 앞 chunk는 sports, 뒤 chunk는 science 위주 → chunk별 top_k였다면 합집합 라벨이 top_k를 넘음
+    text = " ".join(["sports"] * 12 + ["politics"] * 2 + ["science"] * 14 + ["music"] * 2)
+    inputs = [{"text": text}, {"text": "science music"}]
+    calls = []
+
+    def run_batch(items):
+        calls.append(len(items))
+        return _zero_shot_batch(items)
+
+    results = run_chunked(inputs, "zero-shot-classification", WhitespaceTokenizer(), run_batch,
+                          chunk_tokens=16, chunk_overlap=0, top_k=2)
+
+    assert calls == [3]  # 긴 입력 2 chunk + 짧은 입력 1건을 한 batch로
+    long_result, short_result = results
+    assert long_result["labels"] == ["science", "sports"]
+    assert len(long_result["scores"]) == 2
+    assert long_result["sequence"] == text
+    assert len(short_result["labels"]) == 2
+
+
+def test_zero_shot_merge_uses_full_label_scores():
+    # 📌 병합 점수는 모든 라벨 점수의 chunk 토큰 길이 가중 평균 (top_k 유무와 무관하게 같은 값)
+    text = " ".join(["sports"] * 12 + ["politics"] * 2 + ["science"] * 14 + ["music"] * 2)
+    tokenizer = WhitespaceTokenizer()
+
+    full = run_chunked([{"text": text}], "zero-shot-classification", tokenizer, _zero_shot_batch,
+                       chunk_tokens=16, chunk_overlap=0)[0]
+    cut = run_chunked([{"text": text}], "zero-shot-classification", tokenizer, _zero_shot_batch,
+                      chunk_tokens=16, chunk_overlap=0, top_k=2)[0]
+
+    assert full["labels"][:2] == cut["labels"]
+    assert full["scores"][:2] == cut["scores"]
+    assert abs(sum(full["scores"]) - 1.0) < 1e-9
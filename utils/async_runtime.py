@@ -0,0 +1,93 @@
+"""
+📦 Async Runtime: async_runtime.py
+──────────────────────────────────────────────
+- 비동기 모듈 프로토콜(async def arun(input=..., **params))을 실행하는 백그라운드 이벤트 루프
+- 스케줄러는 arun을 가진 노드를 이 루프에 투입 → 그래프 워커 스레드를 점유하지 않고
+  파일 / 로컬 서비스 / 원격 모델 I/O 대기를 다른 노드 실행과 겹침
+- 동기 run만 있는 모듈은 call_module()에서 executor(asyncio.to_thread)로 투명하게 실행
+- arun만 있는 모듈은 sync_view()로 동기 run을 붙여 기존 호출 경로(evaluator / 배치 fallback)에서 사용
+
+📌 모듈 예시:
+async def arun(input, path=None, **params):
+    await write_somewhere(input)
+    return input
+"""
+
+import asyncio
+import inspect
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Optional
+
+
+def has_arun(module) -> bool:
+    # ✅ 비동기 프로토콜 지원 여부 (arun이 코루틴 함수인 경우만)
+    return inspect.iscoroutinefunction(getattr(module, "arun", None))
+
+# ------------------------------------------------------
+# 📦 백그라운드 이벤트 루프 (프로세스당 1개, 첫 사용 시 시작)
+# ------------------------------------------------------
+class AsyncRuntime:
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=self._serve, args=(loop,), name="gimbab-async", daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    @staticmethod
+    def _serve(loop: asyncio.AbstractEventLoop):
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    def submit(self, coro: Coroutine) -> Future:
+        # ✅ 코루틴 투입 → concurrent.futures.Future (스케줄러의 wait()와 함께 사용 가능)
+        return asyncio.run_coroutine_threadsafe(coro, self.loop())
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        # ✅ 동기 코드에서 코루틴 실행 후 결과 대기
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("❌ AsyncRuntime.run() cannot block inside the runtime loop; await the coroutine instead.")
+        return self.submit(coro).result(timeout)
+
+    def shutdown(self, timeout: float = 5.0):
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not loop.is_running():
+            loop.close()
+
+
+# ✅ 전역 런타임 인스턴스
+async_runtime = AsyncRuntime()
+
+# ------------------------------------------------------
+# 📌 sync / async 모듈 공용 호출
+# ------------------------------------------------------
+async def call_module(module, input: Any, **params) -> Any:
+    # ✅ arun이 있으면 await, 없으면 동기 run을 executor 스레드에서 실행
+    if has_arun(module):
+        return await module.arun(input=input, **params)
+    return await asyncio.to_thread(module.run, input, **params)
+
+def sync_view(module):
+    # ✅ arun만 있는 모듈 → 백그라운드 루프에서 실행하는 동기 run을 붙인 객체 (run이 있으면 그대로)
+    if callable(getattr(module, "run", None)):
+        return module
+
+    def run(input=None, **params):
+        return async_runtime.run(module.arun(input=input, **params))
+
+    return type("SyncView", (), {"run": staticmethod(run), "arun": staticmethod(module.arun)})()
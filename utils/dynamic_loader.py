@@ -9,7 +9,8 @@ TYPE_TO_PACKAGE = {
     "model": "models",
     "output": "adapters.output",
     "evaluator": "evaluators",
-    "bridge": "adapters.bridge"
+    "bridge": "adapters.bridge",
+    "comparator": "comparators"
 }
 
 # ------------------------------------------------------
@@ -25,6 +26,24 @@ MODULE_ALIASES = {
     # 🔧 확장 가능: 필요 시 여기에 추가
 }
 
+# ------------------------------------------------------
+# 📌 직접 등록된 모듈 ((모듈 유형, 모듈 이름) → 모듈 객체)
+# - 패키지 경로 없이 실행 객체를 노드 모듈로 사용 (benchmarks의 stub 노드 등)
+# - 등록된 이름은 import 경로보다 우선
+# ------------------------------------------------------
+_REGISTERED_MODULES = {}
+
+def register_module(module_type: str, module_name: str, module):
+    # 🚨 예외처리: 지원하지 않는 모듈 유형 / run(또는 arun) 메서드 없는 객체
+    if module_type not in TYPE_TO_PACKAGE:
+        raise ValueError(f"❌ Unknown module type: {module_type}")
+    if not callable(getattr(module, "run", None)) and not callable(getattr(module, "arun", None)):
+        raise TypeError(f"❌ Registered module '{module_name}' must define run() or arun().")
+    _REGISTERED_MODULES[(module_type, module_name)] = module
+
+def unregister_module(module_type: str, module_name: str) -> bool:
+    return _REGISTERED_MODULES.pop((module_type, module_name), None) is not None
+
 # ------------------------------------------------------
 # 📌 동적 모듈 로딩 함수
 # - 지정된 타입과 이름을 기반으로 importlib을 통해 모듈 동적 import
@@ -41,12 +60,18 @@ def load_module(module_type: str, module_name: str):
     - ("model", "text-model") → models (text dispatcher)
     - ("model", "vision-model") → models.vision
     - ("bridge", "text.from_ner") → adapters.bridge.text.from_ner
+    - ("comparator", "text") → comparators.text
     """
 
     # 🚨 예외처리: 지원하지 않는 모듈 유형
     if module_type not in TYPE_TO_PACKAGE:
         raise ValueError(f"❌ Unknown module type: {module_type}")
 
+    # ✅ 직접 등록된 모듈 우선
+    registered = _REGISTERED_MODULES.get((module_type, module_name))
+    if registered is not None:
+        return registered
+
     # ✅ alias로 등록된 모델 이름인 경우 → alias 경로로 import
     if module_type == "model" and module_name in MODULE_ALIASES:
         resolved_path = MODULE_ALIASES[module_name]
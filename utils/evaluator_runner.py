@@ -4,10 +4,13 @@
 - 각 노드의 실행 모듈에 evaluator를 중첩 래핑하는 기능 제공
 - evaluator는 클로저 방식으로 run() 메서드를 감싸는 구조
 - 추후 evaluator 실행 결과 로깅, 저장, 후처리 확장 가능성 대비
+- 비동기 모듈(arun)도 래핑: 래핑된 모듈에 arun이 있으면 래퍼도 arun 제공
 """
 
+import asyncio
 from typing import List
 from utils.dynamic_loader import load_module
+from utils.async_runtime import has_arun, sync_view
 
 # ------------------------------------------------------
 # 📌 Evaluator 래핑 함수
@@ -22,20 +25,39 @@ def apply_evaluators(module, evaluator_names: List[str]):
     - evaluator.run(input=..., module=prev_module, **params) 형식으로 호출됨
     - 기존 모듈을 감싸는 형태로 순차적으로 evaluator를 적용합니다.
 
+    ✅ 비동기 모듈 (arun):
+    - prev_module에 arun이 있으면 래퍼도 arun 제공 → 노드가 비동기로 실행됨
+      - evaluator에 arun이 있으면 await evaluator.arun(input=..., module=prev_module, ...)
+      - 없으면 동기 evaluator 체인을 executor 스레드에서 실행
+    - 동기 evaluator가 받는 module은 항상 run을 가짐 (arun만 있는 모듈은 sync_view로 변환)
+
     ✅ 입력:
     - module: run(input=...) 메서드를 가진 실행 객체
     - evaluator_names: 문자열 evaluator 모듈 이름 목록
 
     ✅ 출력:
-    - evaluator가 중첩 적용된 모듈 (run 메서드만 존재)
+    - evaluator가 중첩 적용된 모듈 (run 메서드, 비동기 모듈인 경우 arun 포함)
     """
     for evaluator_name in evaluator_names:
         evaluator_module = load_module("evaluator", evaluator_name)
 
         def make_wrapped(prev_module, evaluator_module):
+            sync_module = sync_view(prev_module)
+
             def run(input, **params):
-                return evaluator_module.run(input=input, module=prev_module, **params)
-            return type("WrappedModule", (), {"run": staticmethod(run)})()
+                return evaluator_module.run(input=input, module=sync_module, **params)
+
+            attrs = {"run": staticmethod(run)}
+
+            if has_arun(prev_module):
+                async def arun(input, **params):
+                    if has_arun(evaluator_module):
+                        return await evaluator_module.arun(input=input, module=prev_module, **params)
+                    return await asyncio.to_thread(run, input, **params)
+
+                attrs["arun"] = staticmethod(arun)
+
+            return type("WrappedModule", (), attrs)()
 
         module = make_wrapped(module, evaluator_module)
 
@@ -0,0 +1,123 @@
+"""
+📦 Execution Pool: execution_pool.py
+──────────────────────────────────────────────
+- 동기 파이프라인 실행을 이벤트 루프 밖(bounded thread pool)에서 수행
+- 동시 실행 그래프 수 + 대기열 길이를 제한하는 admission control 제공
+- 요청 단위 timeout / cancellation 지원 (cancel_event로 실행기에 전달)
+
+📌 사용 예시:
+pool = GraphExecutionPool(max_workers=4, max_queue=16)
+result = await pool.run(run_pipeline_graph, payload, timeout=30, cancel_event=event)
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from utils.metrics import metrics
+
+# ------------------------------------------------------
+# ⚙️ 기본 설정 (환경 변수로 조정 가능)
+# ------------------------------------------------------
+DEFAULT_MAX_INFLIGHT = int(os.getenv("GIMBAB_MAX_INFLIGHT_GRAPHS", "4"))
+DEFAULT_MAX_QUEUE = int(os.getenv("GIMBAB_MAX_QUEUED_GRAPHS", "16"))
+DEFAULT_TIMEOUT = float(os.getenv("GIMBAB_GRAPH_TIMEOUT", "300"))
+
+
+class AdmissionRejected(Exception):
+    """실행 중 + 대기 중인 그래프 수가 상한에 도달해 요청을 받을 수 없음 (HTTP 429)"""
+
+
+# ------------------------------------------------------
+# 📦 그래프 실행 풀
+# ------------------------------------------------------
+class GraphExecutionPool:
+    """
+    ✅ 그래프 실행 전용 bounded thread pool
+
+    - max_workers: 동시에 실행되는 그래프 수 (in-flight 상한)
+    - max_queue: 워커를 기다리는 그래프 수 상한 (초과 시 AdmissionRejected)
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_INFLIGHT, max_queue: int = DEFAULT_MAX_QUEUE):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="gimbab-graph")
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._running = 0
+        self._rejected = 0
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        # 🚨 admission control: 실행 + 대기 합계가 용량을 넘으면 즉시 거절
+        with self._lock:
+            if self._admitted >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise AdmissionRejected(
+                    f"❌ Too many pipeline executions in flight "
+                    f"(max_workers={self.max_workers}, max_queue={self.max_queue})."
+                )
+            self._admitted += 1
+
+        admitted_at = time.perf_counter()
+
+        def tracked():
+            # 📊 풀 대기 시간 기록 (admission → 워커 시작)
+            metrics.observe("gimbab_graph_queue_wait_seconds", time.perf_counter() - admitted_at)
+            with self._lock:
+                self._running += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        future = self._executor.submit(tracked)
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future: Future):
+        # ✅ 실행 완료 또는 대기 중 취소 시 슬롯 반환
+        with self._lock:
+            self._admitted -= 1
+
+    async def run(
+        self,
+        fn: Callable,
+        *args,
+        timeout: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        ✅ fn을 풀에서 실행하고 결과를 await
+
+        - timeout 초과 또는 호출 코루틴 취소 시:
+          1. 아직 대기 중이면 큐에서 제거
+          2. 실행 중이면 cancel_event를 set → 실행기가 다음 노드 투입 전 중단
+        """
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            future.cancel()
+            if cancel_event is not None:
+                cancel_event.set()
+            raise
+
+    def stats(self) -> Dict[str, int]:
+        # 📊 현재 실행/대기 상태 (모니터링용)
+        with self._lock:
+            return {
+                "running": self._running,
+                "queued": self._admitted - self._running,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "rejected_total": self._rejected,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,65 @@
+"""
+📦 File Stream Utility: file_stream.py
+──────────────────────────────────────────────
+- 대용량 로컬 파일을 한 줄씩 lazy하게 읽기 위한 공용 유틸
+- 기본: mmap 기반 읽기 (파일 전체를 메모리에 올리지 않음)
+- mmap 불가(빈 파일, 특수 파일 등) 시 버퍼 단위(chunked) 읽기로 대체
+- 파일 경로는 GIMBAB_STREAM_ROOT(기본 ~/.cache/gimbab/data) 기준 상대 경로만 허용
+  (절대 경로 / ".." / symlink로 root 밖을 가리키는 경로는 PermissionError)
+
+📌 사용 예시:
+for line in iter_lines("corpus.txt"):
+    ...
+"""
+
+import mmap
+import os
+from typing import Iterator
+
+# ✅ 파일 입출력 어댑터가 접근할 수 있는 유일한 디렉터리 (HTTP 요청의 경로는 이 하위로 제한)
+STREAM_ROOT = os.getenv("GIMBAB_STREAM_ROOT") or os.path.join(os.path.expanduser("~"), ".cache", "gimbab", "data")
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# ------------------------------------------------------
+# 📌 경로 검증
+# - GIMBAB_STREAM_ROOT 기준 상대 경로 → root 하위의 실제 경로 (symlink 해석 후 검사)
+# ------------------------------------------------------
+def resolve_path(path: str) -> str:
+    if not path:
+        raise ValueError("❌ A file 'path' is required for streaming adapters.")
+    if os.path.isabs(path):
+        raise PermissionError(f"❌ Absolute paths are not allowed; use a path relative to GIMBAB_STREAM_ROOT: {path}")
+
+    root = os.path.realpath(STREAM_ROOT)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise PermissionError(f"❌ Path is outside GIMBAB_STREAM_ROOT: {path}")
+    return resolved
+
+# ------------------------------------------------------
+# 📌 줄 단위 lazy 읽기
+# ------------------------------------------------------
+def iter_lines(path: str, encoding: str = "utf-8", use_mmap: bool = True, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    ✅ 파일을 한 줄씩 읽어 (줄바꿈 제거된) 문자열로 yield
+
+    - use_mmap=True: mmap.readline() 사용 → OS 페이지 캐시만 사용, 힙 메모리 일정
+    - 실패 시 / use_mmap=False: buffering=chunk_size 로 파일 객체 순회
+    """
+    resolved = resolve_path(path)
+
+    with open(resolved, "rb", buffering=chunk_size) as f:
+        if use_mmap:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                mapped = None  # ↩️ 빈 파일 등 → 버퍼 읽기로 대체
+
+            if mapped is not None:
+                with mapped:
+                    for raw in iter(mapped.readline, b""):
+                        yield raw.decode(encoding).rstrip("\r\n")
+                return
+
+        for raw in f:
+            yield raw.decode(encoding).rstrip("\r\n")
@@ -1,116 +1,734 @@
-from typing import List, Dict, Any
+import asyncio
+import os
+import threading
+import time
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from collections import defaultdict, deque
-from utils.dynamic_loader import load_module
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from utils.serialization import to_serializable
-from utils.evaluator_runner import apply_evaluators
+from utils.result_cache import result_cache, make_cache_key, resolve_cache_options
+from utils.metrics import metrics, rss_bytes, torch_memory
+from utils.async_runtime import async_runtime
+from utils.single_flight import SINGLE_FLIGHT_ENABLED, NODE_TYPES, node_flight
+from utils.plan_compiler import (
+    ExecutionPlan,
+    PlanNode,
+    dedupe_plan,
+    get_plan,
+    prune_plan,
+    spec_params,
+    spec_cache_settings,
+)
 
 # ------------------------------------------------------
-# 📦 DAG 유틸리티: 위상 정렬
+# ⚙️ 병렬 실행 기본 설정
+# - GIMBAB_GRAPH_WORKERS: 요청 하나가 동시에 실행할 수 있는 최대 노드 수
+# - GIMBAB_WORKER_LIMITS: 모듈 유형별 동시 실행 상한 (예: "model=2,bridge=4")
+# - GIMBAB_NODE_POOL_SIZE: 모든 그래프 실행이 공유하는 노드 스레드 수 (프로세스 전체 상한)
 # ------------------------------------------------------
-def topological_sort(nodes: List[Dict], edges: List[Dict]) -> List[str]:
+DEFAULT_MAX_WORKERS = int(os.getenv("GIMBAB_GRAPH_WORKERS", "4"))
+NODE_POOL_SIZE = int(os.getenv("GIMBAB_NODE_POOL_SIZE", str(DEFAULT_MAX_WORKERS * 4)))
+
+# ✅ 중복 노드 병합 기본값 (요청 options.dedupe로 개별 지정 가능)
+DEFAULT_DEDUPE = os.getenv("GIMBAB_GRAPH_DEDUPE", "1") == "1"
+
+
+def _parse_worker_limits(raw: str) -> Dict[str, int]:
+    # 📌 "type=N,type=N" 형식의 문자열을 dict로 변환
+    limits = {}
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        module_type, value = item.split("=", 1)
+        limits[module_type.strip()] = int(value)
+    return limits
+
+
+DEFAULT_WORKER_LIMITS = _parse_worker_limits(os.getenv("GIMBAB_WORKER_LIMITS", ""))
+
+# ✅ 공용 노드 스레드 풀 (첫 사용 시 생성, 요청마다 스레드를 만들지 않음)
+_node_pool: Optional[ThreadPoolExecutor] = None
+_node_pool_lock = threading.Lock()
+
+def _shared_node_pool() -> ThreadPoolExecutor:
+    global _node_pool
+    with _node_pool_lock:
+        if _node_pool is None:
+            _node_pool = ThreadPoolExecutor(max_workers=max(1, NODE_POOL_SIZE), thread_name_prefix="gimbab-node")
+        return _node_pool
+
+
+class GraphCancelled(Exception):
+    """cancel_event가 set되어 그래프 실행이 중단됨 (timeout / 클라이언트 취소)"""
+
+
+class NodeExecutionError(Exception):
+    """노드 실행 중 예외 발생 (node_id와 원래 예외를 함께 전달, 메시지는 원래 예외와 동일)"""
+
+    def __init__(self, node_id: str, error: Exception):
+        super().__init__(str(error))
+        self.node_id = node_id
+        self.error = error
+
+# ------------------------------------------------------
+# 📦 노드 단위 실행 유틸리티
+# ------------------------------------------------------
+def _collect_input(prev_ids: List[str], results: Dict[str, Any]) -> Any:
+    # 📥 입력 구성: 이전 노드들의 결과
+    if len(prev_ids) == 0:
+        return {}
+    elif len(prev_ids) == 1:
+        return results[prev_ids[0]]
+    return {pid: results[pid] for pid in prev_ids}
+
+
+def _node_params(plan_node: PlanNode, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    # 📌 실행용 params 사본 (모델 모듈인 경우 domain 누락 시 기본값 보정)
+    params = dict(params or {})
+    if plan_node.module_type == "model":
+        params.setdefault("domain", "text")
+    return params
+
+
+def _execute_node(
+    plan_node: PlanNode,
+    input_data: Any,
+    params: Dict[str, Any],
+    cache_options: Optional[Dict[str, Any]],
+    coalesce: bool = False,
+):
+    """
+    ✅ 결과 캐시를 거쳐 노드 실행 → (출력, 캐시 상태) 반환 (워커 스레드에서 호출됨)
+
+    - 모듈은 계획 컴파일 시 import + evaluator 래핑이 끝난 상태
+    - 캐시 상태: None (미사용) | "hit-memory" | "hit-disk" | "miss" | "bypass"
+    - coalesce: 같은 key(결과 캐시 key)로 진행 중인 실행이 있으면 결과 / 예외 공유 (node_flight)
     """
-    ✅ DAG 형태의 노드/엣지 정의로부터 실행 순서를 정렬
+    if cache_options is None and not coalesce:
+        return plan_node.module.run(input=input_data, **params), None
+
+    key = make_cache_key(plan_node.module_type, plan_node.module_name, params, input_data, plan_node.evaluators)
+
+    if cache_options is not None and not cache_options["bypass"]:
+        hit, value, tier = result_cache.get(key)
+        if hit:
+            return value, f"hit-{tier}"
 
-    - 노드: 각 실행 유닛 (id 포함)
-    - 엣지: "from" → "to" 구조
-    - 반환값: 실행 가능한 순서대로 정렬된 노드 id 리스트
+    # 🧠 모듈 실행 (동일 호출이 진행 중이면 그 결과를 공유)
+    def run():
+        return plan_node.module.run(input=input_data, **params)
 
-    🚨 순환 참조가 존재할 경우 예외 발생
+    output, shared = node_flight.do(key, run) if coalesce else (run(), False)
+    if cache_options is None:
+        return output, None
+    if not shared:
+        result_cache.set(key, output, cache_options["ttl"])
+    return output, "bypass" if cache_options["bypass"] else "miss"
+
+async def _aexecute_node(
+    plan_node: PlanNode,
+    input_data: Any,
+    params: Dict[str, Any],
+    cache_options: Optional[Dict[str, Any]],
+    coalesce: bool = False,
+):
+    """
+    ✅ _execute_node의 비동기 버전 (plan_node.is_async, 백그라운드 이벤트 루프에서 실행)
+    - 모듈은 await module.arun(...)으로 실행, 결과 캐시 조회 / 저장(디스크 tier 포함)은 executor 스레드에서 수행
     """
-    graph = defaultdict(list)
-    indegree = defaultdict(int)
+    if cache_options is None and not coalesce:
+        return await plan_node.module.arun(input=input_data, **params), None
 
-    # 🔄 그래프 구조 및 진입 차수 계산
-    for edge in edges:
-        graph[edge["from"]].append(edge["to"])
-        indegree[edge["to"]] += 1
+    key = make_cache_key(plan_node.module_type, plan_node.module_name, params, input_data, plan_node.evaluators)
 
-    # ✅ 진입 차수가 0인 노드부터 큐에 삽입
-    queue = deque([node["id"] for node in nodes if indegree[node["id"]] == 0])
-    result = []
+    if cache_options is not None and not cache_options["bypass"]:
+        hit, value, tier = await asyncio.to_thread(result_cache.get, key)
+        if hit:
+            return value, f"hit-{tier}"
 
-    # 🔁 위상 정렬 수행 (Kahn's Algorithm)
-    while queue:
-        current = queue.popleft()
-        result.append(current)
+    def run():
+        return plan_node.module.arun(input=input_data, **params)
 
-        for neighbor in graph[current]:
-            indegree[neighbor] -= 1
-            if indegree[neighbor] == 0:
-                queue.append(neighbor)
+    output, shared = await node_flight.ado(key, run) if coalesce else (await run(), False)
+    if cache_options is None:
+        return output, None
+    if not shared:
+        await asyncio.to_thread(result_cache.set, key, output, cache_options["ttl"])
+    return output, "bypass" if cache_options["bypass"] else "miss"
+
+def _run_instrumented(fn: Callable, args: tuple, plan_node: PlanNode, submitted_at: float):
+    """
+    ✅ 노드 작업 실행 + 계측 → (결과, timing) 반환 (워커 스레드에서 호출됨)
 
-    # 🚨 순환 참조 감지
-    if len(result) != len(nodes):
-        raise ValueError("Cycle detected in DAG.")
+    - seconds: perf_counter 기준 실행 시간
+    - queue_wait_seconds: 투입(submit) → 워커 시작까지 대기 시간
+    - rss_delta_bytes / torch_delta_bytes: 실행 전후 메모리 변화 (측정 가능한 경우)
+      (torch_delta_bytes: CUDA 사용 시 CUDA 할당량, CPU 전용이면 프로세스 RSS 기준 → torch_device로 구분)
+      (동시에 실행되는 다른 노드의 영향이 섞일 수 있는 근사치)
+    """
+    labels = {"type": plan_node.module_type, "module": plan_node.module_name}
+    started = time.perf_counter()
+    rss_before = rss_bytes()
+    torch_before = torch_memory()
+
+    try:
+        result = fn(*args)
+    except Exception:
+        metrics.inc("gimbab_node_errors_total", **labels)
+        raise
+
+    timing = _record_timing(labels, started, submitted_at)
+
+    if rss_before is not None:
+        timing["rss_delta_bytes"] = (rss_bytes() or rss_before) - rss_before
+        metrics.set("gimbab_node_rss_delta_bytes", timing["rss_delta_bytes"], **labels)
+    if torch_before is not None:
+        before, device = torch_before
+        after = torch_memory()
+        timing["torch_delta_bytes"] = (after[0] if after and after[1] == device else before) - before
+        timing["torch_device"] = device
+        metrics.set("gimbab_node_torch_delta_bytes", timing["torch_delta_bytes"], device=device, **labels)
+
+    return result, timing
+
+async def _arun_instrumented(fn: Callable, args: tuple, plan_node: PlanNode, submitted_at: float):
+    """
+    ✅ 비동기 노드 작업 실행 + 계측 → (결과, timing) 반환 (백그라운드 이벤트 루프에서 실행)
+    - 같은 루프에서 여러 노드가 함께 대기하므로 메모리 변화는 측정하지 않음
+    """
+    labels = {"type": plan_node.module_type, "module": plan_node.module_name}
+    started = time.perf_counter()
 
-    return result
+    try:
+        result = await fn(*args)
+    except Exception:
+        metrics.inc("gimbab_node_errors_total", **labels)
+        raise
+
+    return result, _record_timing(labels, started, submitted_at)
+
+def _record_timing(labels: Dict[str, str], started: float, submitted_at: float) -> Dict[str, float]:
+    # 📊 실행 / 대기 시간 계측 결과 + 지표 기록
+    elapsed = time.perf_counter() - started
+    timing = {"seconds": elapsed, "queue_wait_seconds": started - submitted_at}
+    metrics.observe("gimbab_node_seconds", elapsed, **labels)
+    metrics.observe("gimbab_node_queue_wait_seconds", timing["queue_wait_seconds"], **labels)
+    return timing
+
+def _timing_report(plan: ExecutionPlan, total_seconds: float, timings: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+    # 📊 응답 metadata용 timing 요약 (위상 정렬 순서, 소수점 6자리)
+    return {
+        "total_seconds": round(total_seconds, 6),
+        "nodes": {
+            node_id: {k: round(v, 6) if isinstance(v, float) else v for k, v in timings[node_id].items()}
+            for node_id in plan.order if node_id in timings
+        },
+    }
 
 # ------------------------------------------------------
-# 📦 DAG 실행 엔진: 그래프 실행
+# 📦 ready-queue 스케줄러 (execute_plan / execute_plan_batch 공용)
 # ------------------------------------------------------
-def execute_graph(nodes: List[Dict[str, Any]], edges: List[Dict[str, str]]) -> Dict[str, Any]:
+def _schedule(
+    plan: ExecutionPlan,
+    prepare: Callable[[str], Tuple[Callable, tuple]],
+    complete: Callable[[str, Any], None],
+    max_workers: Optional[int] = None,
+    worker_limits: Optional[Dict[str, int]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    timings: Optional[Dict[str, Dict[str, float]]] = None,
+):
     """
-    ✅ 정의된 노드/엣지 DAG를 기반으로 전체 파이프라인 실행
+    ✅ 선행 노드가 모두 끝난 노드를 즉시 공용 노드 스레드 풀에 투입
 
-    - 노드: 실행 단위 (모듈 정보, 입력, 파라미터 등 포함)
-    - 엣지: 노드 간 연결 관계
-    - 결과: 모든 노드의 실행 결과 dict (id → 출력)
+    - prepare(node_id) → (fn, args): 메인 스레드에서 호출, 워커에서 실행할 작업 구성
+      (plan_node.is_async 노드는 fn이 코루틴 함수 → 백그라운드 이벤트 루프에서 await,
+       그래프 워커 스레드를 점유하지 않으므로 max_workers 상한에 포함되지 않음)
+    - complete(node_id, result): 메인 스레드에서 호출, 결과 저장
+    - max_workers: 이 그래프의 동시 실행 노드 수 (기본값 GIMBAB_GRAPH_WORKERS)
+      (스레드는 GIMBAB_NODE_POOL_SIZE 크기 공용 풀에서 사용 → 프로세스 전체 노드 스레드 수는 고정)
+    - worker_limits: 모듈 유형별 동시 실행 상한 (예: {"model": 2})
+    - cancel_event: set되면 새 노드 투입을 멈추고 GraphCancelled 발생
+    - timings: 전달 시 node_id → 계측 결과(_run_instrumented)를 채워 넣음
+      (지표 저장소 기록은 항상 수행)
+    """
+    workers = max(1, int(max_workers or DEFAULT_MAX_WORKERS))
+    limits = dict(DEFAULT_WORKER_LIMITS)
+    limits.update(worker_limits or {})
 
-    특이사항:
-    - 모델 실행 시 domain 보정
-    - bridge adapter는 별도 import 처리
-    - 다중 입력은 dict로 묶어서 전달
-    - evaluator 지정 시 래핑
+    # ✅ 남은 선행 노드 수 → 0이 되면 ready 큐로 이동
+    pending = {node_id: len(plan.nodes[node_id].input_ids) for node_id in plan.order}
+    ready = deque(node_id for node_id in plan.order if pending[node_id] == 0)
+    running = {}
+    running_per_type = defaultdict(int)
+    threads_busy = 0
+
+    # 📌 비동기 노드가 있으면 워커가 모두 바빠도 ready 큐 전체를 훑어 비동기 노드를 투입
+    has_async = any(plan.nodes[node_id].is_async for node_id in plan.order)
+
+    pool = _shared_node_pool()
+    try:
+        while ready or running:
+            # 🛑 취소 요청 시: 실행 중인 노드만 마무리하고 중단
+            if cancel_event is not None and cancel_event.is_set():
+                wait(running)
+                raise GraphCancelled("❌ Pipeline execution was cancelled.")
+
+            # 🚀 실행 가능한 노드를 워커 수 / 유형별 상한 안에서 투입
+            deferred = []
+            while ready and (threads_busy < workers or has_async):
+                node_id = ready.popleft()
+                plan_node = plan.nodes[node_id]
+                module_type = plan_node.module_type
+                limit = limits.get(module_type)
+
+                if limit is not None and running_per_type[module_type] >= max(1, int(limit)):
+                    deferred.append(node_id)
+                    continue
+                if not plan_node.is_async and threads_busy >= workers:
+                    deferred.append(node_id)
+                    continue
+
+                fn, args = prepare(node_id)
+                if plan_node.is_async:
+                    future = async_runtime.submit(_arun_instrumented(fn, args, plan_node, time.perf_counter()))
+                else:
+                    future = pool.submit(_run_instrumented, fn, args, plan_node, time.perf_counter())
+                    threads_busy += 1
+                running[future] = node_id
+                running_per_type[module_type] += 1
+
+            # ↩️ 상한에 걸린 노드는 원래 순서대로 큐 앞에 복귀
+            ready.extendleft(reversed(deferred))
+
+            # ⏳ 하나 이상 완료될 때까지 대기
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                node_id = running.pop(future)
+                running_per_type[plan.nodes[node_id].module_type] -= 1
+                if not plan.nodes[node_id].is_async:
+                    threads_busy -= 1
+
+                # 🚨 노드 예외는 node_id와 함께 전파 (실행 중인 노드는 finally에서 대기)
+                try:
+                    result, timing = future.result()
+                except Exception as e:
+                    raise NodeExecutionError(node_id, e) from e
+
+                if timings is not None:
+                    timings[node_id] = timing
+
+                complete(node_id, result)
+
+                for consumer in plan.nodes[node_id].consumers:
+                    pending[consumer] -= 1
+                    if pending[consumer] == 0:
+                        ready.append(consumer)
+    finally:
+        # ✅ 예외 / 취소로 빠져나갈 때도 이 그래프가 투입한 노드가 끝난 뒤 반환 (공용 풀은 종료하지 않음)
+        if running:
+            wait(running)
+
+# ------------------------------------------------------
+# 📌 대상 출력 가지치기
+# ------------------------------------------------------
+def _apply_targets(plan: ExecutionPlan, targets: Any, metadata: Optional[Dict[str, Any]]) -> ExecutionPlan:
+    # ✅ targets 지정 시 조상 부분 계획으로 교체 + metadata["targets"]에 실행 / 제외 노드 수 기록
+    if isinstance(targets, str):
+        targets = [targets]
+    if not targets:
+        return plan
+
+    pruned = prune_plan(plan, list(targets))
+    if metadata is not None:
+        metadata["targets"] = {
+            "requested": list(pruned.targets),
+            "executed": len(pruned.order),
+            "pruned": len(plan.order) - len(pruned.order),
+        }
+    return pruned
+
+def _apply_dedupe(
+    plan: ExecutionPlan,
+    dedupe: Optional[bool],
+    params: Dict[str, Dict[str, Any]],
+    cache_settings: Dict[str, Any],
+    metadata: Optional[Dict[str, Any]],
+) -> ExecutionPlan:
+    # ✅ 중복 노드 병합 (dedupe=False 또는 GIMBAB_GRAPH_DEDUPE=0이면 원본 계획) + metadata["dedupe"] 기록
+    if not (DEFAULT_DEDUPE if dedupe is None else dedupe):
+        return plan
+
+    deduped = dedupe_plan(plan, params, cache_settings)
+    if metadata is not None and deduped.duplicates:
+        metadata["dedupe"] = {
+            "merged": sum(len(ids) for ids in deduped.duplicates.values()),
+            "nodes": {node_id: rep for rep, ids in deduped.duplicates.items() for node_id in ids},
+        }
+    return deduped
+
+def _result_order(plan: ExecutionPlan) -> List[str]:
+    # 📌 응답 순서: 실행 순서 + 중복 노드는 대표 노드 바로 뒤
+    order = []
+    for node_id in plan.order:
+        order.append(node_id)
+        order.extend(plan.duplicates.get(node_id, ()))
+    return order
+
+def _consumer_counts(plan: ExecutionPlan) -> Dict[str, int]:
+    # 📌 출력 해제용: 노드(중복 노드 포함)별로 입력을 가져갈 실행 노드 수
+    counts = {node_id: 0 for node_id in plan.nodes}
+    for node_id in plan.order:
+        for input_id in plan.nodes[node_id].input_ids:
+            counts[input_id] += 1
+    return counts
+
+# ------------------------------------------------------
+# 📦 계획 실행 엔진
+# ------------------------------------------------------
+def execute_plan(
+    plan: ExecutionPlan,
+    params: Optional[Dict[str, Dict[str, Any]]] = None,
+    inputs: Optional[Dict[str, Any]] = None,
+    max_workers: Optional[int] = None,
+    worker_limits: Optional[Dict[str, int]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    cache: Any = None,
+    cache_settings: Optional[Dict[str, Any]] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    on_node_complete: Optional[Callable[[str, Any], None]] = None,
+    retain_results: bool = True,
+    arrays: Optional[str] = None,
+    timing: bool = False,
+    targets: Optional[List[str]] = None,
+    dedupe: Optional[bool] = None,
+    coalesce: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """
+    ✅ 컴파일된 ExecutionPlan 실행 → 모든 노드의 실행 결과 dict (id → 출력)
+
+    ✅ 스케줄링: _schedule (ready-queue, 독립 브랜치 동시 실행)
+
+    ✅ 실행 시 바인딩:
+    - params: node_id → params (계획은 그래프 형태만 담고 있음)
+    - inputs: node_id → 외부 입력 (선행 노드가 없는 노드에만 적용)
+    - cache / cache_settings: 요청 기본값 / 노드별 결과 캐시 설정
+    - metadata: 전달 시 실행 부가 정보(캐시 hit/miss 등)를 채워 넣음
+    - arrays: 결과 배열 인코딩 ("list" / "base64", 기본 GIMBAB_ARRAY_ENCODING)
+    - timing: True이고 metadata 전달 시 metadata["timing"]에 노드별 실행/대기 시간, 메모리 변화 기록
+
+    ✅ 스트리밍:
+    - on_node_complete(node_id, output): 노드가 끝나는 즉시 (스케줄러 스레드에서) 호출
+    - retain_results=False: 모든 후속 노드가 입력을 가져간 출력은 즉시 해제,
+      반환값은 빈 dict (결과는 on_node_complete로만 전달)
+
+    ✅ 대상 출력 (targets):
+    - targets 노드와 그 조상만 실행, 나머지 노드는 건너뜀 (prune_plan)
+    - targets가 아닌 중간 출력은 후속 노드가 모두 가져가는 즉시 해제
+    - 반환값에는 targets 노드의 출력만 포함
+
+    ✅ 중복 노드 병합 (dedupe, 기본 GIMBAB_GRAPH_DEDUPE=1):
+    - 같은 입력에 같은 type / module / params로 실행되는 노드는 한 번만 실행 (dedupe_plan)
+    - 결과는 모든 원래 node id로 전달 (응답 / on_node_complete / 후속 노드 입력)
+
+    ✅ 동시 요청 간 모델 노드 병합 (coalesce, 기본 GIMBAB_SINGLE_FLIGHT=1):
+    - 다른 그래프 실행에서 같은 key(결과 캐시 key)로 진행 중인 모델 노드가 있으면 결과 / 예외 공유 (node_flight)
     """
-    node_map = {node["id"]: node for node in nodes}
-    edge_map = defaultdict(list)
+    params = params or {}
+    inputs = inputs or {}
+    cache_settings = cache_settings or {}
+    coalesce = SINGLE_FLIGHT_ENABLED if coalesce is None else bool(coalesce)
+    _check_inputs(plan, inputs)
 
-    # 📥 역방향 엣지 매핑 (to → from 리스트)
-    for edge in edges:
-        edge_map[edge["to"]].append(edge["from"])
+    plan = _apply_targets(plan, targets, metadata)
+    plan = _apply_dedupe(plan, dedupe, params, cache_settings, metadata)
+    inputs = {node_id: value for node_id, value in inputs.items() if node_id in plan.nodes}
 
-    # 🔁 실행 순서 정렬
-    sorted_node_ids = topological_sort(nodes, edges)
     results = {}
+    cache_status = {}
 
-    for node_id in sorted_node_ids:
-        node = node_map[node_id]
-        prev_ids = edge_map[node_id]
+    # ✅ 출력 해제용: 아직 입력을 가져가지 않은 후속 노드 수
+    remaining_consumers = _consumer_counts(plan)
 
-        # 📥 입력 구성: 이전 노드들의 결과
-        if len(prev_ids) == 0:
-            input_data = {}
-        elif len(prev_ids) == 1:
-            input_data = results[prev_ids[0]]
-        else:
-            input_data = {pid: results[pid] for pid in prev_ids}
-
-        module_type = node["type"]
-        module_name = node["module"]
-        params = node.get("params", {})
-        evaluator_names = node.get("evaluators", [])
-
-        # ✅ BridgeAdapter는 별도 import 처리 (직접 지정된 경로)
-        if module_type == "bridge":
-            from importlib import import_module
-            bridge_module = import_module(f"adapters.bridge.{module_name}")
-            module = bridge_module
+    def release(node_id):
+        if remaining_consumers[node_id] == 0 and (not retain_results or (plan.targets and node_id not in plan.targets)):
+            results.pop(node_id, None)
+
+    def prepare(node_id):
+        plan_node = plan.nodes[node_id]
+
+        if node_id in inputs:
+            input_data = inputs[node_id]
         else:
-            # 📦 일반 모듈 로딩
-            module = load_module(module_type, module_name)
+            input_data = _collect_input(plan_node.input_ids, results)
+
+        for input_id in plan_node.input_ids:
+            remaining_consumers[input_id] -= 1
+            release(input_id)
+
+        cache_options = resolve_cache_options(cache_settings.get(node_id, cache), node_id)
+        execute = _aexecute_node if plan_node.is_async else _execute_node
+        return execute, (
+            plan_node,
+            input_data,
+            _node_params(plan_node, params.get(node_id)),
+            cache_options,
+            coalesce and plan_node.module_type in NODE_TYPES,
+        )
+
+    def complete(node_id, result):
+        output, status = result
+        if status is not None:
+            cache_status[node_id] = status
+
+        # 🔀 병합된 중복 노드에도 같은 결과 전달
+        for shared_id in (node_id, *plan.duplicates.get(node_id, ())):
+            results[shared_id] = output
+            if on_node_complete is not None:
+                on_node_complete(shared_id, output)
+            release(shared_id)
+
+    started = time.perf_counter()
+    timings = {} if timing and metadata is not None else None
+    _schedule(plan, prepare, complete, max_workers, worker_limits, cancel_event, timings)
+    total_seconds = time.perf_counter() - started
+    metrics.observe("gimbab_graph_seconds", total_seconds, mode="graph")
+
+    if timings is not None:
+        metadata["timing"] = _timing_report(plan, total_seconds, timings)
+
+    # 📊 캐시 hit / miss 요약
+    if metadata is not None and cache_status:
+        hits = sum(1 for status in cache_status.values() if status.startswith("hit"))
+        metadata["cache"] = {
+            "hits": hits,
+            "misses": len(cache_status) - hits,
+            "nodes": {node_id: cache_status[node_id] for node_id in plan.order if node_id in cache_status},
+        }
+
+    if not retain_results:
+        return {}
+
+    # 📤 전체(또는 targets) 결과 JSON 직렬화 변환 후 반환 (위상 정렬 순서 유지)
+    ordered = {node_id: results[node_id] for node_id in plan.targets or _result_order(plan)}
+    return to_serializable(ordered, arrays)
+
+
+def _check_inputs(plan: ExecutionPlan, inputs: Dict[str, Any]):
+    # 🚨 외부 입력은 선행 노드가 없는 노드에만 주입 가능
+    unknown_inputs = set(inputs) - set(plan.sources)
+    if unknown_inputs:
+        raise ValueError(f"❌ Inputs can only be given to source nodes: {sorted(unknown_inputs)}")
+
+# ------------------------------------------------------
+# 📦 배치 실행 엔진 (column-wise)
+# ------------------------------------------------------
+def _execute_node_batch(plan_node: PlanNode, column: List[Any], params: Dict[str, Any]) -> List[Tuple[bool, Any]]:
+    """
+    ✅ 노드 하나를 레코드 묶음 전체에 대해 실행 → [(성공 여부, 출력 또는 예외)] 반환
+
+    - 모듈에 run_batch(inputs=[...])가 있으면 한 번에 실행 (예: models.text → batched pipeline)
+    - 없거나 batch 실행이 실패하면 레코드별 run()으로 실행하여 오류를 해당 레코드에만 기록
+    """
+    module = plan_node.module
+
+    if hasattr(module, "run_batch") and len(column) > 0:
+        try:
+            outputs = module.run_batch(inputs=column, **params)
+            if len(outputs) == len(column):
+                return [(True, output) for output in outputs]
+        except Exception:
+            pass  # ↩️ 레코드별 실행으로 fallback
+
+    outcomes = []
+    for input_data in column:
+        try:
+            outcomes.append((True, module.run(input=input_data, **params)))
+        except Exception as e:
+            outcomes.append((False, e))
+    return outcomes
+
+
+async def _aexecute_node_batch(plan_node: PlanNode, column: List[Any], params: Dict[str, Any]) -> List[Tuple[bool, Any]]:
+    # ✅ 비동기 모듈: 레코드별 arun을 동시에 await (레코드별 오류 격리는 동기 버전과 동일)
+    outputs = await asyncio.gather(
+        *(plan_node.module.arun(input=input_data, **params) for input_data in column),
+        return_exceptions=True,
+    )
+    return [(not isinstance(output, BaseException), output) for output in outputs]
+
 
-        # ✅ 모델 모듈인 경우 domain 누락 시 기본값 보정
-        if module_type == "model":
-            domain = params.get("domain", "text")
-            params["domain"] = domain
+def _record_inputs(plan: ExecutionPlan, record: Any) -> Dict[str, Any]:
+    # 📌 레코드 → {source_node_id: 입력} 변환
+    # - dict이고 key가 모두 소스 노드 id이면 그대로 사용
+    # - 그 외 값은 유일한 소스 노드의 입력으로 사용
+    if isinstance(record, dict) and record and set(record) <= set(plan.sources):
+        return record
+    if len(plan.sources) != 1:
+        raise ValueError(
+            f"❌ Graph has {len(plan.sources)} source nodes; "
+            f"each record must be a dict keyed by source node id {list(plan.sources)}."
+        )
+    return {plan.sources[0]: record}
 
-        # ✅ evaluator 존재 시 래핑 적용
-        if evaluator_names:
-            module = apply_evaluators(module, evaluator_names)
 
-        # 🧠 모듈 실행
-        output = module.run(input=input_data, **params)
-        results[node_id] = output
+def execute_plan_batch(
+    plan: ExecutionPlan,
+    records: List[Any],
+    params: Optional[Dict[str, Dict[str, Any]]] = None,
+    max_workers: Optional[int] = None,
+    worker_limits: Optional[Dict[str, int]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    arrays: Optional[str] = None,
+    timing: bool = False,
+    targets: Optional[List[str]] = None,
+    dedupe: Optional[bool] = None,
+) -> List[Dict[str, Any]]:
+    """
+    ✅ 하나의 계획을 여러 입력 레코드에 대해 column-wise로 실행
+
+    - 각 노드는 레코드 묶음 전체를 한 번에 입력받음 (모듈의 run_batch 활용)
+    - 레코드별 오류 격리: 실패한 레코드는 이후 노드에서 제외되고 나머지는 계속 실행
+    - 반환: 레코드 순서대로
+      {"status": "success", "result": {node_id: 출력}} 또는
+      {"status": "error", "node": node_id, "message": ...}
+
+    📌 timing=True: execute_plan과 같은 형태로 metadata["timing"] 기록 (노드 시간은 레코드 묶음 전체 기준)
+    📌 targets: execute_plan과 동일 (조상 노드만 실행, 레코드 결과에는 targets 출력만 포함)
+    📌 dedupe: execute_plan과 동일 (중복 노드는 한 번만 실행, 결과는 모든 node id로 전달)
+    📌 결과 캐시는 배치 모드에서 사용하지 않음 (레코드 단위 실행은 /pipeline/graph/run)
+    """
+    params = params or {}
+    record_inputs = []
+    errors: Dict[int, Dict[str, Any]] = {}
+
+    # 📌 레코드 → 소스 입력 매핑은 원본 계획 기준 (가지치기로 빠진 소스의 입력은 무시)
+    pruned = _apply_targets(plan, targets, metadata)
+
+    for index, record in enumerate(records):
+        try:
+            mapped = _record_inputs(plan, record)
+            _check_inputs(plan, mapped)
+            record_inputs.append({node_id: value for node_id, value in mapped.items() if node_id in pruned.nodes})
+        except ValueError as e:
+            record_inputs.append({})
+            errors[index] = {"status": "error", "node": None, "message": str(e)}
+
+    plan = _apply_dedupe(pruned, dedupe, params, {}, metadata)
+    results: List[Dict[str, Any]] = [{} for _ in records]
+    alive_by_node: Dict[str, List[int]] = {}
+
+    # ✅ targets 지정 시 중간 출력 해제용: 아직 입력을 가져가지 않은 후속 노드 수
+    remaining_consumers = _consumer_counts(plan)
+
+    def prepare(node_id):
+        plan_node = plan.nodes[node_id]
+        alive = [i for i in range(len(records)) if i not in errors]
+        alive_by_node[node_id] = alive
+
+        column = []
+        for i in alive:
+            if node_id in record_inputs[i]:
+                column.append(record_inputs[i][node_id])
+            else:
+                column.append(_collect_input(plan_node.input_ids, results[i]))
+
+        for input_id in plan_node.input_ids:
+            remaining_consumers[input_id] -= 1
+            if plan.targets and remaining_consumers[input_id] == 0 and input_id not in plan.targets:
+                for i in alive:
+                    results[i].pop(input_id, None)
+
+        execute = _aexecute_node_batch if plan_node.is_async else _execute_node_batch
+        return execute, (plan_node, column, _node_params(plan_node, params.get(node_id)))
+
+    def complete(node_id, outcomes):
+        shared_ids = (node_id, *plan.duplicates.get(node_id, ()))
+        for i, (ok, value) in zip(alive_by_node.pop(node_id), outcomes):
+            if ok:
+                for shared_id in shared_ids:
+                    results[i][shared_id] = value
+            elif i not in errors:
+                errors[i] = {"status": "error", "node": node_id, "message": str(value)}
+
+    started = time.perf_counter()
+    timings = {} if timing and metadata is not None else None
+    _schedule(plan, prepare, complete, max_workers, worker_limits, cancel_event, timings)
+    total_seconds = time.perf_counter() - started
+    metrics.observe("gimbab_graph_seconds", total_seconds, mode="batch")
+
+    if timings is not None:
+        metadata["timing"] = _timing_report(plan, total_seconds, timings)
+
+    if metadata is not None:
+        metadata["batch"] = {
+            "records": len(records),
+            "succeeded": len(records) - len(errors),
+            "failed": len(errors),
+        }
+
+    # 📤 레코드 순서대로 결과 / 오류 반환
+    return [
+        errors[i] if i in errors else {
+            "status": "success",
+            "result": to_serializable({node_id: results[i][node_id] for node_id in plan.targets or _result_order(plan)}, arrays),
+        }
+        for i in range(len(records))
+    ]
+
+# ------------------------------------------------------
+# 📦 DAG 실행 엔진: 그래프 실행
+# ------------------------------------------------------
+def execute_graph(
+    nodes: List[Dict[str, Any]],
+    edges: List[Dict[str, str]],
+    max_workers: Optional[int] = None,
+    worker_limits: Optional[Dict[str, int]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    cache: Any = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    on_node_complete: Optional[Callable[[str, Any], None]] = None,
+    retain_results: bool = True,
+    arrays: Optional[str] = None,
+    timing: bool = False,
+    targets: Optional[List[str]] = None,
+    dedupe: Optional[bool] = None,
+    coalesce: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """
+    ✅ 정의된 노드/엣지 DAG를 기반으로 전체 파이프라인 실행
+
+    - 노드: 실행 단위 (모듈 정보, 입력, 파라미터 등 포함)
+    - 엣지: 노드 간 연결 관계
+    - 결과: 모든 노드의 실행 결과 dict (id → 출력), targets 지정 시 targets 노드만
+
+    처리 과정:
+    1. 그래프 형태 해시로 캐시된 ExecutionPlan 조회 (없으면 컴파일)
+    2. 요청의 노드별 params / cache 설정을 바인딩하여 execute_plan 실행
+
+    특이사항:
+    - 모델 실행 시 domain 보정
+    - bridge adapter는 별도 import 처리
+    - 다중 입력은 dict로 묶어서 전달
+    - evaluator 지정 시 래핑
+    """
+    plan = get_plan(nodes, edges)
 
-    # 📤 전체 결과 JSON 직렬화 변환 후 반환
-    return to_serializable(results)
\ No newline at end of file
+    return execute_plan(
+        plan,
+        params=spec_params(nodes),
+        max_workers=max_workers,
+        worker_limits=worker_limits,
+        cancel_event=cancel_event,
+        cache=cache,
+        cache_settings=spec_cache_settings(nodes),
+        metadata=metadata,
+        on_node_complete=on_node_complete,
+        retain_results=retain_results,
+        arrays=arrays,
+        timing=timing,
+        targets=targets,
+        dedupe=dedupe,
+        coalesce=coalesce,
+    )
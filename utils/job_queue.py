@@ -0,0 +1,566 @@
+"""
+📦 Job Queue: job_queue.py
+──────────────────────────────────────────────
+- 비동기 작업(job) 제출 API용 영속 로컬 큐 (sqlite, WAL) + 워커 스레드 풀
+- submit → job_id 즉시 반환, 워커가 우선순위 순으로 꺼내 실행기(run_pipeline_graph 등) 실행
+- 클라이언트는 get(job_id) 조회 또는 wait(job_id, timeout) long-poll로 상태 / 결과 확인
+  (이벤트 루프에서는 wait_async: 대기는 asyncio.sleep, 각 조회는 executor 스레드에서 짧은 읽기 전용 연결로 실행)
+- 우선순위: priority 큰 값 먼저, 같으면 먼저 제출된 job 먼저
+- deadline: 제출 후 N초 안에 끝나야 하는 job
+  → 시작 전에 지나면 실행하지 않고 expired, 실행 중 지나면 cancel_event로 중단 후 expired
+- 결과 TTL: 종료 후 ttl초가 지나면 job 기록 삭제 (조회 시 404)
+- 대기 job 수 상한(GIMBAB_JOB_MAX_QUEUED) 초과 시 JobRejected (HTTP 429, 부하 분산)
+- 여러 서버 프로세스(uvicorn --workers N / replica)가 같은 DB 파일을 공유해도 안전:
+  - claim은 조건부 UPDATE(status = 'queued')로 한 프로세스만 성공
+  - 실행 중 job은 owner(프로세스 id) + lease_until 기록, heartbeat 스레드가 lease 갱신
+  - lease가 만료된 running job(소유 프로세스 종료)만 queued로 복구 (attempts 증가)
+  - attempts가 GIMBAB_JOB_MAX_ATTEMPTS에 도달한 job은 failed (프로세스를 죽이는 job의 무한 재시도 방지)
+  - 다른 프로세스가 실행 중인 job의 취소는 cancel_requested 표시 → 소유 프로세스 heartbeat가 반영
+
+📌 사용 예시:
+queue = JobQueue(runners={"graph": run_pipeline_graph})
+queue.start()
+job = queue.submit("graph", payload, priority=5, deadline=600, ttl=3600)
+job = queue.wait(job["job_id"], timeout=30)
+
+📌 상태: queued → running → succeeded | failed | cancelled | expired
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.graph_executor import GraphCancelled
+from utils.metrics import metrics
+from utils.serialization import dumps
+
+# ------------------------------------------------------
+# ⚙️ 기본 설정 (환경 변수로 조정 가능)
+# ------------------------------------------------------
+DEFAULT_DB_PATH = os.getenv(
+    "GIMBAB_JOB_DB", os.path.join(os.path.expanduser("~"), ".cache", "gimbab", "jobs.sqlite3")
+)
+DEFAULT_WORKERS = int(os.getenv("GIMBAB_JOB_WORKERS", "2"))
+DEFAULT_MAX_QUEUED = int(os.getenv("GIMBAB_JOB_MAX_QUEUED", "1000"))
+DEFAULT_RESULT_TTL = float(os.getenv("GIMBAB_JOB_RESULT_TTL", "3600"))
+MAX_WAIT_SECONDS = float(os.getenv("GIMBAB_JOB_MAX_WAIT", "60"))
+LEASE_SECONDS = float(os.getenv("GIMBAB_JOB_LEASE", "30"))
+MAX_ATTEMPTS = int(os.getenv("GIMBAB_JOB_MAX_ATTEMPTS", "3"))
+
+# ✅ 만료 job 정리 주기 (초)
+PURGE_INTERVAL = 30.0
+
+# ✅ 다른 프로세스가 제출 / 종료한 job 확인 주기 (초)
+POLL_INTERVAL = 1.0
+
+# ✅ wait_async 상태 조회 주기 (초)
+ASYNC_POLL_INTERVAL = 0.25
+
+# ✅ wait_async 읽기 전용 연결의 sqlite busy timeout (초, 쓰기 lock 대기 상한)
+READ_TIMEOUT = 2.0
+
+TERMINAL_STATUSES = ("succeeded", "failed", "cancelled", "expired")
+
+
+class JobRejected(Exception):
+    """대기 중인 job 수가 상한에 도달해 새 job을 받을 수 없음 (HTTP 429)"""
+
+
+class JobNotFound(KeyError):
+    """존재하지 않거나 결과 TTL이 지나 삭제된 job (HTTP 404)"""
+
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS jobs ("
+    "job_id TEXT PRIMARY KEY, kind TEXT NOT NULL, payload TEXT NOT NULL, "
+    "priority INTEGER NOT NULL DEFAULT 0, status TEXT NOT NULL, "
+    "created_at REAL NOT NULL, started_at REAL, finished_at REAL, "
+    "deadline_at REAL, result_ttl REAL, expires_at REAL, attempts INTEGER NOT NULL DEFAULT 0, "
+    "result BLOB, error TEXT, meta TEXT, "
+    "owner TEXT, lease_until REAL, cancel_requested INTEGER NOT NULL DEFAULT 0)",
+    "CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, priority DESC, created_at)",
+    "CREATE INDEX IF NOT EXISTS jobs_expiry ON jobs (expires_at)",
+)
+
+# ✅ 이전 스키마 DB에 추가할 컬럼 (lease / 취소 요청)
+_ADDED_COLUMNS = (
+    ("owner", "TEXT"),
+    ("lease_until", "REAL"),
+    ("cancel_requested", "INTEGER NOT NULL DEFAULT 0"),
+)
+
+_COLUMNS = (
+    "job_id", "kind", "priority", "status", "created_at", "started_at", "finished_at",
+    "deadline_at", "expires_at", "attempts", "error", "meta", "result",
+)
+
+# ------------------------------------------------------
+# 📦 JobQueue
+# ------------------------------------------------------
+class JobQueue:
+    """
+    ✅ sqlite 영속 큐 + 워커 스레드 풀
+
+    - runners: job 종류 → fn(payload, cancel_event, metadata) (예: {"graph": run_pipeline_graph})
+    - submit / get / wait / cancel / stats
+    - start(): DB 열기 + lease 만료 job 복구 + 워커 / heartbeat 시작 (submit만 하고 start하지 않으면 실행되지 않음)
+    - owner: 이 인스턴스 식별자 (호스트:pid:임의값) → running job의 소유자
+    """
+
+    def __init__(
+        self,
+        runners: Optional[Dict[str, Callable]] = None,
+        db_path: str = DEFAULT_DB_PATH,
+        workers: int = DEFAULT_WORKERS,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+        result_ttl: float = DEFAULT_RESULT_TTL,
+        lease_seconds: float = LEASE_SECONDS,
+        max_attempts: int = MAX_ATTEMPTS,
+    ):
+        self.runners = dict(runners or {})
+        self.db_path = db_path
+        self.workers = max(1, workers)
+        self.max_queued = max(1, max_queued)
+        self.result_ttl = result_ttl
+        self.lease_seconds = max(1.0, lease_seconds)
+        self.max_attempts = max(1, max_attempts)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._lock = threading.Lock()
+        self._readers = threading.local()
+        self._job_ready = threading.Condition(self._lock)
+        self._job_done = threading.Condition(self._lock)
+        self._db: Optional[sqlite3.Connection] = None
+        self._threads: List[threading.Thread] = []
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._cancel_reasons: Dict[str, str] = {}
+        self._stopping = False
+        self._last_purge = 0.0
+
+    # --------------------------------------------------
+    # 📌 DB
+    # --------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        # ✅ 첫 사용 시 연결 (호출자가 self._lock 보유)
+        if self._db is None:
+            if self.db_path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            # ✅ 다른 프로세스의 쓰기 lock은 대기 (기본 5초 → lease 주기보다 길게)
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False, timeout=self.lease_seconds)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA:
+                self._db.execute(statement)
+            existing = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+            for name, definition in _ADDED_COLUMNS:
+                if name not in existing:
+                    self._db.execute(f"ALTER TABLE jobs ADD COLUMN {name} {definition}")
+            self._db.commit()
+        return self._db
+
+    def _reader(self) -> sqlite3.Connection:
+        # ✅ 스레드별 읽기 전용 연결 (self._lock 없이 조회, WAL이라 쓰기와 동시에 읽기 가능)
+        db = getattr(self._readers, "db", None)
+        if db is None:
+            with self._lock:
+                self._connect()  # 📌 스키마 / 파일 생성 보장 (스레드당 한 번)
+            uri = f"file:{os.path.abspath(self.db_path)}?mode=ro"
+            db = sqlite3.connect(uri, uri=True, check_same_thread=False, timeout=READ_TIMEOUT)
+            self._readers.db = db
+        return db
+
+    def _row(self, job_id: str, db: Optional[sqlite3.Connection] = None) -> Optional[Dict[str, Any]]:
+        row = (db or self._connect()).execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        return dict(zip(_COLUMNS, row)) if row else None
+
+    @staticmethod
+    def _view(row: Dict[str, Any], include_result: bool = True) -> Dict[str, Any]:
+        job = {key: row[key] for key in _COLUMNS if key not in ("meta", "result")}
+        job["meta"] = json.loads(row["meta"]) if row["meta"] else None
+        if include_result and row["status"] == "succeeded" and row["result"] is not None:
+            job["result"] = json.loads(row["result"])
+        return job
+
+    # --------------------------------------------------
+    # 📌 수명 주기
+    # --------------------------------------------------
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            # ✅ 소유 프로세스가 사라진(lease 만료) job만 복구 → 다른 프로세스가 실행 중인 job은 그대로
+            self._recover_locked()
+            self._stopping = False
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"gimbab-job-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            heartbeat = threading.Thread(target=self._heartbeat, name="gimbab-job-heartbeat", daemon=True)
+            heartbeat.start()
+            self._threads.append(heartbeat)
+
+    def shutdown(self, timeout: float = 5.0):
+        # ✅ 새 job 투입 중단 + 실행 중 job 중단 (중단된 job은 queued로 되돌려 다음 시작 시 다시 실행)
+        with self._lock:
+            self._stopping = True
+            for job_id, event in self._cancel_events.items():
+                self._cancel_reasons.setdefault(job_id, "shutdown")
+                event.set()
+            self._job_ready.notify_all()
+            self._job_done.notify_all()
+            threads, self._threads = self._threads, []
+
+        for thread in threads:
+            thread.join(timeout)
+
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    # --------------------------------------------------
+    # 📌 제출 / 조회
+    # --------------------------------------------------
+    def submit(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        priority: int = 0,
+        deadline: Optional[float] = None,
+        ttl: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        ✅ job 등록 후 job 정보 반환
+
+        - deadline: 제출 시점부터 완료까지 허용 시간 (초, None = 제한 없음)
+        - ttl: 종료 후 결과 보관 시간 (초, None = 기본값, 0 이하 = 만료 없음)
+        """
+        # 🚨 예외처리: 등록되지 않은 job 종류 / 대기열 상한
+        if kind not in self.runners:
+            raise ValueError(f"❌ Unknown job kind: {kind} (expected one of {sorted(self.runners)})")
+
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        deadline_at = now + float(deadline) if deadline else None
+        result_ttl = self.result_ttl if ttl is None else float(ttl)
+
+        with self._lock:
+            db = self._connect()
+            queued = db.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+            if queued >= self.max_queued:
+                metrics.inc("gimbab_jobs_rejected_total")
+                raise JobRejected(f"❌ Job queue is full (max_queued={self.max_queued}).")
+
+            db.execute(
+                "INSERT INTO jobs (job_id, kind, payload, priority, status, created_at, deadline_at, result_ttl) "
+                "VALUES (?, ?, ?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, json.dumps(payload, ensure_ascii=False), int(priority), now, deadline_at, result_ttl),
+            )
+            db.commit()
+            job = self._view(self._row(job_id))
+            self._job_ready.notify()
+
+        metrics.inc("gimbab_jobs_submitted_total", kind=kind)
+        return job
+
+    def get(self, job_id: str, include_result: bool = True) -> Dict[str, Any]:
+        with self._lock:
+            row = self._row(job_id)
+        if row is None or (row["expires_at"] is not None and row["expires_at"] <= time.time()):
+            raise JobNotFound(job_id)
+        return self._view(row, include_result)
+
+    def _read(self, job_id: str, include_result: bool) -> Dict[str, Any]:
+        # ✅ get()과 같은 결과, 워커 / heartbeat가 쓰는 self._lock을 기다리지 않음 (executor 스레드에서 호출)
+        if self.db_path == ":memory:":
+            return self.get(job_id, include_result)
+        row = self._row(job_id, self._reader())
+        if row is None or (row["expires_at"] is not None and row["expires_at"] <= time.time()):
+            raise JobNotFound(job_id)
+        return self._view(row, include_result)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None, include_result: bool = True) -> Dict[str, Any]:
+        # ✅ long-poll: 종료 상태가 되거나 timeout(최대 GIMBAB_JOB_MAX_WAIT)까지 대기 후 현재 상태 반환
+        timeout = min(max(0.0, timeout or 0.0), MAX_WAIT_SECONDS)
+        end = time.monotonic() + timeout
+
+        with self._lock:
+            while True:
+                row = self._row(job_id)
+                if row is None or row["status"] in TERMINAL_STATUSES or self._stopping:
+                    break
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    break
+                # ✅ 다른 프로세스가 실행하는 job도 있으므로 주기적으로 다시 조회
+                self._job_done.wait(min(remaining, POLL_INTERVAL))
+
+        if row is None or (row["expires_at"] is not None and row["expires_at"] <= time.time()):
+            raise JobNotFound(job_id)
+        return self._view(row, include_result)
+
+    async def wait_async(self, job_id: str, timeout: Optional[float] = None, include_result: bool = True) -> Dict[str, Any]:
+        # ✅ wait()의 비동기 버전: 대기 중에는 executor 스레드를 점유하지 않음
+        # - 각 조회(상태만) / 마지막 결과 조회(json 파싱 포함)는 to_thread → 이벤트 루프는 DB lock을 기다리지 않음
+        timeout = min(max(0.0, timeout or 0.0), MAX_WAIT_SECONDS)
+        end = time.monotonic() + timeout
+
+        while True:
+            job = await asyncio.to_thread(self._read, job_id, False)
+            remaining = end - time.monotonic()
+            if job["status"] in TERMINAL_STATUSES or self._stopping or remaining <= 0:
+                break
+            await asyncio.sleep(min(ASYNC_POLL_INTERVAL, remaining))
+
+        return await asyncio.to_thread(self._read, job_id, True) if include_result else job
+
+    def cancel(self, job_id: str) -> Dict[str, Any]:
+        """
+        ✅ queued → 즉시 cancelled
+        ✅ running → cancel_event set (실행기가 다음 노드 투입 전 중단)
+           다른 프로세스 소유 job은 cancel_requested 표시 → 소유 프로세스 heartbeat가 cancel_event set
+        """
+        with self._lock:
+            row = self._row(job_id)
+            if row is None:
+                raise JobNotFound(job_id)
+
+            if row["status"] == "queued":
+                self._finish_locked(
+                    job_id, "cancelled", error="❌ Job cancelled before start.", ttl=row["result_ttl"], where_status="queued"
+                )
+            elif row["status"] == "running" and job_id in self._cancel_events:
+                self._cancel_reasons.setdefault(job_id, "cancelled")
+                self._cancel_events[job_id].set()
+            elif row["status"] == "running":
+                db = self._connect()
+                db.execute("UPDATE jobs SET cancel_requested = 1 WHERE job_id = ? AND status = 'running'", (job_id,))
+                db.commit()
+            row = self._row(job_id)
+        return self._view(row, include_result=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._connect().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            return {
+                **{status: counts.get(status, 0) for status in ("queued", "running", *TERMINAL_STATUSES)},
+                "workers": self.workers,
+                "max_queued": self.max_queued,
+                "result_ttl": self.result_ttl,
+                "lease_seconds": self.lease_seconds,
+                "max_attempts": self.max_attempts,
+                "owner": self.owner,
+                "db_path": self.db_path,
+            }
+
+    # --------------------------------------------------
+    # 📦 워커
+    # --------------------------------------------------
+    def _finish_locked(self, job_id: str, status: str, result: Optional[bytes] = None,
+                       error: Optional[str] = None, meta: Optional[dict] = None, ttl: Optional[float] = None,
+                       where_status: Optional[str] = None, where_owner: Optional[str] = None) -> bool:
+        # ✅ 종료 상태 기록 (where_*: 다른 프로세스가 먼저 상태를 바꿨으면 기록하지 않음) → 기록 여부
+        now = time.time()
+        expires_at = now + ttl if ttl and ttl > 0 else None
+        query = (
+            "UPDATE jobs SET status = ?, finished_at = ?, expires_at = ?, result = ?, error = ?, meta = ?, "
+            "owner = NULL, lease_until = NULL WHERE job_id = ?"
+        )
+        args = [status, now, expires_at, result, error, json.dumps(meta, default=str) if meta else None, job_id]
+        if where_status is not None:
+            query += " AND status = ?"
+            args.append(where_status)
+        if where_owner is not None:
+            query += " AND owner = ?"
+            args.append(where_owner)
+
+        db = self._connect()
+        updated = db.execute(query, args).rowcount
+        db.commit()
+        self._job_done.notify_all()
+        return updated > 0
+
+    def _recover_locked(self):
+        """
+        ✅ lease가 만료된 running job 정리 (소유 프로세스가 종료 / 응답 없음)
+        - attempts < max_attempts → queued로 복구
+        - attempts >= max_attempts → failed (실행할 때마다 프로세스를 죽이는 job)
+        """
+        now = time.time()
+        db = self._connect()
+        rows = db.execute(
+            "SELECT job_id, kind, attempts, result_ttl FROM jobs "
+            "WHERE status = 'running' AND (lease_until IS NULL OR lease_until < ?)",
+            (now,),
+        ).fetchall()
+
+        recovered = 0
+        for job_id, kind, attempts, result_ttl in rows:
+            if attempts >= self.max_attempts:
+                error = f"❌ Job abandoned after {attempts} attempts (worker process exited while running it)."
+                if self._finish_locked(job_id, "failed", error=error, ttl=result_ttl, where_status="running"):
+                    metrics.inc("gimbab_jobs_finished_total", status="failed", kind=kind)
+                continue
+            recovered += db.execute(
+                "UPDATE jobs SET status = 'queued', started_at = NULL, owner = NULL, lease_until = NULL "
+                "WHERE job_id = ? AND status = 'running' AND (lease_until IS NULL OR lease_until < ?)",
+                (job_id, now),
+            ).rowcount
+        db.commit()
+
+        if recovered:
+            metrics.inc("gimbab_jobs_recovered_total", recovered)
+            self._job_ready.notify_all()
+
+    def _purge_locked(self):
+        # ✅ 결과 TTL이 지난 job 삭제
+        now = time.time()
+        if now - self._last_purge < PURGE_INTERVAL:
+            return
+        self._last_purge = now
+        db = self._connect()
+        purged = db.execute("DELETE FROM jobs WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)).rowcount
+        db.commit()
+        if purged:
+            metrics.inc("gimbab_jobs_purged_total", purged)
+
+    def _claim_locked(self) -> Optional[Dict[str, Any]]:
+        """
+        ✅ 우선순위 순으로 queued job 1개 → running (시작 전 deadline이 지난 job은 expired 처리)
+        - 조건부 UPDATE(status = 'queued')가 성공한 프로세스만 실행 (다른 프로세스가 먼저 가져가면 다음 후보)
+        """
+        db = self._connect()
+        while True:
+            row = db.execute(
+                "SELECT job_id, kind, payload, deadline_at, result_ttl FROM jobs WHERE status = 'queued' "
+                "ORDER BY priority DESC, created_at ASC LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+
+            job_id, kind, payload, deadline_at, result_ttl = row
+            if deadline_at is not None and deadline_at <= time.time():
+                if self._finish_locked(job_id, "expired", error="❌ Job deadline passed before start.",
+                                       ttl=result_ttl, where_status="queued"):
+                    metrics.inc("gimbab_jobs_finished_total", status="expired", kind=kind)
+                continue
+
+            now = time.time()
+            claimed = db.execute(
+                "UPDATE jobs SET status = 'running', started_at = ?, attempts = attempts + 1, owner = ?, "
+                "lease_until = ?, cancel_requested = 0 WHERE job_id = ? AND status = 'queued'",
+                (now, self.owner, now + self.lease_seconds, job_id),
+            ).rowcount
+            db.commit()
+            if not claimed:
+                continue
+            self._cancel_events[job_id] = threading.Event()
+            return {
+                "job_id": job_id,
+                "kind": kind,
+                "payload": json.loads(payload),
+                "deadline_at": deadline_at,
+                "result_ttl": result_ttl,
+            }
+
+    def _work(self):
+        while True:
+            with self._lock:
+                job = None
+                while not self._stopping:
+                    job = self._claim_locked()
+                    if job is not None:
+                        break
+                    # ✅ 다른 프로세스가 제출한 job도 가져가도록 주기적으로 다시 확인
+                    self._job_ready.wait(POLL_INTERVAL)
+                if job is None:
+                    return
+                cancel_event = self._cancel_events[job["job_id"]]
+
+            self._run(job, cancel_event)
+
+    def _heartbeat(self):
+        # 🔁 실행 중 job lease 갱신 + 다른 프로세스의 취소 요청 반영 + lease 만료 job 복구 + TTL 정리
+        interval = self.lease_seconds / 3
+        while True:
+            with self._lock:
+                if self._stopping:
+                    return
+                db = self._connect()
+                running = list(self._cancel_events)
+                if running:
+                    marks = ", ".join("?" for _ in running)
+                    db.execute(
+                        f"UPDATE jobs SET lease_until = ? WHERE owner = ? AND status = 'running' AND job_id IN ({marks})",
+                        (time.time() + self.lease_seconds, self.owner, *running),
+                    )
+                    db.commit()
+                    requested = db.execute(
+                        f"SELECT job_id FROM jobs WHERE cancel_requested = 1 AND owner = ? AND job_id IN ({marks})",
+                        (self.owner, *running),
+                    ).fetchall()
+                    for (job_id,) in requested:
+                        self._cancel_reasons.setdefault(job_id, "cancelled")
+                        self._cancel_events[job_id].set()
+
+                self._recover_locked()
+                self._purge_locked()
+                self._job_done.wait(interval)
+
+    def _run(self, job: Dict[str, Any], cancel_event: threading.Event):
+        job_id = job["job_id"]
+        metadata: Dict[str, Any] = {}
+        timer = None
+
+        # ✅ 실행 중 deadline 도달 → cancel_event set
+        if job["deadline_at"] is not None:
+            def expire():
+                with self._lock:
+                    self._cancel_reasons.setdefault(job_id, "expired")
+                cancel_event.set()
+
+            timer = threading.Timer(max(0.0, job["deadline_at"] - time.time()), expire)
+            timer.daemon = True
+            timer.start()
+
+        start = time.perf_counter()
+        status, result, error = "succeeded", None, None
+        try:
+            result = dumps(self.runners[job["kind"]](job["payload"], cancel_event, metadata))
+        except GraphCancelled as e:
+            status, error = "cancelled", str(e)
+        except Exception as e:
+            status, error = "failed", str(e)
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+        with self._lock:
+            reason = self._cancel_reasons.pop(job_id, None)
+            self._cancel_events.pop(job_id, None)
+            if status == "cancelled" and reason == "expired":
+                status, error = "expired", "❌ Job deadline exceeded while running."
+
+            # ✅ 종료 중 중단된 job → 다른 프로세스 / 다음 시작 시 다시 실행되도록 queued로 되돌림 (시도 횟수 제외)
+            if status == "cancelled" and reason == "shutdown":
+                db = self._connect()
+                db.execute(
+                    "UPDATE jobs SET status = 'queued', started_at = NULL, owner = NULL, lease_until = NULL, "
+                    "attempts = MAX(0, attempts - 1) WHERE job_id = ? AND owner = ?",
+                    (job_id, self.owner),
+                )
+                db.commit()
+                self._job_ready.notify()
+            else:
+                # ⚠️ lease를 잃은 사이 다른 프로세스가 다시 가져간 job은 덮어쓰지 않음
+                self._finish_locked(job_id, status, result, error, metadata, job["result_ttl"], where_owner=self.owner)
+
+        metrics.inc("gimbab_jobs_finished_total", status=status, kind=job["kind"])
+        metrics.observe("gimbab_job_seconds", time.perf_counter() - start, kind=job["kind"])
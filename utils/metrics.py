@@ -0,0 +1,295 @@
+"""
+📦 Metrics: metrics.py
+──────────────────────────────────────────────
+- 그래프 실행기 / 실행 풀 / 모델 registry / 모델 실행기가 공유하는 항상-켜짐 계측
+- counter / gauge / histogram 을 label 조합별로 보관 (프로세스 메모리, lock 1개)
+- render_prometheus(): Prometheus text exposition 형식 (GET /metrics)
+- 메모리: 프로세스 RSS (psutil, 미설치 시 /proc/self/statm), torch 메모리 (CUDA 할당량, CPU 전용이면 RSS + device label)
+
+📌 사용 예시:
+from utils.metrics import metrics
+metrics.observe("gimbab_node_seconds", 0.12, type="model", module="hf_pipeline_runner")
+with metrics.timer("gimbab_model_inference_seconds", task="ner"):
+    ...
+"""
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import psutil
+except ImportError:  # psutil 미설치 시 RSS 측정 생략
+    psutil = None
+
+# ------------------------------------------------------
+# ⚙️ 기본 설정 (환경 변수로 조정 가능)
+# - GIMBAB_METRICS=0: 계측 비활성 (기록 호출이 바로 반환)
+# - GIMBAB_METRICS_TOKENS=0: 토큰 수 집계 비활성
+#   (실행기가 이미 만든 encoded 입력 길이 기준, 추가 토큰화 없음 → 단계 분리 경로 / zero-shot fast 엔진에서만 기록)
+# ------------------------------------------------------
+METRICS_ENABLED = os.getenv("GIMBAB_METRICS", "1") == "1"
+TOKEN_COUNTS_ENABLED = os.getenv("GIMBAB_METRICS_TOKENS", "1") == "1"
+
+# 📊 지연 시간 히스토그램 구간 (초, 상한 기준)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# 📊 토큰 수 히스토그램 구간
+TOKEN_BUCKETS = (8, 16, 32, 64, 128, 256, 512, 1024, 2048)
+
+# 📝 Prometheus HELP 문구
+METRIC_HELP = {
+    "gimbab_node_seconds": "Node execution time (monotonic clock).",
+    "gimbab_node_queue_wait_seconds": "Time a ready node waited for a worker thread.",
+    "gimbab_node_errors_total": "Node executions that raised.",
+    "gimbab_node_rss_delta_bytes": "Process RSS change across the last node execution.",
+    "gimbab_node_torch_delta_bytes": "torch memory change across the last node execution (device=cuda: CUDA allocation, device=cpu: process RSS).",
+    "gimbab_graph_seconds": "Whole graph execution time.",
+    "gimbab_graph_queue_wait_seconds": "Time a graph waited in the execution pool before starting.",
+    "gimbab_model_load_seconds": "Model (pipeline) load time.",
+    "gimbab_model_inference_seconds": "Model forward time, excluding load.",
+    "gimbab_model_tokens": "Tokens per model input (encoded inputs).",
+    "gimbab_model_tokens_total": "Total model input tokens (encoded inputs).",
+    "gimbab_process_rss_bytes": "Resident set size of the server process.",
+    "gimbab_torch_allocated_bytes": "torch CUDA memory currently allocated (CUDA only; CPU tensors are part of gimbab_process_rss_bytes).",
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# ------------------------------------------------------
+# 📌 메모리 측정 유틸
+# ------------------------------------------------------
+_process = psutil.Process() if psutil is not None else None
+
+def rss_bytes() -> Optional[int]:
+    # ✅ 현재 프로세스 RSS (psutil 미설치 시 /proc/self/statm, 둘 다 불가하면 None)
+    if _process is not None:
+        try:
+            return _process.memory_info().rss
+        except Exception:
+            return None
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+def torch_allocated_bytes() -> Optional[int]:
+    # ✅ torch가 이미 로딩되어 있고 CUDA 사용 중일 때만 측정 (여기서 torch를 import하지 않음, CUDA 전용)
+    torch = sys.modules.get("torch")
+    if torch is None:
+        return None
+    try:
+        if torch.cuda.is_available() and torch.cuda.is_initialized():
+            return int(torch.cuda.memory_allocated())
+    except Exception:
+        pass
+    return None
+
+def torch_memory() -> Optional[Tuple[int, str]]:
+    """
+    ✅ torch 메모리 사용량 → (bytes, device)
+
+    - CUDA 사용 중: (CUDA 할당량, "cuda")
+    - CPU 전용(torch 로딩됨, CUDA 미사용): (프로세스 RSS, "cpu") → CPU 텐서는 프로세스 힙에 있음
+    - torch 미로딩 / 측정 불가: None
+    """
+    if sys.modules.get("torch") is None:
+        return None
+    allocated = torch_allocated_bytes()
+    if allocated is not None:
+        return allocated, "cuda"
+    rss = rss_bytes()
+    return (rss, "cpu") if rss is not None else None
+
+# ------------------------------------------------------
+# 📦 Histogram
+# ------------------------------------------------------
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+# ------------------------------------------------------
+# 📦 MetricsRegistry
+# ------------------------------------------------------
+class MetricsRegistry:
+    """
+    ✅ 프로세스 내 지표 저장소
+
+    - inc(name, value, **labels): counter 증가
+    - set(name, value, **labels): gauge 설정
+    - observe(name, value, buckets, **labels): histogram 기록
+    - timer(name, **labels): with 블록 실행 시간을 histogram에 기록
+    - snapshot() / render_prometheus(): 조회
+    """
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+
+    @staticmethod
+    def _key(labels: Dict[str, object]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        if not self.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, value: float, buckets: Tuple[float, ...] = LATENCY_BUCKETS, **labels):
+        if not self.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        # 📊 JSON 조회용: {name: {"label=value,...": 값 또는 {count, sum, avg}}}
+        def label_text(key: LabelKey) -> str:
+            return ",".join(f"{k}={v}" for k, v in key)
+
+        with self._lock:
+            report = {}
+            for name, series in {**self._counters, **self._gauges}.items():
+                report[name] = {label_text(k): v for k, v in series.items()}
+            for name, series in self._histograms.items():
+                report[name] = {
+                    label_text(k): {"count": h.count, "sum": h.sum, "avg": h.sum / (h.count or 1)}
+                    for k, h in series.items()
+                }
+            return report
+
+    def render_prometheus(self) -> str:
+        # 📤 Prometheus text exposition format (0.0.4)
+        self._refresh_process_gauges()
+
+        def fmt_labels(key: Iterable[Tuple[str, str]]) -> str:
+            pairs = [f'{k}="{_escape(v)}"' for k, v in key]
+            return "{" + ",".join(pairs) + "}" if pairs else ""
+
+        lines: List[str] = []
+        with self._lock:
+            for kind, store in (("counter", self._counters), ("gauge", self._gauges)):
+                for name in sorted(store):
+                    lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+                    lines.append(f"# TYPE {name} {kind}")
+                    for key, value in store[name].items():
+                        lines.append(f"{name}{fmt_labels(key)} {_number(value)}")
+
+            for name in sorted(self._histograms):
+                lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, h in self._histograms[name].items():
+                    cumulative = 0
+                    for bound, count in zip(h.buckets + (float("inf"),), h.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else _number(bound)
+                        lines.append(f"{name}_bucket{fmt_labels(key + (('le', le),))} {cumulative}")
+                    lines.append(f"{name}_sum{fmt_labels(key)} {_number(h.sum)}")
+                    lines.append(f"{name}_count{fmt_labels(key)} {h.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def _refresh_process_gauges(self):
+        rss = rss_bytes()
+        if rss is not None:
+            self.set("gimbab_process_rss_bytes", rss)
+        allocated = torch_allocated_bytes()
+        if allocated is not None:
+            self.set("gimbab_torch_allocated_bytes", allocated)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _number(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+# ------------------------------------------------------
+# 📌 토큰 수 집계 (실행기가 만든 encoded 입력 길이, 추가 토큰화 없음)
+# - track_inference 범위의 (task, model) label을 context 변수로 전달
+# ------------------------------------------------------
+_inference_labels: ContextVar[Optional[Dict[str, str]]] = ContextVar("gimbab_inference_labels", default=None)
+
+def record_token_counts(lengths: Iterable[int]):
+    """
+    ✅ 입력별 토큰 수를 현재 track_inference의 (task, model) label로 histogram에 기록
+    - 토큰화 캐시(models.text.tokenization) / zero-shot 엔진이 encoded 입력을 만든(또는 캐시에서 꺼낸) 직후 호출
+    - track_inference 밖(comparator 캐시 채우기 등)에서는 기록하지 않음
+    """
+    labels = _inference_labels.get()
+    if labels is None or not (metrics.enabled and TOKEN_COUNTS_ENABLED):
+        return
+
+    for length in lengths:
+        metrics.observe("gimbab_model_tokens", length, TOKEN_BUCKETS, **labels)
+        metrics.inc("gimbab_model_tokens_total", length, **labels)
+
+@contextmanager
+def track_inference(pipe, texts, task: str, model_name: Optional[str] = None, backend: str = "torch-fp32"):
+    """
+    ✅ 모델 실행기용: with 블록(forward)의 실행 시간 + 입력 토큰 수 기록
+    - 토큰 수는 블록 안에서 만들어진 encoded 입력 기준 (record_token_counts)
+    - 모델 로딩 시간은 registry가 gimbab_model_load_seconds로 별도 기록
+    """
+    model = model_name or "default"
+    token = _inference_labels.set({"task": task, "model": model})
+    try:
+        with metrics.timer("gimbab_model_inference_seconds", task=task, model=model, backend=backend):
+            yield
+    finally:
+        _inference_labels.reset(token)
+
+
+# ✅ 프로세스 공용 지표 저장소
+metrics = MetricsRegistry()
@@ -0,0 +1,512 @@
+"""
+📦 Execution Plan Compiler: plan_compiler.py
+──────────────────────────────────────────────
+- 검증된 {"nodes", "edges"} 스펙을 불변 실행 계획(ExecutionPlan)으로 컴파일
+- 모듈 import / evaluator 래핑 / 위상 정렬 / 입력 연결 테이블을 미리 계산
+- 계획은 그래프 "형태"(노드 id·type·module·evaluators + 엣지)의 해시로 캐싱
+  → params(입력 텍스트 등)만 다른 요청은 같은 계획을 재사용
+- 등록형 계획: register_plan()으로 한 번 등록 후 plan_id로 반복 실행
+- 대상 출력 가지치기: prune_plan()으로 targets의 조상 노드만 남긴 부분 계획 생성
+- 공통 부분식 제거: dedupe_plan()으로 (type, module, params, 상위 노드)가 같은 노드를 한 번만 실행
+
+📌 사용 예시:
+plan = get_plan(nodes, edges)
+results = execute_plan(plan, params=spec_params(nodes))   # utils.graph_executor
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import dataclass, field, replace
+from importlib import import_module
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from utils.async_runtime import has_arun
+from utils.dynamic_loader import load_module
+from utils.evaluator_runner import apply_evaluators
+
+# ------------------------------------------------------
+# ⚙️ 계획 캐시 크기 (형태 해시 기준 LRU)
+# ------------------------------------------------------
+DEFAULT_PLAN_CACHE_SIZE = int(os.getenv("GIMBAB_PLAN_CACHE_SIZE", "256"))
+
+# ✅ 등록형 계획 최대 개수 (초과 시 PlanLimitReached → 해제 후 다시 등록)
+MAX_REGISTERED_PLANS = int(os.getenv("GIMBAB_MAX_REGISTERED_PLANS", "1024"))
+
+# ✅ 중복 병합 대상 노드 유형 (부수 효과가 없는 변환만, output / input 등은 각각 실행)
+DEDUPE_NODE_TYPES = ("model", "bridge")
+
+# ------------------------------------------------------
+# 📦 DAG 유틸리티: 위상 정렬
+# ------------------------------------------------------
+def topological_sort(nodes: List[Dict], edges: List[Dict]) -> List[str]:
+    """
+    ✅ DAG 형태의 노드/엣지 정의로부터 실행 순서를 정렬
+
+    - 노드: 각 실행 유닛 (id 포함)
+    - 엣지: "from" → "to" 구조
+    - 반환값: 실행 가능한 순서대로 정렬된 노드 id 리스트
+
+    🚨 순환 참조가 존재할 경우 예외 발생
+    """
+    graph = defaultdict(list)
+    indegree = defaultdict(int)
+
+    # 🔄 그래프 구조 및 진입 차수 계산
+    for edge in edges:
+        graph[edge["from"]].append(edge["to"])
+        indegree[edge["to"]] += 1
+
+    # ✅ 진입 차수가 0인 노드부터 큐에 삽입
+    queue = deque([node["id"] for node in nodes if indegree[node["id"]] == 0])
+    result = []
+
+    # 🔁 위상 정렬 수행 (Kahn's Algorithm)
+    while queue:
+        current = queue.popleft()
+        result.append(current)
+
+        for neighbor in graph[current]:
+            indegree[neighbor] -= 1
+            if indegree[neighbor] == 0:
+                queue.append(neighbor)
+
+    # 🚨 순환 참조 감지
+    if len(result) != len(nodes):
+        raise ValueError("Cycle detected in DAG.")
+
+    return result
+
+# ------------------------------------------------------
+# 📦 실행 계획 자료구조
+# ------------------------------------------------------
+@dataclass(frozen=True)
+class PlanNode:
+    """
+    ✅ 컴파일된 노드 1개
+
+    - module: import + evaluator 래핑이 끝난 실행 객체 (run 메서드 보유)
+    - input_ids: 입력을 받을 선행 노드 id (엣지 순서)
+    - consumers: 이 노드의 출력을 받는 후속 노드 id
+    - is_async: 모듈(evaluator 래핑 포함)이 async def arun을 가짐 → 백그라운드 이벤트 루프에서 실행
+    """
+    node_id: str
+    module_type: str
+    module_name: str
+    module: Any
+    evaluators: Tuple[str, ...]
+    input_ids: Tuple[str, ...]
+    consumers: Tuple[str, ...]
+    is_async: bool = False
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """
+    ✅ 불변 실행 계획
+
+    - plan_hash: 그래프 형태 해시 (캐시 key)
+    - order: 위상 정렬된 노드 id
+    - nodes: node_id → PlanNode
+    - sources: 선행 노드가 없는 노드 id (외부 입력 주입 대상)
+    - targets: prune_plan()으로 만든 부분 계획의 대상 출력 노드 id (전체 계획은 빈 tuple)
+    - duplicates: dedupe_plan()으로 합쳐진 노드 (대표 노드 id → 같은 결과를 받는 노드 id)
+      → 중복 노드는 nodes에는 남고 order에서는 빠짐 (실행하지 않고 대표 노드 결과를 공유)
+    """
+    plan_hash: str
+    order: Tuple[str, ...]
+    nodes: Mapping[str, PlanNode]
+    sources: Tuple[str, ...]
+    targets: Tuple[str, ...] = ()
+    duplicates: Mapping[str, Tuple[str, ...]] = field(default_factory=lambda: MappingProxyType({}))
+
+# ------------------------------------------------------
+# 📌 모듈 해석 (import + evaluator 래핑)
+# ------------------------------------------------------
+def resolve_module(module_type: str, module_name: str, evaluator_names: List[str]):
+    # ✅ BridgeAdapter는 별도 import 처리 (직접 지정된 경로)
+    if module_type == "bridge":
+        module = import_module(f"adapters.bridge.{module_name}")
+    else:
+        # 📦 일반 모듈 로딩
+        module = load_module(module_type, module_name)
+
+    # ✅ evaluator 존재 시 래핑 적용
+    if evaluator_names:
+        module = apply_evaluators(module, evaluator_names)
+
+    return module
+
+# ------------------------------------------------------
+# 📌 형태 해시 / 스펙 검증
+# ------------------------------------------------------
+def _canonical_hash(payload: Any) -> str:
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def shape_hash(nodes: List[Dict[str, Any]], edges: List[Dict[str, str]]) -> str:
+    """
+    ✅ 그래프 형태 해시: params를 제외한 노드 정의 + 엣지
+    """
+    shape = {
+        "nodes": [
+            [node["id"], node["type"], node["module"], list(node.get("evaluators", []))]
+            for node in nodes
+        ],
+        "edges": [[edge["from"], edge["to"]] for edge in edges],
+    }
+    return _canonical_hash(shape)
+
+def spec_hash(spec: Dict[str, Any]) -> str:
+    # ✅ 전체 스펙 해시 (params + options 포함) → 등록형 계획의 plan_id
+    # - options만 다른 스펙도 서로 다른 plan_id (기존 등록의 기본 options를 덮어쓰지 않도록)
+    return _canonical_hash({"nodes": spec["nodes"], "edges": spec["edges"], "options": spec.get("options") or {}})
+
+def validate_spec(nodes: List[Dict[str, Any]], edges: List[Dict[str, str]]):
+    # 🚨 노드 id 중복 / 필수 필드 / 존재하지 않는 노드를 가리키는 엣지 검사
+    seen = set()
+    for node in nodes:
+        for key in ("id", "type", "module"):
+            if key not in node:
+                raise ValueError(f"❌ Node is missing required field '{key}': {node}")
+        if node["id"] in seen:
+            raise ValueError(f"❌ Duplicate node id: {node['id']}")
+        seen.add(node["id"])
+
+    for edge in edges:
+        if edge.get("from") not in seen or edge.get("to") not in seen:
+            raise ValueError(f"❌ Edge refers to an unknown node: {edge}")
+
+# ------------------------------------------------------
+# 📦 계획 컴파일
+# ------------------------------------------------------
+def compile_plan(nodes: List[Dict[str, Any]], edges: List[Dict[str, str]]) -> ExecutionPlan:
+    """
+    ✅ 스펙 → ExecutionPlan 변환 (캐시 미사용, 항상 새로 컴파일)
+
+    처리 과정:
+    1. 스펙 검증 + 위상 정렬 (순환 검사)
+    2. 입력 연결 테이블 (to → from, from → to) 구성
+    3. 모듈 import + evaluator 체인 사전 구성 (arun 보유 여부 → is_async)
+    """
+    validate_spec(nodes, edges)
+    order = topological_sort(nodes, edges)
+
+    input_ids = defaultdict(list)
+    consumers = defaultdict(list)
+    for edge in edges:
+        input_ids[edge["to"]].append(edge["from"])
+        consumers[edge["from"]].append(edge["to"])
+
+    plan_nodes = {}
+    for node in nodes:
+        node_id = node["id"]
+        evaluators = tuple(node.get("evaluators", []))
+        module = resolve_module(node["type"], node["module"], list(evaluators))
+        plan_nodes[node_id] = PlanNode(
+            node_id=node_id,
+            module_type=node["type"],
+            module_name=node["module"],
+            module=module,
+            evaluators=evaluators,
+            input_ids=tuple(input_ids[node_id]),
+            consumers=tuple(consumers[node_id]),
+            is_async=has_arun(module),
+        )
+
+    return ExecutionPlan(
+        plan_hash=shape_hash(nodes, edges),
+        order=tuple(order),
+        nodes=MappingProxyType(plan_nodes),
+        sources=tuple(node_id for node_id in order if not input_ids[node_id]),
+    )
+
+# ------------------------------------------------------
+# 📦 계획 캐시 (형태 해시 기준 LRU)
+# ------------------------------------------------------
+_plan_cache: "OrderedDict[str, ExecutionPlan]" = OrderedDict()
+_plan_cache_lock = threading.Lock()
+_plan_cache_stats = {"hits": 0, "misses": 0}
+
+def get_plan(nodes: List[Dict[str, Any]], edges: List[Dict[str, str]]) -> ExecutionPlan:
+    """
+    ✅ 형태 해시로 캐시된 계획 반환, 없으면 컴파일 후 캐시에 등록
+    """
+    validate_spec(nodes, edges)
+    key = shape_hash(nodes, edges)
+
+    with _plan_cache_lock:
+        plan = _plan_cache.get(key)
+        if plan is not None:
+            _plan_cache.move_to_end(key)
+            _plan_cache_stats["hits"] += 1
+            return plan
+        _plan_cache_stats["misses"] += 1
+
+    plan = compile_plan(nodes, edges)
+
+    with _plan_cache_lock:
+        _plan_cache[key] = plan
+        _plan_cache.move_to_end(key)
+        while len(_plan_cache) > max(1, DEFAULT_PLAN_CACHE_SIZE):
+            _plan_cache.popitem(last=False)
+
+    return plan
+
+# ------------------------------------------------------
+# 📦 대상 출력 가지치기 (targets의 조상 부분 그래프)
+# ------------------------------------------------------
+def _ancestors(plan: ExecutionPlan, targets: Tuple[str, ...]) -> set:
+    keep = set()
+    stack = list(targets)
+    while stack:
+        node_id = stack.pop()
+        if node_id in keep:
+            continue
+        keep.add(node_id)
+        stack.extend(plan.nodes[node_id].input_ids)
+    return keep
+
+def prune_plan(plan: ExecutionPlan, targets: List[str]) -> ExecutionPlan:
+    """
+    ✅ targets 노드와 그 조상 노드만 남긴 부분 계획 반환 (계획 캐시에 함께 저장)
+
+    - targets에 도달하지 않는 노드는 계획에서 제외 → 실행되지 않음
+    - 남은 노드의 consumers는 부분 계획 안의 노드로 제한 (출력 해제 시점 계산용)
+    - 모듈 객체는 원본 계획과 공유 (다시 import / 래핑하지 않음)
+    """
+    targets = tuple(dict.fromkeys(targets))
+    if not targets:
+        raise ValueError("❌ 'targets' must name at least one node.")
+
+    unknown = [node_id for node_id in targets if node_id not in plan.nodes]
+    if unknown:
+        raise ValueError(f"❌ Unknown target node(s): {unknown}")
+
+    key = _canonical_hash({"plan": plan.plan_hash, "targets": sorted(targets)})
+    with _plan_cache_lock:
+        pruned = _plan_cache.get(key)
+        if pruned is not None:
+            _plan_cache.move_to_end(key)
+            _plan_cache_stats["hits"] += 1
+            return pruned
+        _plan_cache_stats["misses"] += 1
+
+    keep = _ancestors(plan, targets)
+    order = tuple(node_id for node_id in plan.order if node_id in keep)
+    pruned = ExecutionPlan(
+        plan_hash=key,
+        order=order,
+        nodes=MappingProxyType({
+            node_id: replace(
+                plan.nodes[node_id],
+                consumers=tuple(c for c in plan.nodes[node_id].consumers if c in keep),
+            )
+            for node_id in order
+        }),
+        sources=tuple(node_id for node_id in plan.sources if node_id in keep),
+        targets=tuple(node_id for node_id in order if node_id in targets),
+    )
+
+    with _plan_cache_lock:
+        _plan_cache[key] = pruned
+        _plan_cache.move_to_end(key)
+        while len(_plan_cache) > max(1, DEFAULT_PLAN_CACHE_SIZE):
+            _plan_cache.popitem(last=False)
+
+    return pruned
+
+# ------------------------------------------------------
+# 📦 공통 부분식 제거 (중복 노드 병합)
+# ------------------------------------------------------
+def _find_duplicates(
+    plan: ExecutionPlan,
+    params: Mapping[str, Dict[str, Any]],
+    cache_settings: Mapping[str, Any],
+) -> Dict[str, List[str]]:
+    """
+    ✅ 위상 순서대로 노드를 정규화하여 대표 노드 id → 중복 노드 id 목록 반환
+
+    - 정규화 key: (type, module, evaluators, 상위 노드 identity) + (params, cache 설정) 해시
+    - 상위 노드 identity: 입력이 1개면 그 입력의 대표 노드 id
+      (입력이 여러 개면 원래 pid 그대로 → 다중 입력 dict의 key가 달라지는 병합 방지)
+    - 소스 노드는 병합하지 않음 (외부 입력이 node id 기준으로 주입됨)
+    - DEDUPE_NODE_TYPES 밖의 노드(output 등)와 evaluator가 붙은 노드(실행마다 로그 기록)는 병합하지 않음
+    - params 해시는 형태가 같은 후보가 있을 때만 계산
+    """
+    canonical: Dict[str, str] = {}
+    first_of_shape: Dict[tuple, str] = {}
+    by_signature: Dict[tuple, str] = {}
+    signed_shapes = set()
+    duplicates: Dict[str, List[str]] = defaultdict(list)
+
+    def signature(node_id):
+        return _canonical_hash([params.get(node_id) or {}, cache_settings.get(node_id)])
+
+    for node_id in plan.order:
+        node = plan.nodes[node_id]
+        if not node.input_ids or node.module_type not in DEDUPE_NODE_TYPES or node.evaluators:
+            canonical[node_id] = node_id
+            continue
+
+        upstream = (canonical[node.input_ids[0]],) if len(node.input_ids) == 1 else node.input_ids
+        shape = (node.module_type, node.module_name, node.evaluators, upstream)
+
+        first = first_of_shape.setdefault(shape, node_id)
+        if first == node_id:
+            canonical[node_id] = node_id
+            continue
+
+        # 📌 형태가 같은 두 번째 노드부터 params 해시 비교
+        if shape not in signed_shapes:
+            signed_shapes.add(shape)
+            by_signature[(shape, signature(first))] = first
+        representative = by_signature.setdefault((shape, signature(node_id)), node_id)
+
+        canonical[node_id] = representative
+        if representative != node_id:
+            duplicates[representative].append(node_id)
+
+    return duplicates
+
+def dedupe_plan(
+    plan: ExecutionPlan,
+    params: Optional[Mapping[str, Dict[str, Any]]] = None,
+    cache_settings: Optional[Mapping[str, Any]] = None,
+) -> ExecutionPlan:
+    """
+    ✅ 같은 입력에 같은 모듈 / params로 실행되는 노드를 하나로 합친 계획 반환 (없으면 원본 그대로)
+
+    - 중복 노드는 실행 순서(order)에서 빠지고, 대표 노드 결과가 중복 노드 id로도 전달됨
+    - 대표 노드의 consumers에 중복 노드의 후속 노드를 합쳐 스케줄링 선행 조건 유지
+    - 결과 구조(병합 관계)별로 계획 캐시에 저장 (params 값 자체는 key에 포함하지 않음)
+    """
+    duplicates = _find_duplicates(plan, params or {}, cache_settings or {})
+    if not duplicates:
+        return plan
+
+    key = _canonical_hash({"plan": plan.plan_hash, "duplicates": sorted(duplicates.items())})
+    with _plan_cache_lock:
+        deduped = _plan_cache.get(key)
+        if deduped is not None:
+            _plan_cache.move_to_end(key)
+            _plan_cache_stats["hits"] += 1
+            return deduped
+        _plan_cache_stats["misses"] += 1
+
+    merged = {node_id for ids in duplicates.values() for node_id in ids}
+    nodes = dict(plan.nodes)
+    for node_id in plan.order:
+        if node_id in merged:
+            continue
+        consumers = list(plan.nodes[node_id].consumers)
+        for duplicate_id in duplicates.get(node_id, ()):
+            consumers.extend(plan.nodes[duplicate_id].consumers)
+        # 📌 중복 후속 노드는 실행되지 않으므로 제외 (다중 입력 후속 노드는 입력 수만큼 유지)
+        kept = tuple(consumer for consumer in consumers if consumer not in merged)
+        if kept != plan.nodes[node_id].consumers:
+            nodes[node_id] = replace(plan.nodes[node_id], consumers=kept)
+
+    deduped = ExecutionPlan(
+        plan_hash=key,
+        order=tuple(node_id for node_id in plan.order if node_id not in merged),
+        nodes=MappingProxyType(nodes),
+        sources=plan.sources,
+        targets=plan.targets,
+        duplicates=MappingProxyType({representative: tuple(ids) for representative, ids in duplicates.items()}),
+    )
+
+    with _plan_cache_lock:
+        _plan_cache[key] = deduped
+        _plan_cache.move_to_end(key)
+        while len(_plan_cache) > max(1, DEFAULT_PLAN_CACHE_SIZE):
+            _plan_cache.popitem(last=False)
+
+    return deduped
+
+def spec_params(nodes: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    # 📌 요청 스펙에서 노드별 params 추출 (계획과 별도로 실행 시 바인딩)
+    return {node["id"]: node.get("params", {}) for node in nodes}
+
+def spec_cache_settings(nodes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # 📌 요청 스펙에서 노드별 결과 캐시 설정 추출 (지정된 노드만)
+    return {node["id"]: node["cache"] for node in nodes if "cache" in node}
+
+# ------------------------------------------------------
+# 📦 등록형 계획 (plan_id로 반복 실행)
+# ------------------------------------------------------
+@dataclass(frozen=True)
+class RegisteredPlan:
+    plan_id: str
+    plan: ExecutionPlan
+    params: Mapping[str, Dict[str, Any]]
+    cache_settings: Mapping[str, Any]
+    options: Mapping[str, Any]
+
+
+class PlanNotFound(KeyError):
+    """등록되지 않은 plan_id로 실행을 요청함 (HTTP 404)"""
+
+
+class PlanLimitReached(Exception):
+    """등록된 계획 수가 GIMBAB_MAX_REGISTERED_PLANS에 도달함 (HTTP 409)"""
+
+
+_registered_plans: Dict[str, RegisteredPlan] = {}
+_registered_lock = threading.Lock()
+
+def register_plan(spec: Dict[str, Any]) -> str:
+    """
+    ✅ 스펙을 컴파일하여 등록하고 plan_id 반환 (nodes / edges / options가 모두 같은 스펙만 같은 plan_id)
+    - 등록 시점의 params / cache / options가 기본값으로 고정됨
+    - 등록 수 상한(MAX_REGISTERED_PLANS) 도달 시 새 plan_id는 PlanLimitReached (같은 스펙 재등록은 허용)
+      (자동 evict 없음: 클라이언트가 가진 plan_id가 예고 없이 사라지지 않도록)
+    """
+    if "nodes" not in spec or "edges" not in spec:
+        raise ValueError("Invalid pipeline format. 'nodes' and 'edges' are required.")
+
+    nodes = copy.deepcopy(spec["nodes"])
+    plan_id = spec_hash(spec)
+    with _registered_lock:
+        _check_plan_limit(plan_id)  # 📌 컴파일 전 1차 확인 (등록 직전에 다시 확인)
+    registered = RegisteredPlan(
+        plan_id=plan_id,
+        plan=get_plan(nodes, spec["edges"]),
+        params=MappingProxyType(spec_params(nodes)),
+        cache_settings=MappingProxyType(spec_cache_settings(nodes)),
+        options=MappingProxyType(dict(spec.get("options") or {})),
+    )
+
+    with _registered_lock:
+        _check_plan_limit(plan_id)
+        _registered_plans[plan_id] = registered
+    return plan_id
+
+def _check_plan_limit(plan_id: str):
+    # 🚨 새 plan_id 등록 전 상한 검사 (호출자가 _registered_lock 보유)
+    if plan_id not in _registered_plans and len(_registered_plans) >= max(1, MAX_REGISTERED_PLANS):
+        raise PlanLimitReached(
+            f"❌ Too many registered plans ({MAX_REGISTERED_PLANS}); delete unused plans before registering new ones."
+        )
+
+def get_registered_plan(plan_id: str) -> RegisteredPlan:
+    with _registered_lock:
+        registered = _registered_plans.get(plan_id)
+    if registered is None:
+        raise PlanNotFound(f"❌ Unknown plan id: {plan_id}")
+    return registered
+
+def unregister_plan(plan_id: str) -> bool:
+    with _registered_lock:
+        return _registered_plans.pop(plan_id, None) is not None
+
+def plan_stats() -> Dict[str, Any]:
+    with _plan_cache_lock:
+        cache = {**_plan_cache_stats, "size": len(_plan_cache)}
+    with _registered_lock:
+        registered = sorted(_registered_plans.keys())
+    return {"cache": cache, "registered": registered}
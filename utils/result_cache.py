@@ -0,0 +1,190 @@
+"""
+📦 Node Result Cache: result_cache.py
+──────────────────────────────────────────────
+- 그래프 노드 실행 결과를 content-addressed key로 캐싱 (opt-in)
+- key = hash(모듈 유형, 모듈 이름, evaluators, params, 모델 revision, 정규화된 입력)
+- 1차: 메모리 LRU / 2차(선택): sqlite 파일 (GIMBAB_RESULT_CACHE_DB)
+- 메모리 tier는 저장 / 조회 시 복사본 사용 (호출자가 결과를 수정해도 캐시 값은 그대로)
+- 노드별 TTL / bypass 설정 지원
+
+📌 노드 설정 예시:
+{ "id": "m1", "type": "model", "module": "text-model",
+  "params": {...}, "cache": { "ttl": 3600, "bypass": false } }
+- "cache": true → 기본 TTL로 캐싱
+- bypass: 캐시 조회는 건너뛰고 새 결과로 갱신
+"""
+
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+# ------------------------------------------------------
+# ⚙️ 기본 설정 (환경 변수로 조정 가능)
+# ------------------------------------------------------
+DEFAULT_MAX_ENTRIES = int(os.getenv("GIMBAB_RESULT_CACHE_MAX_ENTRIES", "1024"))
+DEFAULT_TTL = float(os.getenv("GIMBAB_RESULT_CACHE_TTL", "0"))  # 0 = 만료 없음
+DEFAULT_DB_PATH = os.getenv("GIMBAB_RESULT_CACHE_DB", "")
+
+# 📌 결과에 영향을 주지 않는 실행 제어용 params (key 계산에서 제외)
+NON_SEMANTIC_PARAMS = {"reload", "batching", "cache"}
+
+# ------------------------------------------------------
+# 📌 JSON 정규화 유틸
+# - numpy / tensor는 tolist() / item()으로, 그 외 미지원 타입은 str
+# ------------------------------------------------------
+def _json_default(obj):
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if hasattr(obj, "item"):
+        try:
+            return obj.item()
+        except Exception:
+            pass
+    return str(obj)
+
+def canonical_json(obj: Any) -> str:
+    return json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=_json_default)
+
+def make_cache_key(
+    module_type: str,
+    module_name: str,
+    params: Dict[str, Any],
+    input_data: Any,
+    evaluators: Sequence[str] = (),
+) -> str:
+    """
+    ✅ 노드 실행 결과의 content-addressed key 생성 (sha256)
+    - 모델 revision: params.revision이 없으면 model_name 기준
+    - evaluators: 래핑 순서 그대로 포함 (evaluator가 출력을 바꿀 수 있으므로)
+    """
+    semantic_params = {k: v for k, v in (params or {}).items() if k not in NON_SEMANTIC_PARAMS}
+    payload = {
+        "type": module_type,
+        "module": module_name,
+        "evaluators": list(evaluators),
+        "params": semantic_params,
+        "revision": semantic_params.get("revision") or semantic_params.get("model_name"),
+        "input": input_data,
+    }
+    return hashlib.sha256(canonical_json(payload).encode("utf-8")).hexdigest()
+
+# ------------------------------------------------------
+# 📦 NodeResultCache
+# ------------------------------------------------------
+class NodeResultCache:
+    """
+    ✅ 메모리 LRU + (선택) sqlite 2단계 결과 캐시
+
+    - get(key): (hit 여부, 값, tier) 반환 → tier: "memory" | "disk" | None
+    - set(key, value, ttl): 두 tier 모두에 저장 (ttl <= 0 이면 만료 없음)
+    - 메모리 tier는 deepcopy로 저장 / 반환 (반환값을 수정해도 다른 hit에 영향 없음)
+    - stats(): 누적 hit / miss 통계
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, db_path: str = DEFAULT_DB_PATH):
+        self.max_entries = max(1, max_entries)
+        self.db_path = db_path
+        self._memory: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS node_results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+            self._db.commit()
+
+    def get(self, key: str) -> Tuple[bool, Any, Optional[str]]:
+        now = time.time()
+
+        with self._lock:
+            # ✅ 1. 메모리 tier
+            if key in self._memory:
+                value, expires_at = self._memory[key]
+                if expires_at is None or expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return True, copy.deepcopy(value), "memory"
+                del self._memory[key]
+
+            # ✅ 2. 디스크 tier (hit 시 메모리로 승격)
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM node_results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and (row[1] is None or row[1] > now):
+                    value = json.loads(row[0])
+                    self._put_memory(key, copy.deepcopy(value), row[1])
+                    self._counters["disk_hits"] += 1
+                    return True, value, "disk"
+
+            self._counters["misses"] += 1
+            return False, None, None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl = DEFAULT_TTL if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl and ttl > 0 else None
+
+        with self._lock:
+            self._put_memory(key, copy.deepcopy(value), expires_at)
+            self._counters["writes"] += 1
+
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO node_results (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, canonical_json(value), expires_at),
+                )
+                self._db.commit()
+
+    def _put_memory(self, key: str, value: Any, expires_at: Optional[float]):
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM node_results")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._counters,
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "disk_enabled": self._db is not None,
+            }
+
+
+# ------------------------------------------------------
+# 📌 노드 캐시 설정 해석
+# - setting: 노드의 "cache" 값 (없으면 요청 단위 기본값 options.cache)
+# - 반환: None (캐시 미사용) 또는 {"ttl": ..., "bypass": ...}
+# ------------------------------------------------------
+def resolve_cache_options(setting: Any, node_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    if not setting:
+        return None
+    if setting is True:
+        return {"ttl": None, "bypass": False}
+    if isinstance(setting, dict):
+        if setting.get("enabled", True) is False:
+            return None
+        return {"ttl": setting.get("ttl"), "bypass": bool(setting.get("bypass", False))}
+
+    raise ValueError(f"❌ Invalid cache setting for node '{node_id}': {setting}")
+
+
+# ✅ 프로세스 공용 결과 캐시 인스턴스
+result_cache = NodeResultCache()
@@ -3,13 +3,80 @@
 ──────────────────────────────────────────────
 - JSON 직렬화가 불가능한 타입(numpy, tensor 등)을 파이썬 기본 타입으로 변환
 - FastAPI 응답이나 json.dumps 사용 전에 안전하게 변환 가능
+- 한 번 변환된 결과는 표시(Serialized*)되어 다시 순회하지 않음
+- 배열은 리스트(기본) 또는 base64 바이너리로 변환 (GIMBAB_ARRAY_ENCODING / options.arrays)
+- dumps(): orjson 설치 시 orjson, 없으면 표준 json으로 bytes 인코딩
+- packb(): msgpack 설치 시 msgpack 인코딩 (Accept: application/msgpack)
+- numpy는 import하지 않음: 이미 로딩된 경우에만 배열 / 스칼라 판별 (로딩 전에는 numpy 객체가 존재할 수 없음)
 
 📌 사용 예시:
-from utils.serialization import to_serializable
-json.dumps(to_serializable(obj))  # 또는 FastAPI 응답 전에 사용
+from utils.serialization import to_serializable, dumps
+dumps(to_serializable(obj))  # 또는 FastAPI 응답 전에 사용
 """
 
-import numpy as np
+import base64
+import json
+import os
+import sys
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 표준 json 사용
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack 미설치 시 msgpack 응답 비활성
+    msgpack = None
+
+# ------------------------------------------------------
+# ⚙️ 배열 인코딩 방식
+# - "list": ndarray → 중첩 리스트 (기존 동작)
+# - "base64": ndarray → {"__ndarray__": base64, "dtype": ..., "shape": [...]}
+# ------------------------------------------------------
+ARRAY_ENCODINGS = ("list", "base64")
+ARRAY_ENCODING = os.getenv("GIMBAB_ARRAY_ENCODING", "list")
+
+# ✅ 그대로 통과시키는 JSON 기본 타입 (bool은 int의 하위 타입이지만 type() 비교이므로 별도 명시)
+_PRIMITIVES = (str, int, float, bool, type(None))
+
+# ---------------------------------------------------
+# 📌 변환 완료 표시용 컨테이너
+# - dict / list 하위 클래스이므로 json, orjson, FastAPI에서 그대로 사용 가능
+# ---------------------------------------------------
+class SerializedDict(dict):
+    __slots__ = ()
+
+
+class SerializedList(list):
+    __slots__ = ()
+
+# ---------------------------------------------------
+# 📌 배열 변환
+# ---------------------------------------------------
+def _numpy(load: bool = False):
+    # ✅ 로딩된 numpy 모듈 (load=True면 필요 시 import, 미설치 시 None)
+    np = sys.modules.get("numpy")
+    if np is None and load:
+        try:
+            import numpy as np
+        except ImportError:  # numpy 미설치 환경: 배열 / 스칼라 변환 생략
+            return None
+    return np
+
+def _encode_array(arr, arrays: str):
+    if arrays == "base64":
+        contiguous = _numpy(load=True).ascontiguousarray(arr)
+        return {
+            "__ndarray__": base64.b64encode(contiguous.tobytes()).decode("ascii"),
+            "dtype": str(contiguous.dtype),
+            "shape": list(contiguous.shape),
+        }
+    return arr.tolist()
+
+def _is_torch_tensor(obj) -> bool:
+    # ✅ torch를 import하지 않고 tensor 여부 판별
+    return type(obj).__module__.startswith("torch") and hasattr(obj, "detach")
 
 # ---------------------------------------------------
 # 📌 JSON 안전 변환 함수: to_serializable
@@ -17,44 +84,98 @@ import numpy as np
 #   numpy, tensor, float32 등 직렬화 불가능한 객체를
 #   파이썬 기본 타입으로 변환
 # ---------------------------------------------------
-def to_serializable(obj):
+def _convert(obj, arrays: str):
+    obj_type = type(obj)
+
+    # ✅ 이미 변환된 하위 트리 / JSON 기본 타입은 그대로 통과
+    if obj_type in _PRIMITIVES or obj_type is SerializedDict or obj_type is SerializedList:
+        return obj
+
+    if isinstance(obj, dict):
+        return {k if type(k) is str else str(k): _convert(v, arrays) for k, v in obj.items()}
+
+    if isinstance(obj, (list, tuple)):
+        return [_convert(i, arrays) for i in obj]
+
+    np = _numpy()
+    if np is not None:
+        # ✅ numpy 스칼라 타입 처리 (예: np.float32, np.int64 등)
+        if isinstance(obj, np.generic):
+            return obj.item()
+
+        # ✅ numpy 배열 처리
+        if isinstance(obj, np.ndarray):
+            return _encode_array(obj, arrays)
+
+    # ✅ torch.Tensor 대응: 스칼라는 item(), 그 외는 numpy 경유
+    if _is_torch_tensor(obj):
+        tensor = obj.detach().cpu()
+        if tensor.dim() == 0:
+            return tensor.item()
+        return _encode_array(tensor.numpy(), arrays) if _numpy(load=True) is not None else tensor.tolist()
+
+    # ✅ float / int subclass 대응
+    if isinstance(obj, float):
+        return float(obj)
+    if isinstance(obj, int):
+        return int(obj)
+
+    # ✅ 기타 item() 지원 객체 (스칼라 래퍼 등)
+    if hasattr(obj, "item") and callable(obj.item):
+        try:
+            return obj.item()
+        except Exception:
+            pass  # fallback to str(obj) below
+
+    # ✅ 기타 알 수 없는 타입: 문자열로 fallback
+    return str(obj)
+
+def to_serializable(obj, arrays: str = None):
     """
     입력 객체를 JSON 직렬화 가능한 파이썬 기본 타입으로 변환합니다.
 
     ✅ 변환 규칙:
-    - dict: 내부 키/값 재귀 처리
-    - list: 내부 항목 재귀 처리
-    - numpy.int, float: item()으로 스칼라 값 추출
-    - numpy.ndarray: .tolist()로 리스트 변환
-    - torch.Tensor: .item() 호출 가능 시 변환
-    - float subclass: float(obj) 강제 변환
+    - str / int / float / bool / None: 그대로 반환
+    - dict: 내부 키/값 재귀 처리 (키는 문자열화)
+    - list / tuple: 내부 항목 재귀 처리
+    - numpy 스칼라: item()으로 스칼라 값 추출
+    - numpy.ndarray / torch.Tensor: arrays 방식("list" / "base64")으로 변환
+    - 이전에 to_serializable이 반환한 dict / list: 다시 순회하지 않음
     - 그 외: str(obj)로 문자열화
     """
+    arrays = arrays or ARRAY_ENCODING
+    if arrays not in ARRAY_ENCODINGS:
+        raise ValueError(f"❌ Unknown array encoding: {arrays} (expected one of {ARRAY_ENCODINGS})")
 
-    if isinstance(obj, dict):
-        return {k: to_serializable(v) for k, v in obj.items()}
-    
-    elif isinstance(obj, list):
-        return [to_serializable(i) for i in obj]
+    result = _convert(obj, arrays)
 
-    # ✅ numpy 스칼라 타입 처리 (예: np.float32, np.int64 등)
-    elif isinstance(obj, (np.integer, np.floating)):
-        return obj.item()
+    # ✅ 최상위 컨테이너에 변환 완료 표시
+    if type(result) is dict:
+        return SerializedDict(result)
+    if type(result) is list:
+        return SerializedList(result)
+    return result
 
-    # ✅ numpy 배열 처리
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
+# ---------------------------------------------------
+# 📌 인코더: dumps (JSON bytes) / packb (msgpack bytes)
+# ---------------------------------------------------
+def _json_default(obj):
+    return to_serializable(obj)
 
-    # ✅ torch.Tensor 대응: item() 가능 시 스칼라 추출
-    elif hasattr(obj, 'item') and callable(obj.item):
-        try:
-            return obj.item()
-        except:
-            pass  # fallback to str(obj) below
+def dumps(obj) -> bytes:
+    # ✅ orjson: numpy 배열 / 비문자열 키를 네이티브로 처리
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=_json_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_json_default).encode("utf-8")
 
-    # ✅ float subclass 대응 (예: np.float32 -> float)
-    elif isinstance(obj, float):
-        return float(obj)
+def msgpack_available() -> bool:
+    return msgpack is not None
 
-    # ✅ 기타 알 수 없는 타입: 문자열로 fallback
-    return str(obj)
\ No newline at end of file
+def packb(obj) -> bytes:
+    if msgpack is None:
+        raise RuntimeError("❌ msgpack is not installed.")
+    return msgpack.packb(obj, default=_json_default, use_bin_type=True)
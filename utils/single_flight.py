@@ -0,0 +1,146 @@
+"""
+📦 Single-flight: single_flight.py
+──────────────────────────────────────────────
+- 같은 key의 실행이 동시에 여러 번 요청되면 첫 요청(leader)만 실행하고
+  나머지(follower)는 진행 중인 실행의 결과 / 예외를 그대로 공유 (request coalescing)
+- 결과를 저장하지 않음: 실행이 끝나면 key는 즉시 제거 (이후 요청은 다시 실행, 저장은 result_cache 몫)
+- 공유된 결과 객체는 여러 호출자가 함께 받으므로 읽기 전용으로 다룸
+- graph_flight: 동일 그래프 + 입력 요청 (pipeline_graph_runner)
+- node_flight: 동일 모델 노드 호출 (graph_executor, result_cache key 기준)
+
+📌 사용 예시:
+output, shared = node_flight.do(key, lambda: module.run(input=input_data, **params))
+
+📌 환경 변수:
+- GIMBAB_SINGLE_FLIGHT=0 : 비활성화 (요청별 options.coalesce로도 조정 가능)
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+
+from utils.metrics import metrics
+
+# ------------------------------------------------------
+# ⚙️ 기본 설정 (환경 변수로 조정 가능)
+# ------------------------------------------------------
+SINGLE_FLIGHT_ENABLED = os.getenv("GIMBAB_SINGLE_FLIGHT", "1") == "1"
+
+# ✅ node_flight 대상 노드 유형 (부수 효과가 있을 수 있는 input / output 등은 제외)
+NODE_TYPES = ("model",)
+
+# ✅ follower의 cancel_event 확인 주기 (초)
+CANCEL_POLL_INTERVAL = 0.05
+
+
+class FlightCancelled(Exception):
+    """follower 대기 중 자신의 cancel_event가 set됨 (진행 중인 leader 실행은 계속됨)"""
+
+
+class SingleFlight:
+    """
+    ✅ key별 진행 중 실행 1개 (thread-safe)
+
+    - do(key, fn): 동기 실행 → (결과, 공유 여부)
+    - ado(key, factory): 비동기 실행 (백그라운드 이벤트 루프), 동기 follower와 같은 Future 공유
+    - retry_on: follower가 받은 예외가 이 타입이면 다시 시도 (leader 요청만의 취소 등)
+    - stats(): 진행 중 key 수 + leader / 공유 횟수
+    """
+
+    def __init__(self, scope: str):
+        self.scope = scope
+        self._flights: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {"leaders": 0, "shared": 0}
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        # ✅ (Future, leader 여부)
+        with self._lock:
+            future = self._flights.get(key)
+            if future is not None:
+                self._stats["shared"] += 1
+                metrics.inc("gimbab_singleflight_shared_total", scope=self.scope)
+                return future, False
+
+            future = Future()
+            self._flights[key] = future
+            self._stats["leaders"] += 1
+            metrics.inc("gimbab_singleflight_leaders_total", scope=self.scope)
+            return future, True
+
+    def _land(self, key: str, future: Future):
+        with self._lock:
+            if self._flights.get(key) is future:
+                del self._flights[key]
+
+    @staticmethod
+    def _wait(future: Future, cancel_event: Optional[threading.Event]) -> Any:
+        if cancel_event is None:
+            return future.result()
+        while True:
+            if cancel_event.is_set():
+                raise FlightCancelled("❌ Cancelled while waiting for an identical in-flight execution.")
+            try:
+                return future.result(timeout=CANCEL_POLL_INTERVAL)
+            except FutureTimeout:
+                continue
+
+    def do(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        cancel_event: Optional[threading.Event] = None,
+        retry_on: Tuple[Type[BaseException], ...] = (),
+    ) -> Tuple[Any, bool]:
+        """
+        ✅ key가 진행 중이면 결과 공유, 아니면 fn() 실행 → (결과, 공유 여부)
+
+        - leader의 예외는 모든 follower에게 그대로 전달 (retry_on 타입은 follower가 재시도)
+        - cancel_event: follower 대기 중 set되면 FlightCancelled (leader는 fn 안에서 직접 처리)
+        """
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                try:
+                    result = fn()
+                except BaseException as e:
+                    future.set_exception(e)
+                    raise
+                else:
+                    future.set_result(result)
+                    return result, False
+                finally:
+                    self._land(key, future)
+
+            try:
+                return self._wait(future, cancel_event), True
+            except retry_on:
+                continue
+
+    async def ado(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        # ✅ do()의 비동기 버전 (follower 취소가 공유 Future를 취소하지 않도록 shield)
+        future, leader = self._join(key)
+        if not leader:
+            return await asyncio.shield(asyncio.wrap_future(future)), True
+
+        try:
+            result = await factory()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            self._land(key, future)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"enabled": SINGLE_FLIGHT_ENABLED, "in_flight": len(self._flights), **self._stats}
+
+
+# ✅ 전역 인스턴스
+graph_flight = SingleFlight("graph")
+node_flight = SingleFlight("node")
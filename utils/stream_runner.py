@@ -0,0 +1,183 @@
+"""
+📦 Streaming Corpus Runner: stream_runner.py
+──────────────────────────────────────────────
+- 로컬 파일 코퍼스를 스트리밍 입력 어댑터(iter_records)로 lazy하게 읽고
+  고정 크기 batch 단위로 execute_plan_batch에 흘려보냄
+- 결과는 스트리밍 출력 어댑터(open_writer)로 레코드마다 바로 기록
+  → 코퍼스 크기와 무관하게 메모리 사용량 일정
+
+📌 구조 (producer / consumer):
+- reader 스레드: iter_records → batch 구성 → 크기 제한 큐(max_pending_batches)에 put
+  (큐가 가득 차면 블로킹 → backpressure)
+- 호출 스레드: 큐에서 batch를 꺼내 실행 → writer.write() → batch 해제
+
+📌 사용 예시:
+summary = run_stream(plan, source={"module": "jsonl", "path": "corpus.jsonl"},
+                     sink={"module": "jsonl_writer", "path": "out.jsonl"}, params=...)
+"""
+
+import os
+import queue
+import threading
+from typing import Any, Dict, List, Optional
+
+from utils.dynamic_loader import load_module
+from utils.graph_executor import GraphCancelled, execute_plan_batch
+from utils.plan_compiler import ExecutionPlan
+
+# ------------------------------------------------------
+# ⚙️ 기본 설정 (환경 변수로 조정 가능)
+# ------------------------------------------------------
+DEFAULT_STREAM_BATCH_SIZE = int(os.getenv("GIMBAB_STREAM_BATCH_SIZE", "64"))
+DEFAULT_MAX_PENDING_BATCHES = int(os.getenv("GIMBAB_STREAM_MAX_PENDING", "2"))
+
+_END = object()
+
+# ------------------------------------------------------
+# 📌 어댑터 로딩
+# ------------------------------------------------------
+def _load_adapter(module_type: str, spec: Dict[str, Any], attr: str):
+    # ✅ {"module": 이름, ...params} → (어댑터 모듈, params)
+    if not isinstance(spec, dict) or "module" not in spec:
+        raise ValueError(f"❌ Streaming {module_type} spec requires a 'module' field.")
+
+    params = {k: v for k, v in spec.items() if k != "module"}
+    module = load_module(module_type, spec["module"])
+    if not hasattr(module, attr):
+        raise ValueError(f"❌ {module_type} adapter '{spec['module']}' does not support streaming ({attr} missing).")
+    return module, params
+
+# ------------------------------------------------------
+# 📌 reader 스레드: 레코드 → batch → 제한 큐
+# ------------------------------------------------------
+def _read_batches(records, batch_size: int, pending: queue.Queue, stop: threading.Event):
+    def put(item) -> bool:
+        # ⏳ 큐가 가득 차면 대기 (stop 시 즉시 종료)
+        while not stop.is_set():
+            try:
+                pending.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                if not put(batch):
+                    return
+                batch = []
+        if batch and not put(batch):
+            return
+        put(_END)
+    except BaseException as e:
+        put(e)
+    finally:
+        close = getattr(records, "close", None)
+        if close is not None:
+            close()  # ✅ 제너레이터 정리 (열린 파일 / mmap 해제)
+
+# ------------------------------------------------------
+# 📦 스트리밍 실행
+# ------------------------------------------------------
+def run_stream(
+    plan: ExecutionPlan,
+    source: Dict[str, Any],
+    sink: Dict[str, Any],
+    params: Optional[Dict[str, Dict[str, Any]]] = None,
+    batch_size: Optional[int] = None,
+    max_pending_batches: Optional[int] = None,
+    output_nodes: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    worker_limits: Optional[Dict[str, int]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    ✅ 코퍼스 전체를 batch 단위로 실행하고 결과를 sink에 기록
+
+    - source: {"module": 입력 어댑터, "path": ..., 어댑터 params}
+    - sink: {"module": 출력 어댑터, "path": ..., 어댑터 params}
+    - output_nodes: 기록할 노드 출력 (기본: 후속 노드가 없는 노드)
+      → 지정 시 execute_plan_batch의 targets로 전달 (output_nodes의 조상 노드만 실행)
+    - 기록 형태 (레코드마다 한 줄):
+      {"index": n, "status": "success", "result": {node_id: 출력}} 또는
+      {"index": n, "status": "error", "node": ..., "message": ...}
+    - 반환: 처리 요약 {"records", "succeeded", "failed", "batches", "output"}
+    """
+    source_module, source_params = _load_adapter("input", source, "iter_records")
+    sink_module, sink_params = _load_adapter("output", sink, "open_writer")
+
+    batch_size = max(1, batch_size or DEFAULT_STREAM_BATCH_SIZE)
+    max_pending_batches = max(1, max_pending_batches or DEFAULT_MAX_PENDING_BATCHES)
+    targets = output_nodes
+    if output_nodes is None:
+        output_nodes = [node_id for node_id in plan.order if not plan.nodes[node_id].consumers]
+    else:
+        unknown = [node_id for node_id in output_nodes if node_id not in plan.nodes]
+        if unknown:
+            raise ValueError(f"❌ Unknown output nodes: {unknown}")
+
+    records = source_module.iter_records(**source_params)
+    pending: queue.Queue = queue.Queue(maxsize=max_pending_batches)
+    stop = threading.Event()
+    reader = threading.Thread(
+        target=_read_batches,
+        args=(records, batch_size, pending, stop),
+        name="gimbab-stream-reader",
+        daemon=True,
+    )
+
+    summary = {"records": 0, "succeeded": 0, "failed": 0, "batches": 0}
+    writer = sink_module.open_writer(**sink_params)
+    reader.start()
+
+    try:
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                raise GraphCancelled("❌ Stream execution cancelled.")
+
+            try:
+                batch = pending.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            if batch is _END:
+                break
+            if isinstance(batch, BaseException):
+                raise batch
+
+            outcomes = execute_plan_batch(
+                plan,
+                batch,
+                params=params,
+                max_workers=max_workers,
+                worker_limits=worker_limits,
+                cancel_event=cancel_event,
+                targets=targets,
+            )
+
+            # 📤 레코드별 즉시 기록 → batch 결과는 다음 반복에서 해제
+            for outcome in outcomes:
+                if outcome["status"] == "success":
+                    result = outcome["result"]
+                    outcome = {"status": "success", "result": {node_id: result[node_id] for node_id in output_nodes}}
+                    summary["succeeded"] += 1
+                else:
+                    summary["failed"] += 1
+                writer.write({"index": summary["records"], **outcome})
+                summary["records"] += 1
+
+            summary["batches"] += 1
+    finally:
+        stop.set()
+        reader.join()
+        writer.close()
+
+        summary["output"] = getattr(writer, "path", sink.get("path"))
+        if metadata is not None:
+            metadata["stream"] = dict(summary)
+
+    return summary